@@ -0,0 +1,76 @@
+"""Benchmark single-roundtrip card extraction against the per-element path.
+
+Renders a synthetic listing page in each store's markup and times both
+extraction modes of BaseScraper on it.
+
+Usage:
+    python -m benchmarks.bench_extraction [--cards 10] [--rounds 20]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from playwright.async_api import async_playwright
+
+from benchmarks.synthetic import listing_page
+from src.scrapers import SCRAPERS
+
+
+async def time_extraction(extract, page, limit: int, rounds: int) -> list[float]:
+    """Time an extraction function over several rounds in milliseconds."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await extract(page, limit)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def run(cards: int, rounds: int) -> None:
+    """Run the benchmark for every store."""
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        page = await browser.new_page()
+
+        print(f"{'store':<14}{'elements ms':>14}{'evaluate ms':>14}{'speedup':>10}  parity")
+        for store, create_scraper in SCRAPERS.items():
+            scraper = create_scraper()
+            await page.set_content(listing_page(store, "benchmark", count=cards))
+
+            elements = await time_extraction(
+                scraper._extract_cards_elements, page, cards, rounds
+            )
+            evaluate = await time_extraction(
+                scraper._extract_cards_evaluate, page, cards, rounds
+            )
+
+            # Both modes must produce the same products
+            parity = scraper._build_products(
+                await scraper._extract_cards_elements(page, cards)
+            ) == scraper._build_products(
+                await scraper._extract_cards_evaluate(page, cards)
+            )
+
+            elements_ms = statistics.median(elements)
+            evaluate_ms = statistics.median(evaluate)
+            print(
+                f"{store:<14}{elements_ms:>14.2f}{evaluate_ms:>14.2f}"
+                f"{elements_ms / evaluate_ms:>9.1f}x  {'ok' if parity else 'MISMATCH'}"
+            )
+
+        await browser.close()
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=10, help="cards per page")
+    parser.add_argument("--rounds", type=int, default=20, help="rounds per mode")
+    args = parser.parse_args()
+    asyncio.run(run(args.cards, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
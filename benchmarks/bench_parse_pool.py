@@ -0,0 +1,78 @@
+"""Benchmark listing parsing on the event loop against the process pool.
+
+Parses a batch of large synthetic listing pages concurrently while a
+ticker coroutine measures how late the event loop wakes it up, which is
+the stall every other scrape and API request would see.
+
+Usage:
+    python -m benchmarks.bench_parse_pool [--pages 40] [--cards 200] [--workers 4]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.synthetic import listing_page
+from src.scrapers.parse_pool import ParsePool
+
+TICK = 0.005
+
+
+async def ticker(lags: list[float], stop: asyncio.Event) -> None:
+    """Record how late each short sleep wakes up, in milliseconds."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append((time.perf_counter() - start - TICK) * 1000)
+
+
+async def measure(pool: ParsePool, pages: list[str]) -> tuple[float, float, float]:
+    """Parse all pages concurrently; get wall ms and p50/max loop lag ms."""
+    lags: list[float] = []
+    stop = asyncio.Event()
+    tick = asyncio.create_task(ticker(lags, stop))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(pool.parse("albert_heijn", page) for page in pages))
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    stop.set()
+    await tick
+    return wall_ms, statistics.median(lags or [0.0]), max(lags or [0.0])
+
+
+async def run(pages: int, cards: int, workers: int) -> None:
+    """Run the benchmark and print a table."""
+    payloads = [
+        listing_page("albert_heijn", "melk", cards, seed) for seed in range(pages)
+    ]
+    size_kb = sum(len(p) for p in payloads) / len(payloads) / 1024
+
+    pooled = ParsePool(workers=workers, min_bytes=0)
+    # Start the worker processes before timing
+    await pooled.parse("albert_heijn", payloads[0])
+
+    print(f"{pages} pages of {cards} cards (~{size_kb:.0f} KB each), {workers} workers")
+    print(f"{'mode':<8}{'wall ms':>10}{'lag p50 ms':>12}{'lag max ms':>12}")
+    try:
+        for name, pool in (("inline", ParsePool(workers=0)), ("pool", pooled)):
+            wall_ms, lag_p50, lag_max = await measure(pool, payloads)
+            print(f"{name:<8}{wall_ms:>10.1f}{lag_p50:>12.2f}{lag_max:>12.2f}")
+    finally:
+        pooled.shutdown()
+    print(f"pool stats: {pooled.stats()}")
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=40, help="pages per run")
+    parser.add_argument("--cards", type=int, default=200, help="cards per page")
+    parser.add_argument("--workers", type=int, default=4, help="pool processes")
+    args = parser.parse_args()
+    asyncio.run(run(args.pages, args.cards, args.workers))
+
+
+if __name__ == "__main__":
+    main()
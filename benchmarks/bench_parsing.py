@@ -0,0 +1,122 @@
+"""Benchmark the precompiled price/unit parsers against the inline-regex ones.
+
+Times per-string and batch parsing on synthetic product names and prices
+and checks that both implementations agree where the old one was right.
+
+Usage:
+    python -m benchmarks.bench_parsing [--strings 1000] [--rounds 20]
+"""
+
+import argparse
+import random
+import re
+import statistics
+import time
+from collections.abc import Callable
+
+from benchmarks.synthetic import BRANDS, PRODUCTS, UNITS, format_price
+from src.scrapers.parsing import parse_price, parse_prices, parse_unit, parse_units
+
+
+def legacy_parse_price(price_text: str | None) -> float | None:
+    """Price parsing as BaseScraper._parse_price used to do it."""
+    if not price_text:
+        return None
+    cleaned = re.sub(r"[€\s]", "", price_text)
+    cleaned = cleaned.replace(",", ".")
+    match = re.search(r"(\d+\.?\d*)", cleaned)
+    if match:
+        return float(match.group(1))
+    return None
+
+
+def legacy_parse_unit(text: str) -> tuple[str, float]:
+    """Unit parsing as BaseScraper._extract_unit_info used to do it."""
+    text_lower = text.lower()
+    patterns = [
+        (r"(\d+(?:[.,]\d+)?)\s*(?:l|liter)", "liter"),
+        (r"(\d+(?:[.,]\d+)?)\s*(?:ml)", "ml"),
+        (r"(\d+(?:[.,]\d+)?)\s*(?:kg)", "kg"),
+        (r"(\d+(?:[.,]\d+)?)\s*(?:g|gram)", "gram"),
+        (r"(\d+)\s*(?:st|stuks?)", "stuk"),
+    ]
+    for pattern, unit in patterns:
+        match = re.search(pattern, text_lower)
+        if match:
+            return unit, float(match.group(1).replace(",", "."))
+    return "stuk", 1.0
+
+
+def corpus(count: int, seed: int = 0) -> tuple[list[str], list[str]]:
+    """Generate product names and price strings."""
+    rng = random.Random(seed)
+    names = [
+        f"{rng.choice(BRANDS)} {rng.choice(PRODUCTS)} {rng.choice(UNITS)}"
+        for _ in range(count)
+    ]
+    prices = [format_price(rng.uniform(0.29, 24.99)) for _ in range(count)]
+    return names, prices
+
+
+def time_ms(func: Callable[[], object], rounds: int) -> float:
+    """Get the median wall time of a function in milliseconds."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run(strings: int, rounds: int) -> None:
+    """Run the benchmark and print a table."""
+    names, prices = corpus(strings)
+
+    cases = [
+        (
+            "price",
+            lambda: [legacy_parse_price(p) for p in prices],
+            lambda: [parse_price(p) for p in prices],
+            lambda: parse_prices(prices),
+        ),
+        (
+            "unit",
+            lambda: [legacy_parse_unit(n) for n in names],
+            lambda: [parse_unit(n) for n in names],
+            lambda: parse_units(names),
+        ),
+    ]
+
+    print(f"{strings} strings, median of {rounds} rounds")
+    print(
+        f"{'parser':<8}{'legacy ms':>12}{'single ms':>12}"
+        f"{'batch ms':>12}{'speedup':>10}"
+    )
+    for name, legacy, single, batch in cases:
+        legacy_ms = time_ms(legacy, rounds)
+        single_ms = time_ms(single, rounds)
+        batch_ms = time_ms(batch, rounds)
+        print(
+            f"{name:<8}{legacy_ms:>12.2f}{single_ms:>12.2f}{batch_ms:>12.2f}"
+            f"{legacy_ms / batch_ms:>9.1f}x"
+        )
+
+    price_parity = sum(legacy_parse_price(p) == parse_price(p) for p in prices)
+    # Multipacks were not understood before, so only compare the rest
+    plain = [n for n in names if "x" not in n.split()[-1]]
+    unit_parity = sum(legacy_parse_unit(n) == parse_unit(n) for n in plain)
+    print(f"price parity: {price_parity}/{len(prices)}")
+    print(f"unit parity (excluding multipacks): {unit_parity}/{len(plain)}")
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--strings", type=int, default=1000, help="strings per round")
+    parser.add_argument("--rounds", type=int, default=20, help="timing rounds")
+    args = parser.parse_args()
+    run(args.strings, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
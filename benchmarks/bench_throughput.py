@@ -0,0 +1,374 @@
+"""Benchmark ScraperService throughput against stand-in store servers.
+
+Points every store in SUPERMARKETS at a local stand-in server (see
+benchmarks.standin_server) and runs unique searches through
+search_all_supermarkets at each concurrency level, reporting search
+latency percentiles, throughput, store outcomes and the CPU and memory
+of this process and the browser it drives. Results are saved as a JSON
+baseline that later runs can be compared against.
+
+The per-host rate limiter is lifted unless --rate-limit is given; all
+stand-in stores share one host, so a limit applies to them together.
+
+Usage:
+    python -m benchmarks.bench_throughput [--concurrency 1,4,16] [--searches 40]
+        [--latency-ms 200] [--failure-rate 0.05] [--http-only]
+        [--output benchmarks/baselines/throughput.json] [--compare BASELINE]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from dataclasses import asdict
+from datetime import UTC, datetime
+from pathlib import Path
+
+from loguru import logger
+
+from benchmarks.standin_server import (
+    StandinServer,
+    add_config_arguments,
+    config_from_args,
+    point_supermarkets,
+)
+from benchmarks.synthetic import PRODUCTS
+from src.config.settings import get_settings
+from src.scrapers import ConfiguredScraper, rate_limiter
+from src.scrapers.browser_pool import close_browser_pool
+from src.scrapers.http_client import close_http_client, get_http_client
+from src.scrapers.parse_pool import close_parse_pool
+from src.services import circuit_breaker
+from src.services.scraper_service import ScraperService
+
+DEFAULT_OUTPUT = Path(__file__).parent / "baselines" / "throughput.json"
+SAMPLE_INTERVAL = 0.25
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = resource.getpagesize()
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    """Get the p50, p95 and p99 of a list of values."""
+    if len(values) < 2:
+        value = values[0] if values else 0.0
+        return {"p50": value, "p95": value, "p99": value}
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98]}
+
+
+def _read_processes() -> dict[int, tuple[int, float, int, str]] | None:
+    """Read (ppid, cpu seconds, rss bytes, command) of every process.
+
+    Returns None where /proc is not available.
+    """
+    if not os.path.isdir("/proc"):
+        return None
+    processes = {}
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry.name}/stat") as f:
+                stat = f.read()
+            with open(f"/proc/{entry.name}/cmdline", "rb") as f:
+                command = f.read().replace(b"\0", b" ").decode(errors="replace")
+        except OSError:
+            continue
+        # The command name may contain spaces, so split after it
+        fields = stat[stat.rfind(")") + 2 :].split()
+        cpu = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+        processes[int(entry.name)] = (
+            int(fields[1]),
+            cpu,
+            int(fields[21]) * PAGE_SIZE,
+            command,
+        )
+    return processes
+
+
+class ResourceSampler:
+    """Samples CPU time and memory of this process and its children.
+
+    Child processes running Chromium count as the browser; the rest
+    (Playwright driver, parse pool workers) as other children.
+    """
+
+    def __init__(self):
+        """Initialize an idle sampler."""
+        self.available = _read_processes() is not None
+        self.peak_rss: Counter = Counter()
+        self._first: dict[int, float] = {}
+        self._last: dict[int, tuple[str, float]] = {}
+        self._task: asyncio.Task | None = None
+
+    def sample(self) -> None:
+        """Record one sample of every process in this process tree."""
+        processes = _read_processes()
+        if processes is None:
+            return
+
+        tree = {os.getpid()}
+        grew = True
+        while grew:
+            children = {
+                pid for pid, (ppid, *_) in processes.items() if ppid in tree
+            } - tree
+            tree |= children
+            grew = bool(children)
+
+        rss: Counter = Counter()
+        for pid in tree:
+            _, cpu, pid_rss, command = processes[pid]
+            if pid == os.getpid():
+                group = "process"
+            elif "chrom" in command or "headless_shell" in command:
+                group = "browser"
+            else:
+                group = "other_children"
+            rss[group] += pid_rss
+            self._first.setdefault(pid, cpu)
+            self._last[pid] = (group, cpu)
+        for group, total in rss.items():
+            self.peak_rss[group] = max(self.peak_rss[group], total)
+
+    async def _run(self) -> None:
+        """Sample until cancelled."""
+        while True:
+            self.sample()
+            await asyncio.sleep(SAMPLE_INTERVAL)
+
+    def start(self) -> None:
+        """Start sampling in the background."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self, wall: float) -> dict:
+        """Stop sampling and summarize CPU seconds, CPU % and peak RSS per group."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self.sample()
+
+        if not self.available:
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            return {"process": {"peak_rss_mb": round(usage.ru_maxrss / 1024, 1)}}
+
+        cpu: Counter = Counter()
+        for pid, (group, last) in self._last.items():
+            cpu[group] += last - self._first[pid]
+        return {
+            group: {
+                "cpu_seconds": round(cpu[group], 2),
+                "cpu_percent": round(cpu[group] / wall * 100, 1) if wall else 0.0,
+                "peak_rss_mb": round(self.peak_rss[group] / 2**20, 1),
+            }
+            for group in ("process", "browser", "other_children")
+            if group in self.peak_rss
+        }
+
+
+async def run_level(
+    service: ScraperService,
+    server: StandinServer,
+    concurrency: int,
+    searches: int,
+    deadline: float | None,
+) -> dict:
+    """Run `searches` unique searches with `concurrency` in flight."""
+    # Fresh breakers and server counters per level
+    circuit_breaker._breakers.clear()
+    client = get_http_client()
+    await client.get(f"{server.url}/_stats?reset=1")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+
+    async def search(index: int) -> None:
+        query = f"{PRODUCTS[index % len(PRODUCTS)]} {concurrency}-{index}"
+        async with semaphore:
+            start = time.perf_counter()
+            outcome = await service.search_all_with_status(
+                query, force_refresh=True, deadline=deadline
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses.update(outcome.status.values())
+
+    sampler = ResourceSampler()
+    sampler.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(search(i) for i in range(searches)))
+    wall = time.perf_counter() - start
+    resources = await sampler.stop(wall)
+
+    server_counts = (await client.get(f"{server.url}/_stats")).json()
+    return {
+        "concurrency": concurrency,
+        "searches": searches,
+        "wall_seconds": round(wall, 3),
+        "searches_per_minute": round(searches / wall * 60, 1),
+        "store_searches_per_minute": round(sum(statuses.values()) / wall * 60, 1),
+        "latency_ms": {
+            key: round(value, 1) for key, value in percentiles(latencies).items()
+        },
+        "statuses": dict(statuses),
+        "server_requests": server_counts.get("requests", 0),
+        "resources": resources,
+    }
+
+
+def _git_commit() -> str | None:
+    """Get the current git commit, if any."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_level(level: dict, baseline: dict | None) -> None:
+    """Print one result row, with the change against a baseline level."""
+    latency = level["latency_ms"]
+    resources = level["resources"]
+    browser = resources.get("browser", {})
+    row = (
+        f"{level['concurrency']:>5}{level['searches_per_minute']:>10.1f}"
+        f"{latency['p50']:>9.0f}{latency['p95']:>9.0f}{latency['p99']:>9.0f}"
+        f"{resources.get('process', {}).get('cpu_percent', 0.0):>8.1f}"
+        f"{resources.get('process', {}).get('peak_rss_mb', 0.0):>9.1f}"
+        f"{browser.get('cpu_percent', 0.0):>8.1f}{browser.get('peak_rss_mb', 0.0):>9.1f}"
+        f"  {', '.join(f'{k} {v}' for k, v in sorted(level['statuses'].items()))}"
+    )
+    print(row)
+    if baseline:
+        qpm = level["searches_per_minute"] / baseline["searches_per_minute"] - 1
+        p95 = latency["p95"] / baseline["latency_ms"]["p95"] - 1
+        print(f"{'':>5}  vs baseline: throughput {qpm:+.1%}, p95 {p95:+.1%}")
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Run every concurrency level and return the results."""
+    settings = get_settings()
+    # Lift the per-host limit, or apply the requested one to the stand-in host
+    settings.scrape_rate_limit = args.rate_limit or 1e-6
+    settings.scrape_rate_burst = max(settings.scrape_rate_burst, 1000)
+    rate_limiter._buckets.clear()
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    config = config_from_args(args)
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    baseline_levels = {
+        level["concurrency"]: level for level in (baseline or {}).get("levels", [])
+    }
+
+    results = []
+    with (
+        StandinServer(config) as server,
+        point_supermarkets(server.url, args.http_only),
+    ):
+        service = ScraperService()
+        service.cache = None
+        service.use_breakers = not args.no_breakers
+        # The stand-in serves store pages, not the Albert Heijn API
+        service.scrapers = {
+            name: ConfiguredScraper(name)
+            for name in service.scrapers
+            if not args.stores or name in args.stores.split(",")
+        }
+
+        print(
+            f"{len(service.scrapers)} stores, {args.searches} searches per level, "
+            f"stand-in {asdict(config)}"
+        )
+        print(
+            f"{'conc':>5}{'search/m':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+            f"{'cpu %':>8}{'rss MB':>9}{'br cpu%':>8}{'br MB':>9}  statuses"
+        )
+        try:
+            # Start the browser, connections and parse pool before timing
+            await service.search_all_with_status("warmup", force_refresh=True)
+            for concurrency in levels:
+                level = await run_level(
+                    service, server, concurrency, args.searches, args.deadline
+                )
+                print_level(level, baseline_levels.get(concurrency))
+                results.append(level)
+        finally:
+            await close_browser_pool()
+            await close_http_client()
+            close_parse_pool()
+
+    return {
+        "benchmark": "throughput",
+        "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "environment": {
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "config": {
+            "stores": sorted(service.scrapers),
+            "searches": args.searches,
+            "http_only": args.http_only,
+            "breakers": not args.no_breakers,
+            "rate_limit": args.rate_limit,
+            "deadline": settings.search_deadline
+            if args.deadline is None
+            else args.deadline,
+            "standin": asdict(config),
+        },
+        "levels": results,
+    }
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and save the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--concurrency", default="1,4,16", help="comma-separated concurrent searches"
+    )
+    parser.add_argument("--searches", type=int, default=40, help="searches per level")
+    parser.add_argument("--stores", default="", help="comma-separated stores (all)")
+    parser.add_argument(
+        "--http-only", action="store_true", help="serve every store over HTTP"
+    )
+    parser.add_argument(
+        "--no-breakers", action="store_true", help="disable circuit breakers"
+    )
+    parser.add_argument(
+        "--rate-limit", type=float, default=0.0, help="seconds per request (off)"
+    )
+    parser.add_argument(
+        "--deadline", type=float, default=None, help="search deadline (setting)"
+    )
+    parser.add_argument(
+        "--output", default=str(DEFAULT_OUTPUT), help="baseline JSON to write"
+    )
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--log-level", default="WARNING", help="scraper log level")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level)
+
+    report = asyncio.run(run(args))
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Saved baseline to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""Local stand-in for the supermarket websites, for benchmarks.
+
+Serves synthetic search pages in each store's markup (and search API JSON
+for stores with a JSON fast path) from a separate process, so serving
+never competes with the scraper's event loop. Latency and failures can
+be injected per run or per store:
+
+    /<store>/search?q=melk        listing page (HTML fast path and browser)
+    /<store>/api/search?q=melk    search API response (JSON fast path)
+    /_stats                       request counters (?reset=1 clears them)
+
+Usage:
+    python -m benchmarks.standin_server [--port 8800] [--latency-ms 200]
+"""
+
+import argparse
+import copy
+import json
+import multiprocessing
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.synthetic import listing_json, listing_page
+from src.config.constants import SUPERMARKETS
+
+# Response format per path below /<store>/
+ROUTES = {("search",): "html", ("api", "search"): "json"}
+
+
+@dataclass
+class StandinConfig:
+    """Behaviour of the stand-in stores."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    failure_rate: float = 0.0
+    failure_status: int = 503
+    cards: int = 24
+    store_latency_ms: dict[str, float] = field(default_factory=dict)
+
+    def delay(self, store: str, rng: random.Random) -> float:
+        """Get the seconds to wait before answering a request for a store."""
+        base = self.store_latency_ms.get(store, self.latency_ms)
+        return (base + rng.uniform(0, self.jitter_ms)) / 1000
+
+
+@lru_cache(maxsize=1024)
+def _render(store: str, query: str, fmt: str, cards: int) -> bytes:
+    """Render a response body once per store, query and format."""
+    if fmt == "json":
+        return json.dumps(listing_json(store, query, cards)).encode()
+    return listing_page(store, query, cards).encode()
+
+
+def _make_handler(config: StandinConfig) -> type[BaseHTTPRequestHandler]:
+    """Create a request handler class bound to a config."""
+    counts: Counter = Counter()
+    lock = threading.Lock()
+    rng = random.Random()
+
+    class Handler(BaseHTTPRequestHandler):
+        # Keep-alive, like the real sites
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            parts = url.path.strip("/").split("/")
+            params = parse_qs(url.query)
+
+            if parts == ["_stats"]:
+                with lock:
+                    body = json.dumps(dict(counts)).encode()
+                    if "reset" in params:
+                        counts.clear()
+                self._send(200, body, "application/json")
+                return
+
+            store, fmt = parts[0], ROUTES.get(tuple(parts[1:]))
+            if store not in SUPERMARKETS or fmt is None:
+                self._send(404, b"not found", "text/plain")
+                return
+
+            with lock:
+                delay = config.delay(store, rng)
+                failed = rng.random() < config.failure_rate
+                counts["requests"] += 1
+                counts[f"{store}:{'failed' if failed else 'ok'}"] += 1
+            time.sleep(delay)
+
+            if failed:
+                self._send(config.failure_status, b"unavailable", "text/plain")
+                return
+            query = params.get("q", [""])[0]
+            content_type = "application/json" if fmt == "json" else "text/html"
+            self._send(200, _render(store, query, fmt, config.cards), content_type)
+
+        def _send(self, status: int, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    return Handler
+
+
+def serve(config: StandinConfig, port: int = 0, ready=None) -> None:
+    """Serve the stand-in stores until the process is stopped.
+
+    The bound port is sent over the `ready` pipe when one is given.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(config))
+    server.daemon_threads = True
+    if ready is not None:
+        ready.send(server.server_address[1])
+    server.serve_forever()
+
+
+class StandinServer:
+    """Runs the stand-in stores in a child process."""
+
+    def __init__(self, config: StandinConfig | None = None, port: int = 0):
+        """Initialize without starting the server."""
+        self.config = config or StandinConfig()
+        self.port = port
+        self._process: multiprocessing.Process | None = None
+
+    @property
+    def url(self) -> str:
+        """Get the server's base URL."""
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self) -> "StandinServer":
+        """Start the server process and wait until it is listening."""
+        context = multiprocessing.get_context("spawn")
+        receiver, sender = context.Pipe(duplex=False)
+        self._process = context.Process(
+            target=serve, args=(self.config, self.port, sender), daemon=True
+        )
+        self._process.start()
+        if not receiver.poll(30):
+            self.stop()
+            raise RuntimeError("Stand-in server did not start")
+        self.port = receiver.recv()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server process."""
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+@contextmanager
+def point_supermarkets(server_url: str, http_only: bool = False):
+    """Point every store's URLs in SUPERMARKETS at a stand-in server.
+
+    Stores waiting for an XHR response are switched to selector readiness,
+    since the stand-in pages are server-rendered. With `http_only`, stores
+    without a fast path get an HTML one so no browser is needed. Later
+    result pages go to the stand-in too, which serves the same listing for
+    every page. The original config is restored in place on exit.
+    """
+    originals = copy.deepcopy(SUPERMARKETS)
+    try:
+        for name, config in SUPERMARKETS.items():
+            store_url = f"{server_url}/{name}"
+            config["base_url"] = store_url
+            config["search_url"] = f"{store_url}/search?q={{query}}"
+            if config.get("readiness", {}).get("strategy") == "response":
+                config["readiness"] = {"strategy": "selector"}
+
+            fast_path = config.get("fast_path")
+            if fast_path and fast_path.get("format") == "json":
+                config["fast_path"] = {
+                    **fast_path,
+                    "url": f"{store_url}/api/search?q={{query}}",
+                    "link_template": f"{store_url}/producten/{{id}}",
+                }
+            elif http_only and not fast_path:
+                config["fast_path"] = {"format": "html"}
+
+            pagination = config.get("pagination")
+            if pagination:
+                page_params = "page={page}&offset={offset}"
+                pagination["url"] = f"{store_url}/search?q={{query}}&{page_params}"
+                if "fast_path_url" in pagination:
+                    pagination["fast_path_url"] = (
+                        f"{store_url}/api/search?q={{query}}&{page_params}"
+                    )
+        yield
+    finally:
+        # Scrapers hold references to the per-store dicts, so restore in place
+        for name, config in originals.items():
+            SUPERMARKETS[name].clear()
+            SUPERMARKETS[name].update(config)
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the stand-in behaviour options to a parser."""
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="response delay")
+    parser.add_argument(
+        "--jitter-ms", type=float, default=0.0, help="random extra delay"
+    )
+    parser.add_argument(
+        "--failure-rate", type=float, default=0.0, help="fraction of failed requests"
+    )
+    parser.add_argument(
+        "--failure-status", type=int, default=503, help="status of failed requests"
+    )
+    parser.add_argument("--cards", type=int, default=24, help="products per page")
+    parser.add_argument(
+        "--store-latency",
+        action="append",
+        default=[],
+        metavar="STORE=MS",
+        help="response delay for one store (repeatable)",
+    )
+
+
+def config_from_args(args: argparse.Namespace) -> StandinConfig:
+    """Build a StandinConfig from parsed options."""
+    store_latency = {}
+    for item in args.store_latency:
+        store, _, ms = item.partition("=")
+        store_latency[store] = float(ms)
+    return StandinConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        failure_status=args.failure_status,
+        cards=args.cards,
+        store_latency_ms=store_latency,
+    )
+
+
+def main() -> None:
+    """Parse arguments and serve in the foreground."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8800, help="port to listen on")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    config = config_from_args(args)
+    print(f"Serving stand-in stores on http://127.0.0.1:{args.port} {asdict(config)}")
+    try:
+        serve(config, args.port)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
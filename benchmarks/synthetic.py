@@ -0,0 +1,128 @@
+"""Synthetic product listing markup in each supermarket's page structure."""
+
+import random
+import re
+
+from src.config.constants import SUPERMARKETS
+
+# Simple selectors as used in SUPERMARKETS: [attr="value"], .class or #id
+_SELECTOR_RE = re.compile(
+    r"^\[([\w-]+)=['\"]([^'\"]+)['\"]\]$|^\.([\w-]+)$|^#([\w-]+)$"
+)
+
+BRANDS = ["AH", "Jumbo", "Campina", "Heineken", "Lay's", "Calvé", "Unox", "Dirk"]
+PRODUCTS = [
+    "Halfvolle melk",
+    "Pilsener",
+    "Pindakaas",
+    "Chips naturel",
+    "Goudse kaas jong",
+    "Volkoren brood",
+    "Scharreleieren",
+    "Rookworst",
+]
+UNITS = ["1 L", "500 g", "6x33cl", "10 stuks", "250 ml", "1,5 kg", "400 gram"]
+
+
+def element(selector: str, content: str, tag: str = "div", extra: str = "") -> str:
+    """Render an element that matches a simple CSS selector."""
+    match = _SELECTOR_RE.match(selector.strip())
+    if not match:
+        raise ValueError(f"Unsupported selector: {selector}")
+
+    attr, value, css_class, element_id = match.groups()
+    if attr:
+        attrs = f'{attr}="{value}"'
+    elif css_class:
+        attrs = f'class="{css_class}"'
+    else:
+        attrs = f'id="{element_id}"'
+    return f"<{tag} {attrs}{extra}>{content}</{tag}>"
+
+
+def format_price(price: float) -> str:
+    """Format a price the way Dutch shops display it."""
+    return f"€ {price:.2f}".replace(".", ",")
+
+
+def product_card(store: str, index: int, rng: random.Random) -> str:
+    """Render one product card for a store."""
+    selectors = SUPERMARKETS[store]["selectors"]
+    name = f"{rng.choice(BRANDS)} {rng.choice(PRODUCTS)} {rng.choice(UNITS)}"
+    price = round(rng.uniform(0.49, 9.99), 2)
+
+    parts = [
+        f'<a href="/producten/product/{store}-{index}">',
+        f'<img src="https://static.example.com/{store}/{index}.jpg" alt="">',
+        element(selectors["product_title"], name, tag="span"),
+        "</a>",
+        element(selectors["product_price"], format_price(price)),
+    ]
+    if "bonus_price" in selectors and rng.random() < 0.3:
+        parts.append(element(selectors["bonus_price"], format_price(price * 0.75)))
+
+    return element(selectors["product_card"], "".join(parts), tag="article")
+
+
+def listing_page(store: str, query: str, count: int = 24, seed: int = 0) -> str:
+    """Render a search result page with `count` product cards."""
+    rng = random.Random(f"{store}:{query}:{seed}")
+    selectors = SUPERMARKETS[store]["selectors"]
+
+    banner = ""
+    if "cookie_accept" in selectors:
+        banner = element(
+            selectors["cookie_accept"],
+            "Accepteren",
+            tag="button",
+            extra=' onclick="this.remove()"',
+        )
+
+    cards = "\n".join(product_card(store, i, rng) for i in range(count))
+    return (
+        "<!DOCTYPE html><html lang='nl'><head><meta charset='utf-8'>"
+        f"<title>{query}</title></head><body>{banner}<main>{cards}</main>"
+        "</body></html>"
+    )
+
+
+def _put(target: dict, path: str, value) -> None:
+    """Set a value at a dotted path, creating dicts and lists on the way."""
+    keys = [int(key) if key.isdigit() else key for key in path.split(".")]
+    node = target
+    for key, following in zip(keys, keys[1:]):
+        if isinstance(node, list):
+            while len(node) <= key:
+                node.append([] if isinstance(following, int) else {})
+            node = node[key]
+        else:
+            node = node.setdefault(key, [] if isinstance(following, int) else {})
+    if isinstance(node, list):
+        node.extend([None] * (keys[-1] + 1 - len(node)))
+    node[keys[-1]] = value
+
+
+def listing_json(store: str, query: str, count: int = 24, seed: int = 0) -> dict:
+    """Build a search API response in the shape of a store's JSON fast path."""
+    rng = random.Random(f"{store}:{query}:{seed}")
+    fast_path = SUPERMARKETS[store]["fast_path"]
+    fields = fast_path["fields"]
+    scale = fast_path.get("price_scale", 1)
+
+    items = []
+    for index in range(count):
+        price = round(rng.uniform(0.49, 9.99), 2)
+        values = {
+            "title": f"{rng.choice(BRANDS)} {rng.choice(PRODUCTS)} {rng.choice(UNITS)}",
+            "price": round(price / scale) if scale != 1 else price,
+            "image": f"https://static.example.com/{store}/{index}.jpg",
+        }
+        item = {"id": f"{store}-{index}"}
+        for key, path in fields.items():
+            if key in values:
+                _put(item, path, values[key])
+        items.append(item)
+
+    response: dict = {}
+    _put(response, fast_path["items"], items)
+    return response
@@ -1,10 +1,26 @@
 """FastAPI routes for the price comparison API."""
 
+import json
+
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from loguru import logger
 
+from src.config.constants import SUPERMARKETS
+from src.config.settings import get_settings
 from src.services.price_service import PriceService
+from src.services.circuit_breaker import (
+    get_all_circuit_breakers,
+    get_circuit_breaker,
+)
+from src.services.refresh_scheduler import get_refresh_scheduler
+from src.services.search_cache import get_search_cache
+from src.services.single_flight import get_search_flights
+from src.scrapers.parse_pool import get_parse_pool
+from src.scrapers.resource_blocking import get_all_blocking_stats
+from src.scrapers.tier_metrics import get_tier_metrics
+from src.scrapers.timing import get_timing_metrics, get_timing_summary
 from src.database import get_db
 from src.database.crud import (
     get_all_supermarkets,
@@ -21,6 +37,8 @@ class SearchRequest(BaseModel):
     """Search request model."""
 
     query: str
+    force_refresh: bool = False
+    deadline: float | None = None
 
 
 class ShoppingListRequest(BaseModel):
@@ -69,13 +87,43 @@ async def search_products(request: SearchRequest):
     """Search for products across all supermarkets."""
     price_service = PriceService()
     try:
-        results = await price_service.search_and_compare(request.query)
-        return {"query": request.query, "results": results}
+        results, status = await price_service.search_and_compare_with_status(
+            request.query,
+            force_refresh=request.force_refresh,
+            deadline=request.deadline,
+        )
+        return {"query": request.query, "results": results, "status": status}
     except Exception as e:
         logger.error(f"Search error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/search/stream")
+async def stream_search_products(request: SearchRequest):
+    """Stream each supermarket's result as it arrives (NDJSON).
+
+    Emits one "store" event per supermarket, in completion order, and a
+    final "summary" event with the status per store and the cheapest match.
+    Stores fetching several result pages also emit "partial" events with
+    their match so far.
+    """
+    price_service = PriceService()
+
+    async def events():
+        try:
+            async for event in price_service.stream_search(
+                request.query,
+                force_refresh=request.force_refresh,
+                deadline=request.deadline,
+            ):
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            logger.error(f"Streaming search error: {e}")
+            yield json.dumps({"event": "error", "detail": str(e)}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 @router.post("/compare")
 async def compare_shopping_list(request: CompareRequest):
     """Compare shopping list across supermarkets."""
@@ -144,6 +192,47 @@ async def delete_list(list_id: int):
         return {"success": True}
 
 
+@router.get("/metrics")
+async def scraper_metrics():
+    """Get scraper performance counters."""
+    metrics = {
+        "resource_blocking": get_all_blocking_stats(),
+        "scrape_tiers": get_tier_metrics(),
+        "search_cache": get_search_cache().stats(),
+        "single_flight": get_search_flights().stats(),
+        "circuit_breakers": get_all_circuit_breakers(),
+        "parse_pool": get_parse_pool().stats(),
+        "scrape_timings": get_timing_summary(),
+    }
+    if get_settings().scheduler_enabled:
+        metrics["scheduler"] = get_refresh_scheduler().stats()
+    return metrics
+
+
+@router.get("/metrics/timings")
+async def scrape_timings(supermarket: str | None = None, stage: str | None = None):
+    """Get per-stage scrape latency histograms, optionally for one store or stage."""
+    if supermarket is not None and supermarket not in SUPERMARKETS:
+        raise HTTPException(status_code=404, detail="Supermarket not found")
+    return get_timing_metrics(supermarket, stage)
+
+
+@router.get("/circuit-breakers")
+async def list_circuit_breakers():
+    """Get the circuit breaker state of every supermarket."""
+    return {name: get_circuit_breaker(name).snapshot() for name in SUPERMARKETS}
+
+
+@router.post("/circuit-breakers/{supermarket}/reset")
+async def reset_circuit_breaker(supermarket: str):
+    """Close a supermarket's circuit breaker."""
+    if supermarket not in SUPERMARKETS:
+        raise HTTPException(status_code=404, detail="Supermarket not found")
+    breaker = get_circuit_breaker(supermarket)
+    breaker.reset()
+    return {supermarket: breaker.snapshot()}
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -1,6 +1,66 @@
 """Constants for supermarket scraping."""
 
-from typing import TypedDict
+from typing import NotRequired, TypedDict
+
+
+class ReadinessConfig(TypedDict, total=False):
+    """Search page readiness configuration type.
+
+    strategy is one of:
+        selector: product cards are present after DOMContentLoaded
+        response: an XHR whose URL contains response_url has completed
+        stable_count: the number of product cards stopped changing
+    """
+
+    strategy: str
+    response_url: str
+    stable_interval_ms: int
+
+
+class FastPathConfig(TypedDict, total=False):
+    """Plain HTTP search tier configuration type.
+
+    format is "html" (parsed with the store's selectors) or "json" (items
+    and fields are dotted paths into the response).
+    """
+
+    format: str
+    url: str
+    items: str
+    fields: dict[str, str]
+    price_scale: float
+    link_template: str
+
+
+class PaginationConfig(TypedDict, total=False):
+    """Search result pagination configuration type.
+
+    url (and fast_path_url for the HTTP tier) are templates for later
+    result pages, taking {query}, {page} (numbered from first_page) and
+    {offset}. total is a selector for the element showing the number of
+    results, fast_path_total the dotted path to it in a JSON fast path
+    response.
+    """
+
+    page_size: int
+    first_page: int
+    url: str
+    total: str
+    fast_path_url: str
+    fast_path_total: str
+
+
+class FieldRuleConfig(TypedDict, total=False):
+    """Product card field rule configuration type.
+
+    Reads the text of the first element matching selector within a card,
+    or its attribute if set, and parses it with parse ("text", "price" or
+    "url"). See src/scrapers/extraction.py for the default rules.
+    """
+
+    selector: str
+    attribute: str
+    parse: str
 
 
 class SupermarketConfig(TypedDict):
@@ -17,7 +77,60 @@ class SupermarketConfig(TypedDict):
     has_bonus_card: bool
     bonus_card_name: str | None
     selectors: dict[str, str]
+    fields: NotRequired[dict[str, FieldRuleConfig]]
+    crawl_seeds: NotRequired[list[str]]
+    blocked_domains: list[str]
+    readiness: ReadinessConfig
+    fast_path: FastPathConfig | None
+    pagination: NotRequired[PaginationConfig]
+    cache_ttl: int
+
+
+# Analytics and advertising hosts that never carry product data
+TRACKER_DOMAINS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "hotjar.com",
+    "bing.com",
+    "criteo.com",
+]
 
+# Search terms a catalog crawl walks when a store has no crawl_seeds
+CATALOG_SEEDS = [
+    "aardappelen",
+    "groente",
+    "fruit",
+    "vlees",
+    "vis",
+    "kaas",
+    "melk",
+    "yoghurt",
+    "eieren",
+    "brood",
+    "ontbijtgranen",
+    "pasta",
+    "rijst",
+    "soep",
+    "saus",
+    "koffie",
+    "thee",
+    "frisdrank",
+    "sap",
+    "bier",
+    "wijn",
+    "snoep",
+    "chips",
+    "koek",
+    "diepvries",
+    "baby",
+    "wasmiddel",
+    "schoonmaak",
+    "toiletpapier",
+    "verzorging",
+]
 
 SUPERMARKETS: dict[str, SupermarketConfig] = {
     "albert_heijn": {
@@ -38,6 +151,16 @@ SUPERMARKETS: dict[str, SupermarketConfig] = {
             "bonus_price": '[data-testhook="bonus-price"]',
             "cookie_accept": "#accept-cookies",
         },
+        "blocked_domains": [*TRACKER_DOMAINS, "adobedtm.com", "omtrdc.net"],
+        "readiness": {"strategy": "selector"},
+        "fast_path": {"format": "html"},
+        "pagination": {
+            "page_size": 36,
+            "first_page": 1,
+            "url": "https://www.ah.nl/zoeken?query={query}&page={page}",
+            "total": '[data-testhook="search-result-count"]',
+        },
+        "cache_ttl": 3600,
     },
     "jumbo": {
         "name": "jumbo",
@@ -56,6 +179,31 @@ SUPERMARKETS: dict[str, SupermarketConfig] = {
             "product_price": '[data-testid="price"]',
             "cookie_accept": "#onetrust-accept-btn-handler",
         },
+        "blocked_domains": [*TRACKER_DOMAINS, "dynatrace.com", "tiqcdn.com"],
+        "readiness": {"strategy": "stable_count", "stable_interval_ms": 300},
+        "fast_path": {
+            "format": "json",
+            "url": "https://mobileapi.jumbo.com/v17/search?q={query}",
+            "items": "products.data",
+            "fields": {
+                "title": "title",
+                "price": "prices.price.amount",
+                "image": "imageInfo.primaryView.0.url",
+            },
+            "price_scale": 0.01,
+            "link_template": "https://www.jumbo.com/producten/{id}",
+        },
+        "pagination": {
+            "page_size": 24,
+            "first_page": 0,
+            "url": "https://www.jumbo.com/zoeken?searchTerms={query}&offSet={offset}",
+            "total": '[data-testid="search-result-count"]',
+            "fast_path_url": (
+                "https://mobileapi.jumbo.com/v17/search?q={query}&offset={offset}"
+            ),
+            "fast_path_total": "products.total",
+        },
+        "cache_ttl": 3600,
     },
     "dirk": {
         "name": "dirk",
@@ -73,7 +221,18 @@ SUPERMARKETS: dict[str, SupermarketConfig] = {
             "product_title": ".product-card__title",
             "product_price": ".product-card__price",
             "cookie_accept": ".cookie-consent__accept",
+            "detail_price": ".product-price",
+        },
+        "blocked_domains": [*TRACKER_DOMAINS],
+        "readiness": {"strategy": "selector"},
+        "fast_path": {"format": "html"},
+        "pagination": {
+            "page_size": 24,
+            "first_page": 1,
+            "url": "https://www.dirk.nl/zoeken?q={query}&page={page}",
+            "total": ".search-results__count",
         },
+        "cache_ttl": 3600,
     },
     "plus": {
         "name": "plus",
@@ -91,7 +250,18 @@ SUPERMARKETS: dict[str, SupermarketConfig] = {
             "product_title": ".product-tile__title",
             "product_price": ".product-tile__price",
             "cookie_accept": "#CybotCookiebotDialogBodyButtonAccept",
+            "detail_price": ".product-price",
+        },
+        "blocked_domains": [*TRACKER_DOMAINS, "relewise.com"],
+        "readiness": {"strategy": "response", "response_url": "/screenservices/"},
+        "fast_path": None,
+        "pagination": {
+            "page_size": 12,
+            "first_page": 1,
+            "url": "https://www.plus.nl/zoeken?q={query}&PageNumber={page}",
+            "total": ".search-result-count",
         },
+        "cache_ttl": 3600,
     },
     "flink": {
         "name": "flink",
@@ -110,6 +280,10 @@ SUPERMARKETS: dict[str, SupermarketConfig] = {
             "product_price": "[data-testid='product-price']",
             "cookie_accept": "[data-testid='cookie-accept']",
         },
+        "blocked_domains": [*TRACKER_DOMAINS, "segment.io", "amplitude.com"],
+        "readiness": {"strategy": "stable_count", "stable_interval_ms": 300},
+        "fast_path": None,
+        "cache_ttl": 1800,
     },
     "picnic": {
         "name": "picnic",
@@ -127,7 +301,12 @@ SUPERMARKETS: dict[str, SupermarketConfig] = {
             "product_title": ".product-card__name",
             "product_price": ".product-card__price",
             "cookie_accept": ".cookie-banner__accept",
+            "detail_price": ".product-price",
         },
+        "blocked_domains": [*TRACKER_DOMAINS, "segment.io"],
+        "readiness": {"strategy": "stable_count", "stable_interval_ms": 300},
+        "fast_path": None,
+        "cache_ttl": 1800,
     },
 }
 
@@ -12,9 +12,82 @@ class Settings(BaseSettings):
     database_url: str = "sqlite:///data/supermarket.db"
 
     # Scraping
-    scrape_rate_limit: float = 2.0
+    scrape_rate_limit: float = 2.0  # seconds per request per host, sustained
+    scrape_rate_burst: int = 3
     scrape_max_retries: int = 3
     scrape_timeout: int = 30000
+    scrape_ready_timeout: int = 10000
+    scrape_extraction_mode: str = "evaluate"  # evaluate | elements
+    scrape_block_resources: bool = True
+    scrape_blocked_resource_types: list[str] = ["image", "media", "font"]
+    scrape_http_fast_path: bool = True
+    scrape_fixture_mode: str = "off"  # off | record | replay
+    detail_concurrency: int = 4
+    scrape_result_target: int = 10  # results per store and query
+    scrape_max_pages: int = 5  # result pages fetched per store and query
+    ah_use_api: bool = True
+
+    # Scrape timing
+    scrape_slow_ms: float = 5000.0  # log slower searches' stages at INFO
+    timing_summary_interval: float = 0.0  # seconds between log summaries, 0 off
+
+    # Parse pool
+    parse_pool_workers: int = 2  # 0 parses on the event loop
+    parse_pool_min_bytes: int = 20_000  # smaller payloads are parsed inline
+
+    # HTTP client
+    http_timeout: float = 10.0
+    http_max_connections: int = 20
+
+    # Browser pool
+    browser_pool_size: int = 2
+    browser_max_pages: int = 50
+
+    # Cookie consent
+    consent_state_ttl_hours: float = 24.0
+
+    # Search result cache
+    search_cache_enabled: bool = True
+    search_cache_max_entries: int = 2000
+    search_cache_max_bytes: int = 50_000_000
+
+    # Multi-store search
+    search_deadline: float = 15.0  # seconds, 0 waits for every store
+    search_finish_in_background: bool = True
+
+    # Circuit breaker
+    circuit_breaker_enabled: bool = True
+    circuit_breaker_failure_threshold: int = 3
+    circuit_breaker_reset_timeout: float = 60.0  # seconds before a probe
+
+    # Smart search
+    smart_search_concurrency: int = 4
+    smart_search_deadline: float = 5.0
+
+    # Refresh scheduler
+    search_log_enabled: bool = True
+    scheduler_enabled: bool = False  # run inside the API process
+    scheduler_interval: float = 60.0  # seconds between planning rounds
+    scheduler_concurrency: int = 4
+    scheduler_store_budget: int = 120  # refreshes per store per hour
+    scheduler_max_jobs: int = 50  # per planning round
+    scheduler_refresh_ratio: float = 0.8  # refresh at this fraction of cache_ttl
+    scheduler_popularity_days: int = 7
+    scheduler_min_popularity: float = 2.0  # less popular items are left cold
+    scheduler_favorite_weight: float = 5.0
+
+    # Scrape job workers
+    scheduler_use_queue: bool = False  # enqueue refreshes for workers instead
+    worker_processes: int = 1
+    worker_concurrency: int = 4
+    worker_lease_seconds: float = 120.0
+    worker_poll_interval: float = 5.0
+    worker_max_attempts: int = 3
+    worker_backoff_base: float = 30.0  # seconds, doubled per attempt
+    worker_backoff_max: float = 1800.0
+
+    # Catalog crawl
+    crawl_max_pages: int = 50  # result pages walked per seed
 
     # Logging
     log_level: str = "INFO"
@@ -7,8 +7,12 @@ from src.database.models import (
     ProductDB,
     PriceRecordDB,
     FavoriteProductDB,
+    SearchLogDB,
     ShoppingListDB,
     ShoppingListItemDB,
+    ListingFingerprintDB,
+    CrawlCheckpointDB,
+    ScrapeJobDB,
 )
 
 __all__ = [
@@ -19,6 +23,10 @@ __all__ = [
     "ProductDB",
     "PriceRecordDB",
     "FavoriteProductDB",
+    "SearchLogDB",
     "ShoppingListDB",
     "ShoppingListItemDB",
+    "ListingFingerprintDB",
+    "CrawlCheckpointDB",
+    "ScrapeJobDB",
 ]
@@ -1,8 +1,8 @@
 """CRUD operations for database models."""
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, func, or_
 from loguru import logger
 
 from src.database.models import (
@@ -10,8 +10,12 @@ from src.database.models import (
     ProductDB,
     PriceRecordDB,
     FavoriteProductDB,
+    SearchLogDB,
     ShoppingListDB,
     ShoppingListItemDB,
+    ListingFingerprintDB,
+    CrawlCheckpointDB,
+    ScrapeJobDB,
 )
 
 
@@ -161,6 +165,46 @@ def delete_favorite(db: Session, favorite_id: int) -> bool:
     return False
 
 
+# Search Log CRUD
+def log_search(db: Session, query: str) -> SearchLogDB:
+    """Record a user search."""
+    entry = SearchLogDB(query=query)
+    db.add(entry)
+    db.flush()
+    return entry
+
+
+def get_popular_queries(
+    db: Session, since: datetime, limit: int = 100
+) -> list[tuple[str, int]]:
+    """Get the most searched queries since a moment, with their counts."""
+    count = func.count(SearchLogDB.id)
+    rows = (
+        db.query(SearchLogDB.query, count)
+        .filter(SearchLogDB.searched_at >= since)
+        .group_by(SearchLogDB.query)
+        .order_by(count.desc())
+        .limit(limit)
+        .all()
+    )
+    return [(query, searches) for query, searches in rows]
+
+
+def get_latest_price_record(
+    db: Session, product_id: int, supermarket_id: int
+) -> PriceRecordDB | None:
+    """Get the most recent price record of a product at a supermarket."""
+    return (
+        db.query(PriceRecordDB)
+        .filter(
+            PriceRecordDB.product_id == product_id,
+            PriceRecordDB.supermarket_id == supermarket_id,
+        )
+        .order_by(PriceRecordDB.scraped_at.desc())
+        .first()
+    )
+
+
 # Shopping List CRUD
 def create_shopping_list(db: Session, name: str) -> ShoppingListDB:
     """Create a new shopping list."""
@@ -233,3 +277,360 @@ def delete_shopping_list(db: Session, list_id: int) -> bool:
         db.expire_all()
         return True
     return False
+
+
+# Crawl CRUD
+def get_fingerprints(
+    db: Session, supermarket: str, keys: list[str]
+) -> dict[str, ListingFingerprintDB]:
+    """Get the stored fingerprints for a store's listing keys."""
+    if not keys:
+        return {}
+    rows = (
+        db.query(ListingFingerprintDB)
+        .filter(
+            ListingFingerprintDB.supermarket == supermarket,
+            ListingFingerprintDB.key.in_(keys),
+        )
+        .all()
+    )
+    return {row.key: row for row in rows}
+
+
+def upsert_fingerprint(
+    db: Session,
+    supermarket: str,
+    key: str,
+    content_hash: str,
+    existing: ListingFingerprintDB | None = None,
+    listing_keys: list[str] | None = None,
+) -> ListingFingerprintDB:
+    """Store a listing's content hash, recording when it last changed.
+
+    For a search page, `listing_keys` are the keys of the listings on it.
+    """
+    now = datetime.utcnow()
+    if existing is None:
+        existing = ListingFingerprintDB(
+            supermarket=supermarket,
+            key=key,
+            content_hash=content_hash,
+            first_seen=now,
+            last_changed=now,
+        )
+        db.add(existing)
+    elif existing.content_hash != content_hash:
+        existing.content_hash = content_hash
+        existing.last_changed = now
+    if listing_keys is not None:
+        existing.listing_keys = listing_keys
+    existing.last_seen = now
+    db.flush()
+    return existing
+
+
+def touch_fingerprints(db: Session, supermarket: str, keys: list[str]) -> int:
+    """Mark unchanged listings as seen now."""
+    if not keys:
+        return 0
+    return (
+        db.query(ListingFingerprintDB)
+        .filter(
+            ListingFingerprintDB.supermarket == supermarket,
+            ListingFingerprintDB.key.in_(keys),
+        )
+        .update({"last_seen": datetime.utcnow()}, synchronize_session=False)
+    )
+
+
+def get_active_checkpoint(db: Session, supermarket: str) -> CrawlCheckpointDB | None:
+    """Get the unfinished crawl checkpoint for a store."""
+    return (
+        db.query(CrawlCheckpointDB)
+        .filter(
+            CrawlCheckpointDB.supermarket == supermarket,
+            CrawlCheckpointDB.status == "running",
+        )
+        .order_by(CrawlCheckpointDB.started_at.desc())
+        .first()
+    )
+
+
+def create_checkpoint(
+    db: Session, supermarket: str, seeds: list[str]
+) -> CrawlCheckpointDB:
+    """Start a new crawl checkpoint for a store."""
+    checkpoint = CrawlCheckpointDB(
+        supermarket=supermarket, seeds=list(seeds), position=0, stats={}
+    )
+    db.add(checkpoint)
+    db.flush()
+    return checkpoint
+
+
+def update_checkpoint(
+    db: Session,
+    checkpoint: CrawlCheckpointDB,
+    position: int,
+    stats: dict,
+    status: str | None = None,
+) -> CrawlCheckpointDB:
+    """Advance a crawl checkpoint and store its running statistics."""
+    checkpoint.position = position
+    checkpoint.stats = dict(stats)
+    checkpoint.updated_at = datetime.utcnow()
+    if status:
+        checkpoint.status = status
+        if status != "running":
+            checkpoint.finished_at = checkpoint.updated_at
+    db.flush()
+    return checkpoint
+
+
+# Scrape Job CRUD
+JOB_PENDING = "pending"
+JOB_LEASED = "leased"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+def enqueue_scrape_job(
+    db: Session,
+    supermarket: str,
+    target: str,
+    kind: str = "query",
+    priority: int = 0,
+    max_attempts: int = 3,
+) -> ScrapeJobDB:
+    """Queue a scrape job, or return the unfinished job for the same target."""
+    existing = (
+        db.query(ScrapeJobDB)
+        .filter(
+            ScrapeJobDB.supermarket == supermarket,
+            ScrapeJobDB.kind == kind,
+            ScrapeJobDB.target == target,
+            ScrapeJobDB.status.in_([JOB_PENDING, JOB_LEASED]),
+        )
+        .first()
+    )
+    if existing:
+        existing.priority = max(existing.priority, priority)
+        db.flush()
+        return existing
+
+    job = ScrapeJobDB(
+        supermarket=supermarket,
+        kind=kind,
+        target=target,
+        priority=priority,
+        max_attempts=max_attempts,
+        status=JOB_PENDING,
+        available_at=datetime.utcnow(),
+    )
+    db.add(job)
+    db.flush()
+    return job
+
+
+def _leasable(now: datetime):
+    """Filter for jobs that are due or whose lease has expired."""
+    return or_(
+        and_(ScrapeJobDB.status == JOB_PENDING, ScrapeJobDB.available_at <= now),
+        and_(ScrapeJobDB.status == JOB_LEASED, ScrapeJobDB.lease_expires_at <= now),
+    )
+
+
+def lease_scrape_jobs(
+    db: Session, owner: str, limit: int, lease_seconds: float
+) -> list[ScrapeJobDB]:
+    """Lease up to `limit` due jobs for a worker.
+
+    Each job is claimed with a conditional UPDATE, so concurrent workers
+    sharing the database never lease the same job twice. Jobs whose lease
+    expired without a heartbeat are leased again, or failed if that was
+    their last attempt.
+    """
+    now = datetime.utcnow()
+    exhausted = (
+        db.query(ScrapeJobDB)
+        .filter(
+            ScrapeJobDB.status == JOB_LEASED,
+            ScrapeJobDB.lease_expires_at <= now,
+            ScrapeJobDB.attempts >= ScrapeJobDB.max_attempts,
+        )
+        .update(
+            {
+                ScrapeJobDB.status: JOB_FAILED,
+                ScrapeJobDB.lease_expires_at: None,
+                ScrapeJobDB.finished_at: now,
+                ScrapeJobDB.last_error: "lease expired",
+            },
+            synchronize_session=False,
+        )
+    )
+    if exhausted:
+        logger.warning(f"Failed {exhausted} scrape jobs whose last lease expired")
+
+    candidates = (
+        db.query(ScrapeJobDB.id)
+        .filter(_leasable(now))
+        .order_by(ScrapeJobDB.priority.desc(), ScrapeJobDB.available_at)
+        .limit(limit * 2)
+        .all()
+    )
+
+    leased = []
+    for (job_id,) in candidates:
+        if len(leased) >= limit:
+            break
+        claimed = (
+            db.query(ScrapeJobDB)
+            .filter(ScrapeJobDB.id == job_id, _leasable(now))
+            .update(
+                {
+                    ScrapeJobDB.status: JOB_LEASED,
+                    ScrapeJobDB.lease_owner: owner,
+                    ScrapeJobDB.lease_expires_at: now
+                    + timedelta(seconds=lease_seconds),
+                    ScrapeJobDB.heartbeat_at: now,
+                    ScrapeJobDB.attempts: ScrapeJobDB.attempts + 1,
+                },
+                synchronize_session=False,
+            )
+        )
+        if claimed:
+            leased.append(job_id)
+
+    db.flush()
+    if not leased:
+        return []
+    return (
+        db.query(ScrapeJobDB)
+        .populate_existing()
+        .filter(ScrapeJobDB.id.in_(leased))
+        .all()
+    )
+
+
+def heartbeat_scrape_job(
+    db: Session, job_id: int, owner: str, lease_seconds: float
+) -> bool:
+    """Extend a job's lease; False if the worker no longer holds it."""
+    now = datetime.utcnow()
+    updated = (
+        db.query(ScrapeJobDB)
+        .filter(
+            ScrapeJobDB.id == job_id,
+            ScrapeJobDB.lease_owner == owner,
+            ScrapeJobDB.status == JOB_LEASED,
+        )
+        .update(
+            {
+                ScrapeJobDB.lease_expires_at: now + timedelta(seconds=lease_seconds),
+                ScrapeJobDB.heartbeat_at: now,
+            },
+            synchronize_session=False,
+        )
+    )
+    return bool(updated)
+
+
+def complete_scrape_job(
+    db: Session, job_id: int, owner: str, result_count: int
+) -> bool:
+    """Mark a leased job as done; False if the worker no longer holds it."""
+    updated = (
+        db.query(ScrapeJobDB)
+        .filter(
+            ScrapeJobDB.id == job_id,
+            ScrapeJobDB.lease_owner == owner,
+            ScrapeJobDB.status == JOB_LEASED,
+        )
+        .update(
+            {
+                ScrapeJobDB.status: JOB_DONE,
+                ScrapeJobDB.result_count: result_count,
+                ScrapeJobDB.lease_expires_at: None,
+                ScrapeJobDB.finished_at: datetime.utcnow(),
+            },
+            synchronize_session=False,
+        )
+    )
+    return bool(updated)
+
+
+def defer_scrape_job(
+    db: Session, job_id: int, owner: str, delay: float, reason: str
+) -> bool:
+    """Put a leased job back without counting the attempt.
+
+    Returns False if the worker no longer holds it.
+    """
+    updated = (
+        db.query(ScrapeJobDB)
+        .filter(
+            ScrapeJobDB.id == job_id,
+            ScrapeJobDB.lease_owner == owner,
+            ScrapeJobDB.status == JOB_LEASED,
+        )
+        .update(
+            {
+                ScrapeJobDB.status: JOB_PENDING,
+                ScrapeJobDB.attempts: ScrapeJobDB.attempts - 1,
+                ScrapeJobDB.lease_expires_at: None,
+                ScrapeJobDB.available_at: datetime.utcnow() + timedelta(seconds=delay),
+                ScrapeJobDB.last_error: reason[:500],
+            },
+            synchronize_session=False,
+        )
+    )
+    return bool(updated)
+
+
+def fail_scrape_job(
+    db: Session,
+    job_id: int,
+    owner: str,
+    error: str,
+    backoff_base: float,
+    backoff_max: float,
+) -> str | None:
+    """Record a failed attempt, retrying with exponential backoff.
+
+    Returns the job's new status, or None if the worker no longer holds it.
+    """
+    job = (
+        db.query(ScrapeJobDB)
+        .populate_existing()
+        .filter(
+            ScrapeJobDB.id == job_id,
+            ScrapeJobDB.lease_owner == owner,
+            ScrapeJobDB.status == JOB_LEASED,
+        )
+        .first()
+    )
+    if job is None:
+        return None
+
+    now = datetime.utcnow()
+    job.last_error = error[:500]
+    job.lease_expires_at = None
+    if job.attempts >= job.max_attempts:
+        job.status = JOB_FAILED
+        job.finished_at = now
+    else:
+        delay = min(backoff_max, backoff_base * 2 ** (job.attempts - 1))
+        job.status = JOB_PENDING
+        job.available_at = now + timedelta(seconds=delay)
+    db.flush()
+    return job.status
+
+
+def get_scrape_job_counts(db: Session) -> dict[str, int]:
+    """Get the number of scrape jobs per status."""
+    rows = (
+        db.query(ScrapeJobDB.status, func.count(ScrapeJobDB.id))
+        .group_by(ScrapeJobDB.status)
+        .all()
+    )
+    return {status: count for status, count in rows}
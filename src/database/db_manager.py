@@ -2,14 +2,33 @@
 
 from pathlib import Path
 from contextlib import contextmanager
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import StaticPool
 from loguru import logger
 
 from src.database.models import Base
 from src.config.settings import get_settings
 
 
+def _serialize_sqlite_writers(engine: Engine) -> None:
+    """Start SQLite transactions with BEGIN IMMEDIATE.
+
+    Sessions in threads or worker processes sharing the file then queue
+    for the write lock (up to the busy timeout) instead of failing with
+    "database is locked" when two read-then-write transactions collide.
+    Taking over BEGIN from pysqlite also makes savepoints work.
+    """
+
+    @event.listens_for(engine, "connect")
+    def _no_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin_immediate(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
 class DatabaseManager:
     """Manages database connections and sessions."""
 
@@ -23,13 +42,21 @@ class DatabaseManager:
             db_path = Path(self.database_url.replace("sqlite:///", ""))
             db_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # An in-memory database exists per connection, so share one across
+        # threads (e.g. sessions opened through asyncio.to_thread)
+        pool_options = (
+            {"poolclass": StaticPool} if ":memory:" in self.database_url else {}
+        )
         self.engine = create_engine(
             self.database_url,
             connect_args={"check_same_thread": False}
             if "sqlite" in self.database_url
             else {},
             echo=False,
+            **pool_options,
         )
+        if "sqlite" in self.database_url:
+            _serialize_sqlite_writers(self.engine)
         self.SessionLocal = sessionmaker(
             autocommit=False, autoflush=False, bind=self.engine
         )
@@ -95,6 +95,16 @@ class FavoriteProductDB(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+class SearchLogDB(Base):
+    """Search log database model."""
+
+    __tablename__ = "search_logs"
+
+    id = Column(Integer, primary_key=True)
+    query = Column(String, nullable=False, index=True)
+    searched_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
 class ShoppingListDB(Base):
     """Shopping list database model."""
 
@@ -127,3 +137,71 @@ class ShoppingListItemDB(Base):
 
     # Relationships
     shopping_list = relationship("ShoppingListDB", back_populates="items")
+
+
+class ListingFingerprintDB(Base):
+    """Content hash of a crawled product listing or search page."""
+
+    __tablename__ = "listing_fingerprints"
+
+    id = Column(Integer, primary_key=True)
+    supermarket = Column(String, nullable=False)
+    key = Column(String, nullable=False)
+    content_hash = Column(String, nullable=False)
+    listing_keys = Column(JSON)  # search pages only: keys of their listings
+    first_seen = Column(DateTime, default=datetime.utcnow)
+    last_seen = Column(DateTime, default=datetime.utcnow)
+    last_changed = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index(
+            "ix_listing_fingerprints_supermarket_key",
+            "supermarket",
+            "key",
+            unique=True,
+        ),
+    )
+
+
+class CrawlCheckpointDB(Base):
+    """Progress of a catalog crawl through one store's seed pages."""
+
+    __tablename__ = "crawl_checkpoints"
+
+    id = Column(Integer, primary_key=True)
+    supermarket = Column(String, nullable=False, index=True)
+    seeds = Column(JSON, default=list)
+    position = Column(Integer, default=0)
+    status = Column(String, default="running")
+    stats = Column(JSON, default=dict)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class ScrapeJobDB(Base):
+    """Scrape job queued for worker processes."""
+
+    __tablename__ = "scrape_jobs"
+
+    id = Column(Integer, primary_key=True)
+    supermarket = Column(String, nullable=False)
+    kind = Column(String, nullable=False, default="query")
+    target = Column(String, nullable=False)
+    priority = Column(Integer, default=0)
+    status = Column(String, nullable=False, default="pending")
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=3)
+    available_at = Column(DateTime, default=datetime.utcnow)
+    lease_owner = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    last_error = Column(String, nullable=True)
+    result_count = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_scrape_jobs_status_available", "status", "available_at"),
+        Index("ix_scrape_jobs_target", "supermarket", "kind", "target"),
+    )
@@ -1,20 +1,73 @@
 """Main FastAPI application."""
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 
 from src.api.routes import router
+from src.config.settings import get_settings
 from src.database import get_db
+from src.scrapers.browser_pool import close_browser_pool, get_browser_pool
+from src.scrapers.http_client import close_http_client
+from src.scrapers.parse_pool import close_parse_pool
+from src.scrapers.timing import log_timing_summary
+from src.services.refresh_scheduler import get_refresh_scheduler
 
 # Configure logging
 logger.add("logs/app.log", rotation="1 MB", retention="7 days")
 
+
+async def log_timings_periodically(interval: float) -> None:
+    """Log the scrape timing summary every `interval` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        log_timing_summary()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize shared resources on startup and release them on shutdown."""
+    logger.info("Starting application...")
+    get_db()
+    logger.info("Database initialized")
+
+    # Pay the browser cold-launch cost once, up front
+    try:
+        await get_browser_pool().start()
+    except Exception as e:
+        logger.error(f"Could not start browser pool: {e}")
+
+    # Keep popular searches warm in this process's cache
+    if get_settings().scheduler_enabled:
+        get_refresh_scheduler().start()
+
+    timing_logger = None
+    if get_settings().timing_summary_interval > 0:
+        timing_logger = asyncio.create_task(
+            log_timings_periodically(get_settings().timing_summary_interval)
+        )
+
+    yield
+
+    if timing_logger is not None:
+        timing_logger.cancel()
+    log_timing_summary()
+    if get_settings().scheduler_enabled:
+        get_refresh_scheduler().shutdown()
+    await close_browser_pool()
+    await close_http_client()
+    close_parse_pool()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Supermarket Price Compare API",
     description="Compare grocery prices across Dutch supermarkets",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -30,14 +83,6 @@ app.add_middleware(
 app.include_router(router)
 
 
-@app.on_event("startup")
-async def startup():
-    """Initialize database on startup."""
-    logger.info("Starting application...")
-    db = get_db()
-    logger.info("Database initialized")
-
-
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -1,28 +1,19 @@
 """Scraper module for supermarket price scraping."""
 
+from functools import partial
+
+from src.config.constants import SUPERMARKETS
 from src.scrapers.base_scraper import BaseScraper
-from src.scrapers.albert_heijn import AlbertHeijnScraper
-from src.scrapers.jumbo import JumboScraper
-from src.scrapers.dirk import DirkScraper
-from src.scrapers.plus import PlusScraper
-from src.scrapers.flink import FlinkScraper
-from src.scrapers.picnic import PicnicScraper
+from src.scrapers.configured import ConfiguredScraper
+from src.scrapers.extraction import ExtractionPlan, get_extraction_plan
 
 __all__ = [
     "BaseScraper",
-    "AlbertHeijnScraper",
-    "JumboScraper",
-    "DirkScraper",
-    "PlusScraper",
-    "FlinkScraper",
-    "PicnicScraper",
+    "ConfiguredScraper",
+    "ExtractionPlan",
+    "get_extraction_plan",
+    "SCRAPERS",
 ]
 
-SCRAPERS = {
-    "albert_heijn": AlbertHeijnScraper,
-    "jumbo": JumboScraper,
-    "dirk": DirkScraper,
-    "plus": PlusScraper,
-    "flink": FlinkScraper,
-    "picnic": PicnicScraper,
-}
+# Scraper factories for every configured supermarket
+SCRAPERS = {name: partial(ConfiguredScraper, name) for name in SUPERMARKETS}
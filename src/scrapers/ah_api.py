@@ -1,94 +1,331 @@
-"""Albert Heijn scraper using official mobile API via SupermarktConnector."""
+"""Albert Heijn scraper using the official mobile API."""
 
+import asyncio
+import json
+import re
+import time
+import weakref
+from collections.abc import AsyncIterator, Iterable
+from urllib.parse import urlencode
+
+import httpx
 from loguru import logger
-from supermarktconnector.ah import AHConnector
 
+from src.config.settings import get_settings
 from src.models.product import ProductSearch
+from src.scrapers.fixtures import FixtureStore, RecordedResponse
+from src.scrapers.http_client import get_http_client
+from src.scrapers.pagination import (
+    ListingPage,
+    PageCallback,
+    ResultCollector,
+    collect_pages,
+    pages_needed,
+)
+from src.scrapers.timing import STAGE_BUILD, STAGE_HTTP_FETCH, scrape_trace, span
+
+AH_API_URL = "https://api.ah.nl"
+AH_SEARCH_PATH = "/mobile-services/product/search/v2"
+AH_HEADERS = {
+    "x-application": "AHWEBSHOP",
+    "user-agent": "Appie/8.8.2 Model/phone Android/7.0-API24",
+    "content-type": "application/json; charset=UTF-8",
+}
+
+# Webshop id in product URLs like /producten/product/wi123456/naam
+PRODUCT_URL_RE = re.compile(r"/product/(?:wi)?(\d+)")
+
+# Largest page of search results requested at once
+AH_PAGE_SIZE = 36
+
+# Refresh the token this many seconds before it actually expires
+TOKEN_EXPIRY_MARGIN = 60
+
+# Anonymous access token shared by all instances until it expires
+_token: str | None = None
+_token_expires_at: float = 0.0
+_token_locks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _get_token_lock() -> asyncio.Lock:
+    """Get the token refresh lock for the running event loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _token_locks:
+        _token_locks[loop] = asyncio.Lock()
+    return _token_locks[loop]
 
 
 class AlbertHeijnAPIScraper:
-    """Scraper for Albert Heijn using their mobile API."""
+    """Async scraper for Albert Heijn using their mobile API.
+
+    Requests go through the shared keep-alive (HTTP/2 when available) HTTP
+    client, so concurrent searches reuse connections and one cached token.
+    """
 
-    def __init__(self):
+    def __init__(self, client: httpx.AsyncClient | None = None):
         """Initialize AH API scraper."""
-        self.connector = AHConnector()
         self.supermarket_name = "albert_heijn"
+        self._client = client
+        self.fixture_mode = get_settings().scrape_fixture_mode
+        self.fixture_store = FixtureStore()
+        self._replay_clients: dict[str | None, httpx.AsyncClient] = {}
 
-    def search_product(self, query: str, limit: int = 10) -> list[ProductSearch]:
-        """Search for products using AH mobile API."""
-        results: list[ProductSearch] = []
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Get the HTTP client used for API requests."""
+        return self._client or get_http_client(http2=True)
 
-        try:
-            response = self.connector.search_products(query=query, size=limit, page=0)
+    def _client_for(self, fixture_query: str | None) -> httpx.AsyncClient:
+        """Get the client for a request, answering from fixtures in replay mode."""
+        if self._client is not None or self.fixture_mode != "replay":
+            return self.client
+        if fixture_query not in self._replay_clients:
+            replayer = self.fixture_store.replayer(self.supermarket_name, fixture_query)
+            self._replay_clients[fixture_query] = replayer.client()
+        return self._replay_clients[fixture_query]
 
-            if not response or "products" not in response:
-                logger.warning(f"AH API: No products found for '{query}'")
-                return results
+    async def _get_token(self) -> str:
+        """Get a cached anonymous access token, fetching a new one if expired."""
+        global _token, _token_expires_at
 
-            for product in response["products"]:
-                try:
-                    # Extract product data
-                    title = product.get("title", "Unknown")
-
-                    # Price handling - AH uses priceBeforeBonus for regular, currentPrice for bonus
-                    price_before = product.get("priceBeforeBonus")
-                    current_price = product.get("currentPrice", 0)
-
-                    if price_before:
-                        regular_price = price_before
-                        bonus_price = current_price
-                    else:
-                        regular_price = current_price
-                        bonus_price = None
-
-                    # Build product URL
-                    webshop_id = product.get("webshopId", "")
-                    url = f"https://www.ah.nl/producten/product/{webshop_id}" if webshop_id else ""
-
-                    # Get image
-                    images = product.get("images", [])
-                    image_url = images[0].get("url") if images else None
-
-                    # Extract unit info
-                    unit_size = product.get("unitSize", "")
-
-                    results.append(
-                        ProductSearch(
-                            name=title,
-                            brand=product.get("brand"),
-                            regular_price=regular_price,
-                            bonus_card_price=bonus_price,
-                            promotion_text=product.get("discountLabel"),
-                            url=url,
-                            image_url=image_url,
-                            unit="stuk",
-                            unit_size=1.0,
-                            supermarket=self.supermarket_name,
-                        )
+        if self.fixture_mode == "replay":
+            # Recorded responses do not depend on the token
+            return "fixture"
+
+        async with _get_token_lock():
+            if _token and time.monotonic() < _token_expires_at:
+                return _token
+
+            response = await self.client.post(
+                f"{AH_API_URL}/mobile-auth/v1/auth/token/anonymous",
+                headers=AH_HEADERS,
+                json={"clientId": "appie"},
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            _token = data["access_token"]
+            _token_expires_at = (
+                time.monotonic() + data.get("expires_in", 3600) - TOKEN_EXPIRY_MARGIN
+            )
+            logger.debug("AH API: fetched anonymous access token")
+            return _token
+
+    def _invalidate_token(self) -> None:
+        """Forget the cached token so the next request fetches a new one."""
+        global _token
+        _token = None
+
+    async def _get(
+        self, path: str, params: dict | None = None, fixture_query: str | None = None
+    ) -> dict:
+        """Make an authenticated GET request, refreshing the token once on 401.
+
+        In fixture record mode the response is saved under `fixture_query`;
+        in replay mode it is served from that query's fixture.
+        """
+        for attempt in range(2):
+            token = await self._get_token()
+            response = await self._client_for(fixture_query).get(
+                f"{AH_API_URL}{path}",
+                params=params,
+                headers={**AH_HEADERS, "Authorization": f"Bearer {token}"},
+            )
+            if response.status_code == 401 and attempt == 0:
+                self._invalidate_token()
+                continue
+            if self.fixture_mode == "record" and fixture_query is not None:
+                recorded = RecordedResponse.from_httpx(response)
+                self.fixture_store.save(
+                    self.supermarket_name, fixture_query, [recorded]
+                )
+            response.raise_for_status()
+            return response.json()
+        return {}
+
+    async def search_product(
+        self,
+        query: str,
+        limit: int | None = None,
+        on_page: PageCallback | None = None,
+    ) -> list[ProductSearch]:
+        """Search for products using AH mobile API.
+
+        Returns up to `limit` results (scrape_result_target by default).
+        Once the first page shows how many results there are, the pages
+        needed to reach the limit are requested concurrently and their new
+        results passed to `on_page` as they arrive.
+        """
+        settings = get_settings()
+        target = limit or settings.scrape_result_target
+        size = min(target, AH_PAGE_SIZE)
+        collector = ResultCollector(target, on_page)
+
+        with scrape_trace(self.supermarket_name, query):
+            try:
+                response = await self._search_page(query, 0, size)
+
+                if not response or "products" not in response:
+                    logger.warning(f"AH API: No products found for '{query}'")
+                    return collector.results
+
+                collector.add(self._parse_products(response["products"]))
+                count = pages_needed(
+                    target,
+                    size,
+                    len(response["products"]),
+                    response.get("page", {}).get("totalElements"),
+                    settings.scrape_max_pages,
+                )
+                if count > 1 and not collector.full:
+                    await collect_pages(
+                        [
+                            self._search_page_products(query, n, size)
+                            for n in range(1, count)
+                        ],
+                        collector,
+                        self.supermarket_name,
                     )
 
+                logger.info(
+                    f"AH API: Found {len(collector.results)} products for '{query}'"
+                )
+
+            except Exception as e:
+                logger.error(f"AH API error: {e}")
+
+        return collector.results
+
+    async def fetch_listing_page(
+        self, query: str, index: int = 0, limit: int | None = None
+    ) -> ListingPage | None:
+        """Fetch the search result page at a 0-based index, unparsed.
+
+        The API response, serialized with sorted keys, is the payload.
+        Returns None when the API sends no products.
+        """
+        size = min(limit or AH_PAGE_SIZE, AH_PAGE_SIZE)
+        response = await self._search_page(query, index, size)
+        if not response or "products" not in response:
+            return None
+        url = f"{AH_API_URL}{AH_SEARCH_PATH}?" + urlencode(
+            self._search_params(query, index, size)
+        )
+        return ListingPage(
+            index, url, json.dumps(response, sort_keys=True), "json", size, size
+        )
+
+    async def parse_listing_page(
+        self, page: ListingPage
+    ) -> tuple[list[ProductSearch], int | None]:
+        """Parse a fetched result page into results and the result total."""
+        data = json.loads(page.payload)
+        products = self._parse_products(data["products"][: page.limit])
+        return products, data.get("page", {}).get("totalElements")
+
+    async def _search_page(self, query: str, page: int, size: int) -> dict:
+        """Request one page of search results."""
+        with span(self.supermarket_name, STAGE_HTTP_FETCH):
+            return await self._get(
+                AH_SEARCH_PATH,
+                params=self._search_params(query, page, size),
+                fixture_query=query,
+            )
+
+    def _search_params(self, query: str, page: int, size: int) -> dict:
+        """Get the query parameters of a search page request."""
+        return {"sortOn": "RELEVANCE", "page": page, "size": size, "query": query}
+
+    async def _search_page_products(
+        self, query: str, page: int, size: int
+    ) -> list[ProductSearch]:
+        """Request a later page of search results and parse its products."""
+        response = await self._search_page(query, page, size)
+        return self._parse_products(response.get("products", []))
+
+    def _parse_products(self, products: list[dict]) -> list[ProductSearch]:
+        """Convert API products to search results, skipping malformed ones."""
+        results: list[ProductSearch] = []
+        with span(self.supermarket_name, STAGE_BUILD):
+            for product in products:
+                try:
+                    results.append(self._parse_product(product))
                 except Exception as e:
                     logger.debug(f"Error parsing AH product: {e}")
-                    continue
+        return results
 
-            logger.info(f"AH API: Found {len(results)} products for '{query}'")
+    def _parse_product(self, product: dict) -> ProductSearch:
+        """Convert an API product to a search result."""
+        # Price handling - AH uses priceBeforeBonus for regular, currentPrice for bonus
+        price_before = product.get("priceBeforeBonus")
+        current_price = product.get("currentPrice", 0)
 
-        except Exception as e:
-            logger.error(f"AH API error: {e}")
+        if price_before:
+            regular_price = price_before
+            bonus_price = current_price
+        else:
+            regular_price = current_price
+            bonus_price = None
 
-        return results
+        # Build product URL
+        webshop_id = product.get("webshopId", "")
+        url = f"https://www.ah.nl/producten/product/{webshop_id}" if webshop_id else ""
+
+        # Get image
+        images = product.get("images", [])
+        image_url = images[0].get("url") if images else None
+
+        return ProductSearch(
+            name=product.get("title", "Unknown"),
+            brand=product.get("brand"),
+            regular_price=regular_price,
+            bonus_card_price=bonus_price,
+            promotion_text=product.get("discountLabel"),
+            url=url,
+            image_url=image_url,
+            unit="stuk",
+            unit_size=1.0,
+            supermarket=self.supermarket_name,
+        )
+
+    async def get_product_details(self, product_id: str) -> ProductSearch | None:
+        """Get detailed product information by webshop id or product URL."""
+        match = PRODUCT_URL_RE.search(product_id)
+        if match:
+            product_id = match.group(1)
 
-    def get_product_details(self, product_id: str) -> ProductSearch | None:
-        """Get detailed product information."""
         try:
-            product = self.connector.get_product_details(product_id)
+            product = await self._get(
+                f"/mobile-services/product/detail/v4/fir/{product_id}"
+            )
             if product:
+                card = product.get("productCard", product)
                 return ProductSearch(
-                    name=product.get("title", "Unknown"),
-                    regular_price=product.get("currentPrice", 0),
+                    name=card.get("title", "Unknown"),
+                    regular_price=card.get("currentPrice", 0),
                     url=f"https://www.ah.nl/producten/product/{product_id}",
                     supermarket=self.supermarket_name,
                 )
         except Exception as e:
             logger.error(f"Error getting AH product details: {e}")
         return None
+
+    async def get_product_details_many(
+        self, urls: Iterable[str], concurrency: int | None = None
+    ) -> AsyncIterator[tuple[str, ProductSearch | None]]:
+        """Get details for many products, yielding (url, product) as ready."""
+        semaphore = asyncio.Semaphore(
+            concurrency or get_settings().detail_concurrency
+        )
+
+        async def fetch(url: str) -> tuple[str, ProductSearch | None]:
+            async with semaphore:
+                return url, await self.get_product_details(url)
+
+        tasks = [asyncio.create_task(fetch(url)) for url in urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -1,18 +1,71 @@
 """Base scraper class for all supermarket scrapers."""
 
 import asyncio
+import json
 import random
-import re
+import time
 from abc import ABC, abstractmethod
-from typing import Any
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from contextlib import asynccontextmanager
+from urllib.parse import quote, urlparse
 
+import httpx
 from loguru import logger
-from playwright.async_api import async_playwright, Page, Browser
+from playwright.async_api import BrowserContext, Page
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from src.config.settings import get_settings
 from src.config.constants import USER_AGENTS, SUPERMARKETS
 from src.models.product import ProductSearch
+from src.scrapers.browser_pool import get_browser_pool
+from src.scrapers.consent import ConsentStateStore
+from src.scrapers.extraction import (
+    EXTRACT_CARDS_JS,
+    get_extraction_plan,
+)
+from src.scrapers.fixtures import (
+    FixtureRecorder,
+    FixtureReplayer,
+    FixtureStore,
+    RecordedResponse,
+)
+from src.scrapers.http_client import get_http_client
+from src.scrapers.pagination import (
+    ListingPage,
+    PageCallback,
+    ResultCollector,
+    collect_pages,
+    page_url,
+    pages_needed,
+    parse_total,
+)
+from src.scrapers.parse_pool import (
+    RECORD_FIELDS,
+    absolute_url,
+    get_parse_pool,
+    normalize_cards,
+    normalize_text,
+)
+from src.scrapers.parsing import parse_price, parse_unit
+from src.scrapers.rate_limiter import get_rate_limiter
+from src.scrapers.resource_blocking import ResourceBlocker
+from src.scrapers.tier_metrics import BROWSER_TIER, HTTP_TIER, record_tier
+from src.scrapers.timing import (
+    STAGE_ACCEPT_COOKIES,
+    STAGE_BROWSER_LEASE,
+    STAGE_BUILD,
+    STAGE_EXTRACT,
+    STAGE_HTTP_FETCH,
+    STAGE_NAVIGATE,
+    STAGE_PARSE,
+    STAGE_READY,
+    STAGE_THROTTLE,
+    record_span,
+    span,
+)
+
+# Responses that mean the plain HTTP tier is being refused
+BLOCKED_STATUS_CODES = {401, 403, 429, 503}
 
 
 class BaseScraper(ABC):
@@ -22,8 +75,17 @@ class BaseScraper(ABC):
         """Initialize the scraper."""
         self.supermarket_name = supermarket_name
         self.config = SUPERMARKETS[supermarket_name]
+        self.plan = get_extraction_plan(supermarket_name)
         self.settings = get_settings()
-        self.rate_limit_delay = self.settings.scrape_rate_limit
+        self.consent_store = ConsentStateStore()
+        self.resource_blocker = ResourceBlocker(
+            supermarket_name,
+            self.settings.scrape_blocked_resource_types,
+            self.config.get("blocked_domains", []),
+        )
+        self.fixture_mode = self.settings.scrape_fixture_mode
+        self.fixture_store = FixtureStore()
+        self._replayers: dict[str | None, FixtureReplayer] = {}
 
     @abstractmethod
     async def search_product(self, query: str) -> list[ProductSearch]:
@@ -31,14 +93,140 @@ class BaseScraper(ABC):
         pass
 
     @abstractmethod
+    async def _read_product_details(self, page: Page, url: str) -> ProductSearch:
+        """Read product details from a product page, raising on failure."""
+        pass
+
     async def get_product_details(self, url: str) -> ProductSearch | None:
         """Get detailed product information from product page."""
-        pass
+        try:
+            async with self._create_page() as page:
+                return await self._read_product_details(page, url)
+        except Exception as e:
+            logger.error(f"Error getting product details: {e}")
+            return None
+
+    async def fetch_listing_page(
+        self, query: str, index: int = 0, limit: int | None = None
+    ) -> ListingPage | None:
+        """Fetch the result page of a search at a 0-based index, unparsed.
+
+        Goes over HTTP when the store has a fast path, otherwise (or when
+        that fails) through a browser page, whose extracted cards become
+        the payload. Returns None past the store's addressable pages or
+        when the listing does not load. `limit` defaults to the page size.
+        """
+        pagination = self.config.get("pagination", {})
+        page_size = pagination.get("page_size")
+        if index > 0 and not page_size:
+            return None
+        limit = limit or page_size or self.settings.scrape_result_target
+
+        page = await self._fetch_listing_http(query, index, limit)
+        if page is None:
+            page = await self._fetch_listing_browser(query, index, limit)
+        return page
+
+    async def parse_listing_page(
+        self, page: ListingPage
+    ) -> tuple[list[ProductSearch], int | None]:
+        """Parse a fetched result page into results and, if first, the total."""
+        if page.fmt == "cards":
+            with span(self.supermarket_name, STAGE_BUILD):
+                return self._build_products(json.loads(page.payload)), None
+
+        with span(self.supermarket_name, STAGE_PARSE):
+            records, total = await get_parse_pool().parse_page(
+                self.supermarket_name,
+                page.payload,
+                page.fmt,
+                page.limit,
+                first=page.index == 0,
+            )
+        with span(self.supermarket_name, STAGE_BUILD):
+            return self._products_from_records(records), total
+
+    async def get_product_details_many(
+        self, urls: Iterable[str], concurrency: int | None = None
+    ) -> AsyncIterator[tuple[str, ProductSearch | None]]:
+        """Get details for many product pages, yielding (url, product) as ready.
+
+        Up to `concurrency` workers (detail_concurrency by default) each
+        lease one browser context from the shared pool and reuse its page
+        for URL after URL, subject to the per-host rate limit. A URL that
+        fails yields None without affecting the rest of the batch.
+        """
+        pending: asyncio.Queue[str] = asyncio.Queue()
+        for url in urls:
+            pending.put_nowait(url)
+        finished: asyncio.Queue[tuple[str, ProductSearch | None] | None] = (
+            asyncio.Queue()
+        )
+
+        async def read(page: Page, url: str) -> ProductSearch | None:
+            try:
+                return await self._read_product_details(page, url)
+            except Exception as e:
+                logger.warning(f"{self.supermarket_name}: no details for {url}: {e}")
+                return None
+
+        async def worker() -> None:
+            try:
+                while not pending.empty():
+                    async with self._create_page() as page:
+                        # A crashed page is replaced by a fresh context
+                        while not pending.empty() and not page.is_closed():
+                            url = pending.get_nowait()
+                            await finished.put((url, await read(page, url)))
+            except Exception as e:
+                logger.error(f"{self.supermarket_name} detail worker failed: {e}")
+            finally:
+                await finished.put(None)
+
+        limit = concurrency or self.settings.detail_concurrency
+        workers = [
+            asyncio.create_task(worker()) for _ in range(min(limit, pending.qsize()))
+        ]
+        running = len(workers)
+        try:
+            while running:
+                item = await finished.get()
+                if item is None:
+                    running -= 1
+                else:
+                    yield item
+
+            # Left over only if every worker failed to open a page
+            while not pending.empty():
+                yield pending.get_nowait(), None
+        finally:
+            for task in workers:
+                task.cancel()
+
+    async def _throttle(self, url: str) -> None:
+        """Wait for the per-host rate limiter before requesting a URL."""
+        if self.fixture_mode == "replay":
+            return
+        host = urlparse(url).hostname or self.supermarket_name
+        with span(self.supermarket_name, STAGE_THROTTLE):
+            waited = await get_rate_limiter(host).acquire()
+        if waited:
+            logger.debug(f"Rate limited {host} for {waited:.2f}s")
+
+    def _replayer_for(self, query: str | None) -> FixtureReplayer:
+        """Get the replayer serving the fixture recorded for a search query.
 
-    async def _random_delay(self) -> None:
-        """Add random delay to avoid rate limiting."""
-        delay = self.rate_limit_delay + random.uniform(0.5, 1.5)
-        await asyncio.sleep(delay)
+        Without a query (e.g. product pages) everything recorded for the
+        store is served.
+        """
+        if query not in self._replayers:
+            replayer = self.fixture_store.replayer(self.supermarket_name, query)
+            if not len(replayer):
+                logger.warning(
+                    f"No fixtures recorded for {self.supermarket_name} '{query}'"
+                )
+            self._replayers[query] = replayer
+        return self._replayers[query]
 
     def _get_random_user_agent(self) -> str:
         """Get a random user agent string."""
@@ -48,75 +236,473 @@ class BaseScraper(ABC):
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
     )
-    async def _fetch_page(self, page: Page, url: str) -> None:
+    async def _fetch_page(
+        self, page: Page, url: str, wait_until: str = "domcontentloaded"
+    ) -> None:
         """Fetch a page with retry logic."""
+        await self._throttle(url)
         logger.debug(f"Fetching {url}")
-        await page.goto(url, wait_until="networkidle", timeout=30000)
-        await self._random_delay()
+        with span(self.supermarket_name, STAGE_NAVIGATE):
+            await page.goto(
+                url, wait_until=wait_until, timeout=self.settings.scrape_timeout
+            )
+
+    async def _search_http(
+        self,
+        query: str,
+        target: int | None = None,
+        on_page: PageCallback | None = None,
+    ) -> list[ProductSearch] | None:
+        """Search over plain HTTP without a browser.
+
+        Fetches the store's search JSON or server-rendered HTML with the
+        shared HTTP client. Returns None when the browser tier is needed:
+        no fast path configured, request failed or blocked, or no cards.
+        Further result pages up to `target` (scrape_result_target by
+        default) are fetched concurrently once the first page is in.
+        """
+        fast_path = self.config.get("fast_path")
+        if not fast_path or not self.settings.scrape_http_fast_path:
+            return None
+
+        target = target or self.settings.scrape_result_target
+        fmt = fast_path.get("format", "html")
+        url_template = fast_path.get("url", self.config["search_url"])
+        url = url_template.format(query=quote(query))
+
+        client = self._http_client(query)
+        response = await self._fetch_http(client, query, url)
+        if response is None:
+            return None
+
+        # Parsing a full listing is CPU-bound, so large pages go to the pool
+        try:
+            with span(self.supermarket_name, STAGE_PARSE):
+                records, total = await get_parse_pool().parse_page(
+                    self.supermarket_name, response.text, fmt, target, first=True
+                )
+        except Exception as e:
+            logger.debug(f"{self.supermarket_name} HTTP tier parse error: {e}")
+            record_tier(self.supermarket_name, "http_fallback:parse")
+            return None
+
+        with span(self.supermarket_name, STAGE_BUILD):
+            results = self._products_from_records(records)
+        if not results:
+            # Usually a client-rendered shell without product markup
+            record_tier(self.supermarket_name, "http_fallback:empty")
+            return None
+
+        record_tier(self.supermarket_name, HTTP_TIER)
+        collector = ResultCollector(target, on_page)
+        collector.add(results)
+
+        pagination = self.config.get("pagination", {})
+        template = pagination.get("fast_path_url" if fmt == "json" else "url")
+        if template:
+            await self._collect_pages(
+                template,
+                query,
+                len(records),
+                total,
+                collector,
+                lambda page_url: self._http_page(client, query, page_url, fmt, target),
+            )
+        return collector.results
+
+    def _http_client(self, query: str | None) -> httpx.AsyncClient:
+        """Get the HTTP client for a search, serving fixtures in replay mode."""
+        if self.fixture_mode == "replay":
+            return self._replayer_for(query).client()
+        return get_http_client()
+
+    async def _fetch_http(
+        self, client: httpx.AsyncClient, query: str, url: str
+    ) -> httpx.Response | None:
+        """GET a result page over HTTP, saving it in fixture record mode.
+
+        Returns None, counting the fall back from the HTTP tier, when the
+        request fails, is blocked or does not succeed.
+        """
+        try:
+            response = await self._http_get(client, url)
+        except httpx.HTTPError as e:
+            logger.debug(f"{self.supermarket_name} HTTP tier failed: {e}")
+            record_tier(self.supermarket_name, "http_fallback:error")
+            return None
+
+        if self.fixture_mode == "record":
+            self.fixture_store.save(
+                self.supermarket_name, query, [RecordedResponse.from_httpx(response)]
+            )
+
+        if response.status_code in BLOCKED_STATUS_CODES:
+            logger.info(
+                f"{self.supermarket_name} HTTP tier blocked "
+                f"({response.status_code}), using browser"
+            )
+            record_tier(self.supermarket_name, "http_fallback:blocked")
+            return None
+        if response.status_code != 200:
+            record_tier(self.supermarket_name, "http_fallback:error")
+            return None
+        return response
+
+    async def _http_get(self, client: httpx.AsyncClient, url: str) -> httpx.Response:
+        """GET a URL with the shared client, subject to the rate limit."""
+        await self._throttle(url)
+        with span(self.supermarket_name, STAGE_HTTP_FETCH):
+            return await client.get(
+                url, headers={"User-Agent": self._get_random_user_agent()}
+            )
+
+    async def _http_page(
+        self, client: httpx.AsyncClient, query: str, url: str, fmt: str, limit: int
+    ) -> list[ProductSearch]:
+        """Fetch and parse a later result page over HTTP."""
+        response = await self._http_get(client, url)
+        if self.fixture_mode == "record":
+            self.fixture_store.save(
+                self.supermarket_name, query, [RecordedResponse.from_httpx(response)]
+            )
+        response.raise_for_status()
+        with span(self.supermarket_name, STAGE_PARSE):
+            records, _ = await get_parse_pool().parse_page(
+                self.supermarket_name, response.text, fmt, limit
+            )
+        with span(self.supermarket_name, STAGE_BUILD):
+            return self._products_from_records(records)
+
+    def _listing_url(
+        self, query: str, index: int, first_template: str, page_template_key: str
+    ) -> str | None:
+        """Build the URL of a result page, or None if the store has no such page."""
+        if index == 0:
+            return first_template.format(query=quote(query))
+        pagination = self.config.get("pagination", {})
+        template = pagination.get(page_template_key)
+        if not template:
+            return None
+        return page_url(
+            template,
+            query,
+            index,
+            pagination["page_size"],
+            pagination.get("first_page", 0),
+        )
+
+    async def _fetch_listing_http(
+        self, query: str, index: int, limit: int
+    ) -> ListingPage | None:
+        """Fetch a result page's raw body over HTTP, or None if not possible."""
+        fast_path = self.config.get("fast_path")
+        if not fast_path or not self.settings.scrape_http_fast_path:
+            return None
+
+        fmt = fast_path.get("format", "html")
+        url = self._listing_url(
+            query,
+            index,
+            fast_path.get("url", self.config["search_url"]),
+            "fast_path_url" if fmt == "json" else "url",
+        )
+        if url is None:
+            return None
+
+        response = await self._fetch_http(self._http_client(query), query, url)
+        if response is None:
+            return None
+        record_tier(self.supermarket_name, HTTP_TIER)
+        return ListingPage(
+            index,
+            url,
+            response.text,
+            fmt,
+            self.config.get("pagination", {}).get("page_size"),
+            limit,
+        )
+
+    async def _fetch_listing_browser(
+        self, query: str, index: int, limit: int
+    ) -> ListingPage | None:
+        """Load a result page in the browser and serialize its product cards."""
+        url = self._listing_url(query, index, self.config["search_url"], "url")
+        if url is None:
+            return None
+
+        record_tier(self.supermarket_name, BROWSER_TIER)
+        async with self._create_page(query) as page:
+            if not await self._load_listing(page, url):
+                return None
+            cards = await self._extract_cards(page, limit)
+        return ListingPage(
+            index,
+            url,
+            json.dumps(cards, sort_keys=True),
+            "cards",
+            self.config.get("pagination", {}).get("page_size"),
+            limit,
+        )
+
+    async def _collect_pages(
+        self,
+        template: str,
+        query: str,
+        first_count: int,
+        total: int | None,
+        collector: ResultCollector,
+        fetch_page: Callable[[str], Awaitable[list[ProductSearch]]],
+    ) -> None:
+        """Fetch the result pages after the first concurrently into `collector`.
+
+        How many pages are needed follows from the target, the page size,
+        how full the first page was and the total it showed, capped at
+        scrape_max_pages.
+        """
+        pagination = self.config["pagination"]
+        page_size = pagination["page_size"]
+        count = pages_needed(
+            collector.target,
+            page_size,
+            first_count,
+            total,
+            self.settings.scrape_max_pages,
+        )
+        if count <= 1 or collector.full:
+            return
+
+        first_page = pagination.get("first_page", 0)
+        urls = [
+            page_url(template, query, index, page_size, first_page)
+            for index in range(1, count)
+        ]
+        logger.debug(
+            f"{self.supermarket_name}: fetching {len(urls)} more pages for '{query}'"
+        )
+        await collect_pages(
+            [fetch_page(url) for url in urls], collector, self.supermarket_name
+        )
+
+    async def _load_listing(self, page: Page, url: str) -> bool:
+        """Open a search page and wait until its product data is present.
+
+        Uses the store's readiness strategy from SUPERMARKETS instead of
+        waiting for network idle. Returns False if no products appeared.
+        """
+        readiness = self.config.get("readiness", {})
+        strategy = readiness.get("strategy", "selector")
+        timeout = self.settings.scrape_ready_timeout
+
+        response_waiter = None
+        if strategy == "response":
+            pattern = readiness["response_url"]
+            # Listen before navigating so an early response is not missed
+            response_waiter = asyncio.ensure_future(
+                page.wait_for_event(
+                    "response",
+                    predicate=lambda r: pattern in r.url and r.ok,
+                    timeout=0,
+                )
+            )
+
+        try:
+            await self._fetch_page(page, url)
+        except Exception:
+            if response_waiter:
+                response_waiter.cancel()
+            raise
+
+        await self._accept_cookies(page)
+
+        card_selector = self.plan.card_selector
+        try:
+            with span(self.supermarket_name, STAGE_READY):
+                if response_waiter:
+                    # The data has arrived; rendering it takes only a moment
+                    await asyncio.wait_for(response_waiter, timeout / 1000)
+                    await page.wait_for_selector(card_selector, timeout=2000)
+                elif strategy == "stable_count":
+                    await self._wait_for_stable_count(
+                        page,
+                        card_selector,
+                        readiness.get("stable_interval_ms", 300),
+                        timeout,
+                    )
+                else:
+                    await page.wait_for_selector(card_selector, timeout=timeout)
+        except Exception as e:
+            logger.debug(f"{self.supermarket_name} not ready ({strategy}): {e}")
+            return False
+        return True
+
+    async def _read_total(self, page: Page) -> int | None:
+        """Read the number of search results shown on a listing page."""
+        selector = self.config.get("pagination", {}).get("total")
+        if not selector:
+            return None
+        try:
+            el = await page.query_selector(selector)
+            return parse_total(await el.inner_text()) if el else None
+        except Exception as e:
+            logger.debug(f"{self.supermarket_name}: no result count: {e}")
+            return None
+
+    async def _browser_page(
+        self, context: BrowserContext, url: str, limit: int
+    ) -> list[ProductSearch]:
+        """Load a later result page in a new tab of a leased context."""
+        page = await context.new_page()
+        try:
+            if not await self._load_listing(page, url):
+                return []
+            cards = await self._extract_cards(page, limit)
+            with span(self.supermarket_name, STAGE_BUILD):
+                return self._build_products(cards)
+        finally:
+            await page.close()
+
+    async def _wait_for_stable_count(
+        self, page: Page, selector: str, interval_ms: int, timeout_ms: int
+    ) -> None:
+        """Wait until the number of matching elements stops changing."""
+        deadline = time.monotonic() + timeout_ms / 1000
+        await page.wait_for_selector(selector, timeout=timeout_ms)
+
+        previous = -1
+        count = await page.locator(selector).count()
+        while count != previous and time.monotonic() < deadline:
+            previous = count
+            await asyncio.sleep(interval_ms / 1000)
+            count = await page.locator(selector).count()
 
     async def _accept_cookies(self, page: Page) -> None:
-        """Try to accept cookie consent."""
+        """Accept cookie consent if the banner is shown and store the state."""
         selector = self.config["selectors"].get("cookie_accept")
-        if selector:
+        if not selector:
+            return
+        with span(self.supermarket_name, STAGE_ACCEPT_COOKIES):
             try:
-                button = page.locator(selector)
-                if await button.count() > 0:
-                    await button.first.click()
-                    await asyncio.sleep(1)
-                    logger.debug(f"Accepted cookies for {self.supermarket_name}")
+                button = page.locator(selector).first
+                # No banner when the context was created from a stored state
+                if not await button.is_visible():
+                    return
+                await button.click()
+                await button.wait_for(state="hidden", timeout=2000)
+                if self.fixture_mode != "replay":
+                    await self.consent_store.save(self.supermarket_name, page.context)
+                logger.debug(f"Accepted cookies for {self.supermarket_name}")
             except Exception as e:
                 logger.debug(f"Could not accept cookies: {e}")
 
-    async def _create_browser(self) -> tuple[Any, Browser]:
-        """Create a new browser instance."""
-        playwright = await async_playwright().start()
-        browser = await playwright.chromium.launch(
-            headless=True,
-            args=["--disable-blink-features=AutomationControlled"],
-        )
-        return playwright, browser
-
-    async def _create_page(self, browser: Browser) -> Page:
-        """Create a new page with stealth settings."""
-        context = await browser.new_context(
-            user_agent=self._get_random_user_agent(),
-            viewport={"width": 1920, "height": 1080},
-            locale="nl-NL",
+    @asynccontextmanager
+    async def _create_page(self, query: str | None = None) -> AsyncIterator[Page]:
+        """Lease a context from the shared browser pool and open a page.
+
+        In fixture record mode the responses of a search (given its
+        `query`), in every tab of the context, are saved; in replay mode
+        they are served from that query's fixture.
+        """
+        options = {
+            "user_agent": self._get_random_user_agent(),
+            "viewport": {"width": 1920, "height": 1080},
+            "locale": "nl-NL",
+        }
+        replay = self.fixture_mode == "replay"
+        consent_state = self.consent_store.get(self.supermarket_name)
+        if consent_state and not replay:
+            options["storage_state"] = str(consent_state)
+
+        start = time.perf_counter()
+        async with get_browser_pool().lease(**options) as context:
+            if replay:
+                await self._replayer_for(query).install(context)
+            elif self.settings.scrape_block_resources:
+                await self.resource_blocker.install(context)
+
+            recorder = None
+            if self.fixture_mode == "record" and query is not None:
+                recorder = FixtureRecorder(
+                    self.fixture_store, self.supermarket_name, query
+                )
+                # Later result pages open in other tabs of this context
+                recorder.attach(context)
+            page = await context.new_page()
+
+            record_span(
+                self.supermarket_name, STAGE_BROWSER_LEASE, time.perf_counter() - start
+            )
+            yield page
+
+            if recorder:
+                await recorder.save()
+
+    async def _extract_cards(self, page: Page, limit: int = 10) -> list[dict]:
+        """Extract raw product card fields using the configured mode."""
+        with span(self.supermarket_name, STAGE_EXTRACT):
+            if self.settings.scrape_extraction_mode == "elements":
+                return await self._extract_cards_elements(page, limit)
+            return await self._extract_cards_evaluate(page, limit)
+
+    async def _extract_cards_evaluate(self, page: Page, limit: int = 10) -> list[dict]:
+        """Extract all product cards with a single in-page evaluation."""
+        return await page.evaluate(
+            EXTRACT_CARDS_JS, [self.plan.card_selector, self.plan.spec, limit]
         )
-        page = await context.new_page()
-        return page
+
+    async def _extract_cards_elements(self, page: Page, limit: int = 10) -> list[dict]:
+        """Extract product cards field by field through element handles."""
+        cards = await page.query_selector_all(self.plan.card_selector)
+
+        async def read(card, rule) -> str | None:
+            el = await card.query_selector(rule.selector)
+            if not el:
+                return None
+            if rule.attribute:
+                return await el.get_attribute(rule.attribute)
+            return await el.inner_text()
+
+        raw_cards = []
+        for card in cards[:limit]:
+            try:
+                raw_cards.append(
+                    {rule.name: await read(card, rule) for rule in self.plan.fields}
+                )
+            except Exception as e:
+                logger.debug(f"Error extracting product: {e}")
+        return raw_cards
+
+    def _build_products(self, cards: list[dict]) -> list[ProductSearch]:
+        """Parse raw card fields into search results with the plan's rules."""
+        records = normalize_cards(self.plan, cards, self.config["base_url"])
+        return self._products_from_records(records)
+
+    def _products_from_records(self, records: list[tuple]) -> list[ProductSearch]:
+        """Turn parsed records into validated search results."""
+        results: list[ProductSearch] = []
+        for record in records:
+            try:
+                results.append(
+                    ProductSearch(
+                        **dict(zip(RECORD_FIELDS, record)),
+                        supermarket=self.supermarket_name,
+                    )
+                )
+            except Exception as e:
+                logger.debug(f"Error parsing product: {e}")
+        return results
+
+    def _parse_text(self, text: str | None) -> str | None:
+        """Normalize whitespace in a text field."""
+        return normalize_text(text)
+
+    def _absolute_url(self, href: str | None) -> str:
+        """Make a product link absolute."""
+        return absolute_url(self.config["base_url"], href)
 
     def _parse_price(self, price_text: str | None) -> float | None:
         """Parse price text to float."""
-        if not price_text:
-            return None
-        # Remove currency symbols and whitespace
-        cleaned = re.sub(r"[€\s]", "", price_text)
-        # Replace comma with dot for decimal
-        cleaned = cleaned.replace(",", ".")
-        # Extract numeric value
-        match = re.search(r"(\d+\.?\d*)", cleaned)
-        if match:
-            return float(match.group(1))
-        return None
+        return parse_price(price_text)
 
     def _extract_unit_info(self, text: str) -> tuple[str, float]:
         """Extract unit type and size from product text."""
-        text_lower = text.lower()
-
-        # Common patterns
-        patterns = [
-            (r"(\d+(?:[.,]\d+)?)\s*(?:l|liter)", "liter"),
-            (r"(\d+(?:[.,]\d+)?)\s*(?:ml)", "ml"),
-            (r"(\d+(?:[.,]\d+)?)\s*(?:kg)", "kg"),
-            (r"(\d+(?:[.,]\d+)?)\s*(?:g|gram)", "gram"),
-            (r"(\d+)\s*(?:st|stuks?)", "stuk"),
-        ]
-
-        for pattern, unit in patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                size = float(match.group(1).replace(",", "."))
-                return unit, size
-
-        return "stuk", 1.0
+        return parse_unit(text)
@@ -0,0 +1,275 @@
+"""Shared Chromium browser pool for scrapers."""
+
+import asyncio
+from collections.abc import AsyncIterator, Coroutine
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from loguru import logger
+from playwright.async_api import Browser, BrowserContext, async_playwright
+
+from src.config.settings import get_settings
+from src.scrapers.http_client import close_http_client
+
+LAUNCH_ARGS = ["--disable-blink-features=AutomationControlled"]
+
+T = TypeVar("T")
+
+
+@dataclass
+class PooledBrowser:
+    """A browser in the pool with its usage counters."""
+
+    browser: Browser
+    pages_served: int = 0
+    active_leases: int = 0
+    retiring: bool = False
+
+
+class BrowserPool:
+    """Pool of long-lived Chromium browsers that scrapers lease contexts from.
+
+    Browsers are launched once and reused. Each lease gets a fresh, isolated
+    browser context; a browser is recycled after serving
+    ``max_pages_per_browser`` leases, once its last lease is released.
+    Replacements for recycled or crashed browsers launch in the background,
+    so leases never wait behind a browser launch while one is connected.
+    """
+
+    def __init__(
+        self,
+        size: int | None = None,
+        max_pages_per_browser: int | None = None,
+    ):
+        """Initialize the pool without launching anything."""
+        settings = get_settings()
+        self.size = size or settings.browser_pool_size
+        self.max_pages_per_browser = (
+            max_pages_per_browser or settings.browser_max_pages
+        )
+        self._playwright: Any = None
+        self._browsers: list[PooledBrowser] = []
+        self._retiring: list[PooledBrowser] = []
+        self._swaps: set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+        self.loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def started(self) -> bool:
+        """Whether the playwright driver and browsers are running."""
+        return self._playwright is not None
+
+    async def start(self) -> None:
+        """Start the playwright driver and launch all browsers."""
+        async with self._lock:
+            if self.started:
+                return
+            self.loop = asyncio.get_running_loop()
+            self._playwright = await async_playwright().start()
+            try:
+                self._browsers = list(
+                    await asyncio.gather(*(self._launch() for _ in range(self.size)))
+                )
+            except Exception:
+                await self._playwright.stop()
+                self._playwright = None
+                raise
+            logger.info(f"Browser pool started with {self.size} browsers")
+
+    async def close(self) -> None:
+        """Close all browsers and stop the playwright driver."""
+        # Relaunches take the lock to swap in their browser, so stop them first
+        for task in self._swaps:
+            task.cancel()
+        await asyncio.gather(*self._swaps, return_exceptions=True)
+
+        async with self._lock:
+            for pooled in self._browsers + self._retiring:
+                try:
+                    await pooled.browser.close()
+                except Exception as e:
+                    logger.debug(f"Error closing pooled browser: {e}")
+            self._browsers = []
+            self._retiring = []
+            if self._playwright:
+                await self._playwright.stop()
+                self._playwright = None
+            logger.info("Browser pool closed")
+
+    @asynccontextmanager
+    async def lease(self, **context_options: Any) -> AsyncIterator[BrowserContext]:
+        """Lease a new browser context; it is closed when the lease ends."""
+        if not self.started:
+            await self.start()
+
+        pooled = await self._acquire()
+        try:
+            context = await pooled.browser.new_context(**context_options)
+            try:
+                yield context
+            finally:
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.debug(f"Error closing browser context: {e}")
+        finally:
+            await self._release(pooled)
+
+    def stats(self) -> dict[str, Any]:
+        """Get pool usage statistics."""
+        return {
+            "size": self.size,
+            "started": self.started,
+            "active_leases": sum(
+                b.active_leases for b in self._browsers + self._retiring
+            ),
+            "pages_served": [b.pages_served for b in self._browsers],
+            "retiring": len(self._retiring),
+            "relaunching": len(self._swaps),
+        }
+
+    async def _launch(self) -> PooledBrowser:
+        """Launch a new Chromium browser."""
+        browser = await self._playwright.chromium.launch(
+            headless=True,
+            args=LAUNCH_ARGS,
+        )
+        return PooledBrowser(browser=browser)
+
+    async def _acquire(self) -> PooledBrowser:
+        """Lease the least busy connected browser.
+
+        Only waits for a relaunch when no browser in the pool is connected.
+        """
+        for _ in range(2):
+            async with self._lock:
+                pooled = self._pick()
+                if pooled is not None:
+                    return pooled
+                pending = set(self._swaps)
+            if pending:
+                await asyncio.wait(pending)
+        raise RuntimeError("No connected browser in the pool")
+
+    def _pick(self) -> PooledBrowser | None:
+        """Take a lease on a connected browser, replacing worn-out ones.
+
+        Must be called with the lock held.
+        """
+        connected = []
+        for pooled in self._browsers:
+            if pooled.browser.is_connected():
+                connected.append(pooled)
+            elif not pooled.retiring:
+                logger.warning("Pooled browser disconnected, relaunching")
+                self._replace(pooled)
+        if not connected:
+            return None
+
+        # Browsers about to be swapped out only serve when nothing else can
+        pooled = min(connected, key=lambda b: (b.retiring, b.active_leases))
+        pooled.active_leases += 1
+        pooled.pages_served += 1
+
+        if pooled.pages_served >= self.max_pages_per_browser and not pooled.retiring:
+            logger.debug(f"Recycling browser after {pooled.pages_served} pages")
+            self._replace(pooled)
+        return pooled
+
+    def _replace(self, pooled: PooledBrowser) -> None:
+        """Start launching a replacement for a browser in the background."""
+        pooled.retiring = True
+        task = asyncio.create_task(self._swap(pooled))
+        self._swaps.add(task)
+        task.add_done_callback(self._swaps.discard)
+
+    async def _swap(self, old: PooledBrowser) -> None:
+        """Launch a browser and swap it in for `old`, outside the lock."""
+        try:
+            new = await self._launch()
+        except Exception as e:
+            logger.error(f"Relaunching pooled browser failed: {e}")
+            # Let the next lease try again
+            old.retiring = False
+            return
+
+        async with self._lock:
+            replaced = self.started and old in self._browsers
+            if replaced:
+                self._browsers[self._browsers.index(old)] = new
+                if old.active_leases > 0:
+                    # The old browser closes after its last lease
+                    self._retiring.append(old)
+                    return
+
+        await self._close_browser(new if not replaced else old)
+
+    async def _release(self, pooled: PooledBrowser) -> None:
+        """Return a lease, closing the browser if it is retiring and idle."""
+        async with self._lock:
+            pooled.active_leases -= 1
+            if pooled.active_leases > 0 or pooled not in self._retiring:
+                return
+            self._retiring.remove(pooled)
+
+        await self._close_browser(pooled)
+
+    async def _close_browser(self, pooled: PooledBrowser) -> None:
+        """Close a browser that is no longer in the pool."""
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logger.debug(f"Error closing recycled browser: {e}")
+
+
+# Global browser pool instance
+_browser_pool: BrowserPool | None = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Get or create the browser pool for the running event loop.
+
+    Playwright objects are bound to the loop that started them, and a pool
+    left running when its loop ends keeps its Chromium processes alive. A
+    pool started on another loop must therefore be closed with
+    close_browser_pool before that loop ends; run_sync does this.
+    """
+    global _browser_pool
+    loop = asyncio.get_running_loop()
+    if _browser_pool is not None and _browser_pool.loop not in (None, loop):
+        if _browser_pool.started:
+            raise RuntimeError(
+                "Browser pool is running on another event loop; "
+                "close it with close_browser_pool() before that loop ends"
+            )
+        _browser_pool = None
+    if _browser_pool is None:
+        _browser_pool = BrowserPool()
+    return _browser_pool
+
+
+async def close_browser_pool() -> None:
+    """Close the global browser pool if it was started."""
+    global _browser_pool
+    if _browser_pool is not None:
+        await _browser_pool.close()
+        _browser_pool = None
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine in a new event loop, closing shared clients after.
+
+    The browser pool and HTTP clients are closed before the loop ends. For
+    synchronous callers such as the Streamlit app that start a fresh
+    loop for every call.
+    """
+
+    async def run() -> T:
+        try:
+            return await coro
+        finally:
+            await close_browser_pool()
+            await close_http_client()
+
+    return asyncio.run(run())
@@ -0,0 +1,111 @@
+"""Generic scraper driven entirely by a store's SUPERMARKETS entry."""
+
+from urllib.parse import quote
+
+from loguru import logger
+from playwright.async_api import Page
+
+from src.models.product import ProductSearch
+from src.scrapers.base_scraper import BaseScraper
+from src.scrapers.pagination import PageCallback, ResultCollector
+from src.scrapers.tier_metrics import BROWSER_TIER, record_tier
+from src.scrapers.timing import STAGE_BUILD, scrape_trace, span
+
+
+class ConfiguredScraper(BaseScraper):
+    """Scraper for any supermarket described in SUPERMARKETS.
+
+    Search URL, readiness strategy, HTTP fast path and card fields all come
+    from the store's config, so adding a store needs no new module.
+    """
+
+    async def search_product(
+        self, query: str, on_page: PageCallback | None = None
+    ) -> list[ProductSearch]:
+        """Search for products on the store's website, timing each stage.
+
+        Results from later pages, up to scrape_result_target, are passed
+        to `on_page` as they arrive.
+        """
+        with scrape_trace(self.supermarket_name, query):
+            return await self._search(query, on_page)
+
+    async def _search(
+        self, query: str, on_page: PageCallback | None = None
+    ) -> list[ProductSearch]:
+        """Search over HTTP if possible, otherwise in a browser page."""
+        display_name = self.config["display_name"]
+        target = self.settings.scrape_result_target
+
+        # Try the plain HTTP tier before opening a browser page
+        fast_results = await self._search_http(query, target, on_page)
+        if fast_results is not None:
+            logger.info(
+                f"{display_name}: Found {len(fast_results)} "
+                f"products for '{query}' over HTTP"
+            )
+            return fast_results
+
+        collector = ResultCollector(target, on_page)
+        record_tier(self.supermarket_name, BROWSER_TIER)
+        try:
+            async with self._create_page(query) as page:
+                # Navigate to search page and wait for the product data
+                search_url = self.config["search_url"].format(query=quote(query))
+                if not await self._load_listing(page, search_url):
+                    logger.warning(f"No products found for query: {query}")
+                    return collector.results
+
+                # Extract product data in a single round-trip
+                cards = await self._extract_cards(page, target)
+                with span(self.supermarket_name, STAGE_BUILD):
+                    collector.add(self._build_products(cards))
+
+                # Later pages load in their own tabs of the same context
+                pagination = self.config.get("pagination", {})
+                template = pagination.get("url")
+                if template and len(cards) >= pagination["page_size"]:
+                    await self._collect_pages(
+                        template,
+                        query,
+                        len(cards),
+                        await self._read_total(page),
+                        collector,
+                        lambda url: self._browser_page(page.context, url, target),
+                    )
+
+                logger.info(
+                    f"{display_name}: Found {len(collector.results)} "
+                    f"products for '{query}'"
+                )
+
+        except Exception as e:
+            logger.error(f"{display_name} scraping error: {e}")
+
+        return collector.results
+
+    async def _read_product_details(self, page: Page, url: str) -> ProductSearch:
+        """Load a product page and read its name and price."""
+        selectors = self.config["selectors"]
+        await self._fetch_page(page, url, wait_until="load")
+        await self._accept_cookies(page)
+
+        name_el = await page.query_selector(selectors.get("detail_title", "h1"))
+        name = await name_el.inner_text() if name_el else "Unknown"
+
+        price_el = await page.query_selector(
+            selectors.get("detail_price", selectors["product_price"])
+        )
+        price_text = await price_el.inner_text() if price_el else "0"
+        price = self._parse_price(price_text) or 0.0
+
+        unit, unit_size = self._extract_unit_info(name)
+
+        return ProductSearch(
+            name=name,
+            regular_price=price,
+            url=url,
+            unit=unit,
+            unit_size=unit_size,
+            supermarket=self.supermarket_name,
+        )
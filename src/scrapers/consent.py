@@ -0,0 +1,59 @@
+"""On-disk cache of cookie-consent storage state per supermarket."""
+
+import json
+import time
+import uuid
+from pathlib import Path
+
+from loguru import logger
+from playwright.async_api import BrowserContext
+
+from src.config.settings import get_settings
+
+
+class ConsentStateStore:
+    """Stores the consented browser storage state for each supermarket.
+
+    A context created with a fresh stored state already carries the consent
+    cookies, so the cookie banner does not have to be clicked again.
+    """
+
+    def __init__(self, directory: Path | None = None, ttl_hours: float | None = None):
+        """Initialize the store."""
+        settings = get_settings()
+        self.directory = directory or settings.data_dir / "consent"
+        ttl = ttl_hours if ttl_hours is not None else settings.consent_state_ttl_hours
+        self.ttl_seconds = ttl * 3600
+
+    def path_for(self, supermarket: str) -> Path:
+        """Get the state file path for a supermarket."""
+        return self.directory / f"{supermarket}.json"
+
+    def get(self, supermarket: str) -> Path | None:
+        """Get the state file path if a fresh state is cached."""
+        path = self.path_for(supermarket)
+        try:
+            age = time.time() - path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+        if age > self.ttl_seconds:
+            logger.debug(f"Consent state for {supermarket} expired")
+            return None
+        return path
+
+    async def save(self, supermarket: str, context: BrowserContext) -> None:
+        """Capture and store the storage state of a consented context."""
+        state = await context.storage_state()
+        path = self.path_for(supermarket)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write atomically so concurrent scrapes never read a partial file
+        tmp_path = path.with_name(f"{path.stem}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_text(json.dumps(state), encoding="utf-8")
+        tmp_path.replace(path)
+        logger.debug(f"Stored consent state for {supermarket}")
+
+    def invalidate(self, supermarket: str) -> None:
+        """Remove the cached state for a supermarket."""
+        self.path_for(supermarket).unlink(missing_ok=True)
@@ -0,0 +1,143 @@
+"""Extraction plans compiled from each store's selectors and field rules."""
+
+from dataclasses import dataclass, field
+from functools import cached_property
+
+import soupsieve
+from soupsieve import SoupSieve
+
+from src.config.constants import SUPERMARKETS
+
+# Parsers a field rule can name; see BaseScraper._build_products
+FIELD_PARSERS = ("text", "price", "url")
+
+# Card fields and the ProductSearch attributes they fill
+PRODUCT_FIELDS = {
+    "title": "name",
+    "brand": "brand",
+    "price": "regular_price",
+    "bonus_price": "bonus_card_price",
+    "promotion": "promotion_text",
+    "href": "url",
+    "image": "image_url",
+}
+
+# Reads every product card on the page in a single round-trip
+EXTRACT_CARDS_JS = """
+([cardSelector, fields, limit]) => {
+    const cards = Array.from(document.querySelectorAll(cardSelector));
+    return cards.slice(0, limit).map((card) => {
+        const values = {};
+        for (const f of fields) {
+            const el = card.querySelector(f.selector);
+            if (!el) {
+                values[f.name] = null;
+            } else {
+                values[f.name] = f.attribute ? el.getAttribute(f.attribute) : el.innerText;
+            }
+        }
+        return values;
+    });
+}
+"""
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    """How to read one card field: an element's text or one of its attributes."""
+
+    name: str
+    selector: str
+    attribute: str | None = None
+    parse: str = "text"
+    pattern: SoupSieve | None = field(default=None, compare=False, repr=False)
+
+
+@dataclass(frozen=True)
+class ExtractionPlan:
+    """Compiled instructions for extracting one store's product cards.
+
+    The same plan drives in-page extraction, element-handle extraction and
+    parsing of server-rendered HTML, so every tier yields identical cards.
+    """
+
+    supermarket: str
+    card_selector: str
+    fields: tuple[FieldRule, ...]
+    card_pattern: SoupSieve | None = field(default=None, compare=False, repr=False)
+
+    @cached_property
+    def spec(self) -> list[dict]:
+        """Get the field rules as arguments for EXTRACT_CARDS_JS."""
+        return [
+            {"name": f.name, "selector": f.selector, "attribute": f.attribute}
+            for f in self.fields
+        ]
+
+
+def default_field_rules(selectors: dict[str, str]) -> dict[str, dict]:
+    """Get the field rules implied by a store's card selectors."""
+    rules = {
+        "title": {"selector": selectors["product_title"]},
+        "price": {"selector": selectors["product_price"], "parse": "price"},
+        "href": {"selector": "a", "attribute": "href", "parse": "url"},
+        "image": {"selector": "img", "attribute": "src"},
+    }
+    if "bonus_price" in selectors:
+        rules["bonus_price"] = {"selector": selectors["bonus_price"], "parse": "price"}
+    return rules
+
+
+def compile_plan(supermarket: str) -> ExtractionPlan:
+    """Compile the extraction plan for a store from SUPERMARKETS.
+
+    Store-specific `fields` rules override the defaults. Raises ValueError
+    for unknown fields or parsers and for invalid CSS selectors.
+    """
+    config = SUPERMARKETS[supermarket]
+    rules = default_field_rules(config["selectors"])
+    rules.update(config.get("fields", {}))
+
+    fields = []
+    for name, rule in rules.items():
+        if name not in PRODUCT_FIELDS:
+            raise ValueError(f"{supermarket}: unknown field {name!r}")
+        parse = rule.get("parse", "text")
+        if parse not in FIELD_PARSERS:
+            raise ValueError(f"{supermarket}: unknown parser {parse!r} for {name}")
+        fields.append(
+            FieldRule(
+                name=name,
+                selector=rule["selector"],
+                attribute=rule.get("attribute"),
+                parse=parse,
+                pattern=_compile_selector(supermarket, rule["selector"]),
+            )
+        )
+
+    card_selector = config["selectors"]["product_card"]
+    return ExtractionPlan(
+        supermarket=supermarket,
+        card_selector=card_selector,
+        fields=tuple(fields),
+        card_pattern=_compile_selector(supermarket, card_selector),
+    )
+
+
+def _compile_selector(supermarket: str, selector: str) -> SoupSieve:
+    """Compile a CSS selector, reporting invalid ones as ValueError."""
+    try:
+        return soupsieve.compile(selector)
+    except soupsieve.SelectorSyntaxError as e:
+        raise ValueError(f"{supermarket}: invalid selector {selector!r}") from e
+
+
+# Compiled plans per store, built on first use
+_plans: dict[str, ExtractionPlan] = {}
+
+
+def get_extraction_plan(supermarket: str) -> ExtractionPlan:
+    """Get the compiled extraction plan for a store."""
+    if supermarket not in _plans:
+        _plans[supermarket] = compile_plan(supermarket)
+    return _plans[supermarket]
@@ -0,0 +1,325 @@
+"""Record/replay of scraper network traffic for offline runs.
+
+In record mode the responses a search receives (page HTML, XHR/fetch
+data, scripts and plain HTTP tier responses) are stored per supermarket
+and query as gzipped JSON. In replay mode those responses are served
+through Playwright route interception and an httpx mock transport, so
+scrapers run without any network access.
+"""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import re
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import httpx
+from loguru import logger
+from playwright.async_api import BrowserContext, Page, Response, Route
+
+from src.config.settings import get_settings
+
+FIXTURE_MODES = ("off", "record", "replay")
+
+# Resource types needed to render a listing page again without network
+RECORDED_RESOURCE_TYPES = {"document", "xhr", "fetch", "script"}
+
+# Static resources whose cache-busting query string may change between runs
+PATH_MATCHED_RESOURCE_TYPES = {"script"}
+
+# Headers that no longer apply once the body is stored decoded
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def _clean_headers(headers: dict[str, str]) -> dict[str, str]:
+    """Drop transfer-level headers from recorded response headers."""
+    return {k: v for k, v in headers.items() if k.lower() not in DROPPED_HEADERS}
+
+
+def _url_key(method: str, url: str) -> str:
+    """Get a lookup key for a full URL, independent of query parameter order."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method} {parts.scheme}://{parts.netloc}{parts.path}?{query}"
+
+
+def _path_key(method: str, url: str) -> str:
+    """Get a lookup key that ignores the query string."""
+    parts = urlsplit(url)
+    return f"{method} {parts.scheme}://{parts.netloc}{parts.path}"
+
+
+@dataclass
+class RecordedResponse:
+    """One recorded network response."""
+
+    url: str
+    method: str
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+    @property
+    def key(self) -> str:
+        """Get the exact lookup key."""
+        return _url_key(self.method, self.url)
+
+    @classmethod
+    def from_httpx(cls, response: httpx.Response) -> "RecordedResponse":
+        """Create a recording from an httpx response."""
+        return cls(
+            url=str(response.request.url),
+            method=response.request.method,
+            status=response.status_code,
+            headers=_clean_headers(dict(response.headers)),
+            body=response.content,
+        )
+
+    def to_dict(self) -> dict:
+        """Serialize to a JSON-compatible dict."""
+        try:
+            body, encoding = self.body.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(self.body).decode("ascii"), "base64"
+        return {
+            "url": self.url,
+            "method": self.method,
+            "status": self.status,
+            "headers": self.headers,
+            "body": body,
+            "encoding": encoding,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RecordedResponse":
+        """Deserialize from a dict written by `to_dict`."""
+        if data.get("encoding") == "base64":
+            body = base64.b64decode(data["body"])
+        else:
+            body = data["body"].encode("utf-8")
+        return cls(
+            url=data["url"],
+            method=data["method"],
+            status=data["status"],
+            headers=data["headers"],
+            body=body,
+        )
+
+
+class FixtureStore:
+    """Gzipped JSON fixtures under data/fixtures/{supermarket}/."""
+
+    def __init__(self, directory: Path | None = None):
+        """Initialize the store."""
+        self.directory = directory or get_settings().data_dir / "fixtures"
+
+    def path_for(self, supermarket: str, query: str) -> Path:
+        """Get the fixture file path for a supermarket and query."""
+        normalized = " ".join(query.lower().split())
+        slug = re.sub(r"[^a-z0-9]+", "-", normalized).strip("-") or "query"
+        digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:8]
+        return self.directory / supermarket / f"{slug}-{digest}.json.gz"
+
+    def _read(self, path: Path) -> dict:
+        """Read a fixture file."""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load(self, supermarket: str, query: str) -> list[RecordedResponse]:
+        """Load the responses recorded for a supermarket and query."""
+        path = self.path_for(supermarket, query)
+        if not path.exists():
+            return []
+        return [RecordedResponse.from_dict(r) for r in self._read(path)["responses"]]
+
+    def load_all(self, supermarket: str) -> list[RecordedResponse]:
+        """Load the responses recorded for all queries of a supermarket."""
+        responses: list[RecordedResponse] = []
+        for path in sorted((self.directory / supermarket).glob("*.json.gz")):
+            try:
+                data = self._read(path)
+            except Exception as e:
+                logger.warning(f"Skipping unreadable fixture {path}: {e}")
+                continue
+            responses.extend(RecordedResponse.from_dict(r) for r in data["responses"])
+        return responses
+
+    def queries(self, supermarket: str) -> list[str]:
+        """Get the queries recorded for a supermarket."""
+        return [
+            self._read(path)["query"]
+            for path in sorted((self.directory / supermarket).glob("*.json.gz"))
+        ]
+
+    def save(
+        self, supermarket: str, query: str, responses: list[RecordedResponse]
+    ) -> Path:
+        """Merge responses into the fixture for a supermarket and query."""
+        path = self.path_for(supermarket, query)
+        merged = {r.key: r for r in self.load(supermarket, query)}
+        merged.update((r.key, r) for r in responses)
+
+        data = {
+            "supermarket": supermarket,
+            "query": query,
+            "recorded_at": time.time(),
+            "responses": [r.to_dict() for r in merged.values()],
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write atomically so a replay never reads a partial file
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(data, f)
+        tmp_path.replace(path)
+        logger.debug(f"Recorded {len(responses)} responses to {path}")
+        return path
+
+    def replayer(self, supermarket: str, query: str | None = None) -> "FixtureReplayer":
+        """Create a replayer for one recorded query of a supermarket.
+
+        Without a query it serves everything recorded for the supermarket,
+        e.g. for product pages opened outside a search.
+        """
+        if query is None:
+            return FixtureReplayer(self.load_all(supermarket))
+        return FixtureReplayer(self.load(supermarket, query))
+
+
+class FixtureRecorder:
+    """Collects the responses browser pages receive during a search."""
+
+    def __init__(
+        self,
+        store: FixtureStore,
+        supermarket: str,
+        query: str,
+        resource_types: set[str] | None = None,
+    ):
+        """Initialize the recorder."""
+        self.store = store
+        self.supermarket = supermarket
+        self.query = query
+        self.resource_types = resource_types or RECORDED_RESOURCE_TYPES
+        self.responses: list[RecordedResponse] = []
+        self._pending: set[asyncio.Task] = set()
+
+    def attach(self, target: Page | BrowserContext) -> None:
+        """Start recording the responses of a page, or of every tab in a context."""
+        target.on("response", self._on_response)
+
+    def _on_response(self, response: Response) -> None:
+        """Schedule reading a response body."""
+        if response.request.resource_type not in self.resource_types:
+            return
+        task = asyncio.ensure_future(self._capture(response))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _capture(self, response: Response) -> None:
+        """Read and keep a response."""
+        try:
+            body = await response.body()
+            headers = await response.all_headers()
+        except Exception as e:
+            # Redirects and aborted requests have no body
+            logger.debug(f"Not recording {response.url}: {e}")
+            return
+
+        self.responses.append(
+            RecordedResponse(
+                url=response.url,
+                method=response.request.method,
+                status=response.status,
+                headers=_clean_headers(headers),
+                body=body,
+            )
+        )
+
+    async def save(self) -> Path | None:
+        """Wait for pending bodies and write the fixture."""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if not self.responses:
+            return None
+        return self.store.save(self.supermarket, self.query, self.responses)
+
+
+class FixtureReplayer:
+    """Serves recorded responses in place of the network.
+
+    Requests are matched on method and full URL including the query
+    string. Only scripts fall back to the URL without its query string, so
+    cache-busting parameters still match; listing pages and data requests
+    for another query or page never do. Unmatched requests are logged and
+    aborted (browser) or answered with 404 (HTTP).
+    """
+
+    def __init__(self, responses: list[RecordedResponse]):
+        """Index the recorded responses."""
+        self._exact: dict[str, RecordedResponse] = {}
+        self._by_path: dict[str, RecordedResponse] = {}
+        for recorded in responses:
+            self._exact[recorded.key] = recorded
+            self._by_path.setdefault(_path_key(recorded.method, recorded.url), recorded)
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Get the number of recorded responses."""
+        return len(self._exact)
+
+    def lookup(
+        self, method: str, url: str, resource_type: str | None = None
+    ) -> RecordedResponse | None:
+        """Find the recorded response for a request."""
+        recorded = self._exact.get(_url_key(method, url))
+        if recorded is None and resource_type in PATH_MATCHED_RESOURCE_TYPES:
+            recorded = self._by_path.get(_path_key(method, url))
+        if recorded is None:
+            self.misses += 1
+            # Images, styles and fonts are never recorded, so only data misses
+            unrecorded = resource_type not in (None, *RECORDED_RESOURCE_TYPES)
+            level = "DEBUG" if unrecorded else "WARNING"
+            logger.log(level, f"No fixture for {method} {url}")
+        else:
+            self.hits += 1
+        return recorded
+
+    async def install(self, context: BrowserContext) -> None:
+        """Serve all requests made in a browser context from fixtures."""
+        await context.route("**/*", self._handle)
+
+    async def _handle(self, route: Route) -> None:
+        """Fulfill an intercepted request from fixtures or abort it."""
+        request = route.request
+        recorded = self.lookup(request.method, request.url, request.resource_type)
+        if recorded is None:
+            await route.abort()
+            return
+        await route.fulfill(
+            status=recorded.status, headers=recorded.headers, body=recorded.body
+        )
+
+    def transport(self) -> httpx.MockTransport:
+        """Get an httpx transport that answers from fixtures."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            recorded = self.lookup(request.method, str(request.url))
+            if recorded is None:
+                return httpx.Response(404, text="No fixture recorded")
+            return httpx.Response(
+                recorded.status, headers=recorded.headers, content=recorded.body
+            )
+
+        return httpx.MockTransport(handler)
+
+    def client(self) -> httpx.AsyncClient:
+        """Get an HTTP client that answers from fixtures."""
+        return httpx.AsyncClient(transport=self.transport(), follow_redirects=True)
@@ -0,0 +1,95 @@
+"""Product card extraction from raw listing HTML."""
+
+from collections import defaultdict
+from typing import Any
+
+from bs4 import BeautifulSoup, Tag
+
+from src.scrapers.extraction import ExtractionPlan, FieldRule
+
+
+def _read_field(card: Tag, rule: FieldRule) -> str | None:
+    """Read a field from the first element matching the rule's selector."""
+    if rule.pattern:
+        el = rule.pattern.select_one(card)
+    else:
+        el = card.select_one(rule.selector)
+    if el is None:
+        return None
+    if rule.attribute is None:
+        return el.get_text(" ", strip=True)
+    value = el.get(rule.attribute)
+    return value if isinstance(value, str) else None
+
+
+def parse_listing_html(
+    html: str, plan: ExtractionPlan, limit: int = 10
+) -> list[dict[str, Any]]:
+    """Extract raw product card fields from a server-rendered listing page.
+
+    Returns the same card dicts as BaseScraper._extract_cards.
+    """
+    return parse_listing_html_page(html, plan, limit)[0]
+
+
+def parse_listing_html_page(
+    html: str, plan: ExtractionPlan, limit: int = 10, total_selector: str | None = None
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Extract card fields and the text of the result count element, if any."""
+    soup = BeautifulSoup(html, "lxml")
+    if plan.card_pattern:
+        cards = plan.card_pattern.select(soup, limit=limit)
+    else:
+        cards = soup.select(plan.card_selector, limit=limit)
+
+    total = None
+    if total_selector:
+        el = soup.select_one(total_selector)
+        total = el.get_text(" ", strip=True) if el else None
+
+    return [
+        {rule.name: _read_field(card, rule) for rule in plan.fields} for card in cards
+    ], total
+
+
+def _lookup(data: Any, path: str) -> Any:
+    """Follow a dotted path like "prices.price.amount" or "images.0.url"."""
+    for key in path.split("."):
+        if isinstance(data, list):
+            data = data[int(key)] if key.isdigit() and int(key) < len(data) else None
+        elif isinstance(data, dict):
+            data = data.get(key)
+        else:
+            return None
+    return data
+
+
+def parse_listing_json(
+    data: Any, fast_path: dict[str, Any], limit: int = 10
+) -> list[dict[str, Any]]:
+    """Extract raw product card fields from a search API response.
+
+    ``fast_path["items"]`` is the dotted path to the product list and
+    ``fast_path["fields"]`` maps card fields to dotted paths per product.
+    Prices are multiplied by ``price_scale`` (e.g. 0.01 for cents).
+    """
+    items = _lookup(data, fast_path["items"]) or []
+    fields = fast_path["fields"]
+    scale = fast_path.get("price_scale", 1)
+    link_template = fast_path.get("link_template")
+
+    cards = []
+    for item in items[:limit]:
+        card = {key: _lookup(item, path) for key, path in fields.items()}
+        for key in ("price", "bonus_price"):
+            if isinstance(card.get(key), (int, float)):
+                card[key] = f"{card[key] * scale:.2f}"
+        if link_template:
+            card["href"] = link_template.format_map(defaultdict(str, item))
+        cards.append(card)
+    return cards
+
+
+def read_json_total(data: Any, path: str | None) -> Any:
+    """Read the result count at a dotted path of a search API response."""
+    return _lookup(data, path) if path else None
@@ -0,0 +1,60 @@
+"""Shared pooled HTTP clients for scrapers."""
+
+import asyncio
+
+import httpx
+from loguru import logger
+
+from src.config.settings import get_settings
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Shared HTTP clients per event loop, keyed by whether they use HTTP/2
+_clients: dict[asyncio.AbstractEventLoop, dict[bool, httpx.AsyncClient]] = {}
+
+
+def get_http_client(http2: bool = False) -> httpx.AsyncClient:
+    """Get or create a shared HTTP client for the running event loop.
+
+    Connection pools are bound to the loop that created them, so each loop
+    gets its own clients; close them with close_http_client before the
+    loop ends (run_sync does this). HTTP/2 is only used when requested and
+    the h2 package is installed.
+    """
+    loop = asyncio.get_running_loop()
+    for other in [other for other in _clients if other.is_closed()]:
+        # Their sockets can no longer be closed from here
+        logger.warning(
+            f"Dropping {len(_clients.pop(other))} HTTP clients "
+            "left open by an ended event loop"
+        )
+    clients = _clients.setdefault(loop, {})
+
+    http2 = http2 and HTTP2_AVAILABLE
+    client = clients.get(http2)
+    if client is None or client.is_closed:
+        settings = get_settings()
+        client = httpx.AsyncClient(
+            http2=http2,
+            timeout=settings.http_timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_connections,
+            ),
+            headers={"Accept-Language": "nl-NL,nl;q=0.9"},
+        )
+        clients[http2] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP clients of the running event loop."""
+    clients = _clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
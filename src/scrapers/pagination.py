@@ -0,0 +1,137 @@
+"""Multi-page search results: page URLs, page counts and deduplication."""
+
+import asyncio
+import math
+import re
+from collections.abc import Callable, Coroutine, Iterable
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import quote
+
+from loguru import logger
+
+from src.models.product import ProductSearch
+
+# Called with each page's new results as they arrive
+PageCallback = Callable[[list[ProductSearch]], None]
+
+# Numbers like "1.234" or "1,234" in a result count text
+_COUNT_RE = re.compile(r"\d[\d.,]*")
+
+
+@dataclass
+class ListingPage:
+    """One result page of a search as fetched, before parsing.
+
+    `payload` is the raw response body, or for browser pages the product
+    cards as extracted, serialized as JSON (`fmt` "cards"). `page_size` is
+    None when the store's results are not paginated.
+    """
+
+    index: int
+    url: str
+    payload: str
+    fmt: str
+    page_size: int | None
+    limit: int
+
+
+def parse_total(value: Any) -> int | None:
+    """Read a result count such as 1234 or "24 van 1.234 resultaten"."""
+    if isinstance(value, int):
+        return value
+    if not value:
+        return None
+    # The total is the last number, e.g. in "showing 24 of 1.234"
+    numbers = _COUNT_RE.findall(str(value))
+    if not numbers:
+        return None
+    return int(re.sub(r"\D", "", numbers[-1]))
+
+
+def page_url(
+    template: str, query: str, index: int, page_size: int, first_page: int = 0
+) -> str:
+    """Build the URL of the result page at a 0-based index."""
+    return template.format(
+        query=quote(query), page=first_page + index, offset=index * page_size
+    )
+
+
+def pages_needed(
+    target: int, page_size: int, first_count: int, total: int | None, max_pages: int
+) -> int:
+    """Get how many result pages to fetch to reach `target` results.
+
+    A first page with fewer than `page_size` results is the only page.
+    Without a known total, pages are fetched up to the target.
+    """
+    if first_count < page_size:
+        return 1
+    pages = math.ceil(target / page_size)
+    if total is not None:
+        pages = min(pages, math.ceil(total / page_size))
+    return max(1, min(pages, max_pages))
+
+
+class ResultCollector:
+    """Collects results across pages, dropping duplicates, up to a target.
+
+    Products are the same when their URL matches, or their name if they
+    have no URL. New results of each page are passed to `on_page`.
+    """
+
+    def __init__(self, target: int, on_page: PageCallback | None = None):
+        """Initialize an empty collector."""
+        self.target = target
+        self.on_page = on_page
+        self.results: list[ProductSearch] = []
+        self.duplicates = 0
+        self._seen: set[str] = set()
+
+    @property
+    def full(self) -> bool:
+        """Check whether the target has been reached."""
+        return len(self.results) >= self.target
+
+    def add(self, products: Iterable[ProductSearch]) -> list[ProductSearch]:
+        """Add a page of results, returning the ones not seen before."""
+        new: list[ProductSearch] = []
+        for product in products:
+            if len(self.results) + len(new) >= self.target:
+                break
+            key = product.url or product.name.lower()
+            if key in self._seen:
+                self.duplicates += 1
+                continue
+            self._seen.add(key)
+            new.append(product)
+
+        self.results.extend(new)
+        if new and self.on_page is not None:
+            self.on_page(new)
+        return new
+
+
+async def collect_pages(
+    pages: list[Coroutine[Any, Any, list[ProductSearch]]],
+    collector: ResultCollector,
+    label: str,
+) -> None:
+    """Fetch result pages concurrently, adding each to the collector as it lands.
+
+    Pages are added in completion order. A failed page is skipped, and
+    pages still running once the target is reached are cancelled.
+    """
+    tasks = [asyncio.create_task(page) for page in pages]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                collector.add(await next_done)
+            except Exception as e:
+                logger.debug(f"{label}: result page failed: {e}")
+            if collector.full:
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
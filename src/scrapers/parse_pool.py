@@ -0,0 +1,246 @@
+"""Process pool for CPU-bound listing parsing and normalization.
+
+Raw page payloads go to worker processes as strings and come back as
+compact record tuples (see RECORD_FIELDS), so parsing large pages never
+blocks the event loop. Small payloads are parsed inline because the
+round-trip to a worker would cost more than the parse.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from loguru import logger
+
+from src.config.constants import SUPERMARKETS
+from src.config.settings import get_settings
+from src.scrapers.extraction import PRODUCT_FIELDS, ExtractionPlan, get_extraction_plan
+from src.scrapers.html_parser import (
+    parse_listing_html_page,
+    parse_listing_json,
+    read_json_total,
+)
+from src.scrapers.pagination import parse_total
+from src.scrapers.parsing import parse_price, parse_units
+
+# ProductSearch fields carried by a parsed record, in tuple order
+RECORD_FIELDS = (
+    "name",
+    "brand",
+    "regular_price",
+    "bonus_card_price",
+    "promotion_text",
+    "url",
+    "image_url",
+    "unit",
+    "unit_size",
+)
+
+
+def normalize_text(text: str | None) -> str | None:
+    """Normalize whitespace in a text field."""
+    if not text:
+        return None
+    return " ".join(text.split())
+
+
+def absolute_url(base_url: str, href: str | None) -> str:
+    """Make a product link absolute."""
+    if not href:
+        return ""
+    if href.startswith("http"):
+        return href
+    return f"{base_url}{href}"
+
+
+def normalize_cards(
+    plan: ExtractionPlan, cards: list[dict], base_url: str
+) -> list[tuple]:
+    """Parse raw card fields into records with the plan's rules.
+
+    Cards without a title are dropped; prices, links and units are parsed.
+    """
+    parsers = {
+        "text": normalize_text,
+        "price": parse_price,
+        "url": lambda href: absolute_url(base_url, href),
+    }
+
+    titles = [(card.get("title") or "").strip() for card in cards]
+    named_cards = [(name, card) for name, card in zip(titles, cards) if name]
+    units = parse_units(name for name, _ in named_cards)
+
+    records = []
+    for (name, card), (unit, unit_size) in zip(named_cards, units):
+        fields = {
+            PRODUCT_FIELDS[rule.name]: parsers[rule.parse](card.get(rule.name))
+            for rule in plan.fields
+        }
+        fields.update(name=name, unit=unit, unit_size=unit_size)
+        fields["regular_price"] = fields.get("regular_price") or 0.0
+        fields.setdefault("url", "")
+        records.append(tuple(fields.get(key) for key in RECORD_FIELDS))
+    return records
+
+
+def parse_payload(
+    supermarket: str, payload: str, fmt: str, limit: int = 10
+) -> tuple[list[tuple], float]:
+    """Parse a listing payload into records; runs in a worker process.
+
+    Returns the records and the seconds spent parsing.
+    """
+    records, _, elapsed = parse_page_payload(supermarket, payload, fmt, limit)
+    return records, elapsed
+
+
+def parse_page_payload(
+    supermarket: str, payload: str, fmt: str, limit: int = 10, first: bool = False
+) -> tuple[list[tuple], int | None, float]:
+    """Parse a result page into records; runs in a worker process.
+
+    For the `first` page the total number of results is read as well, if
+    the store's pagination config says where. Returns the records, the
+    total (or None) and the seconds spent parsing.
+    """
+    start = time.perf_counter()
+    config = SUPERMARKETS[supermarket]
+    pagination = config.get("pagination", {}) if first else {}
+    if fmt == "json":
+        data = json.loads(payload)
+        cards = parse_listing_json(data, config["fast_path"], limit)
+        total = read_json_total(data, pagination.get("fast_path_total"))
+    else:
+        cards, total = parse_listing_html_page(
+            payload, get_extraction_plan(supermarket), limit, pagination.get("total")
+        )
+    records = normalize_cards(
+        get_extraction_plan(supermarket), cards, config["base_url"]
+    )
+    return records, parse_total(total), time.perf_counter() - start
+
+
+class ParsePool:
+    """Ships listing payloads to a ProcessPoolExecutor and tracks its load.
+
+    With `workers` set to 0, or for payloads under `min_bytes`, parsing
+    runs inline. A broken pool is replaced on the next call.
+    """
+
+    def __init__(self, workers: int | None = None, min_bytes: int | None = None):
+        """Initialize without starting any processes."""
+        settings = get_settings()
+        self.workers = settings.parse_pool_workers if workers is None else workers
+        self.min_bytes = (
+            settings.parse_pool_min_bytes if min_bytes is None else min_bytes
+        )
+        self._executor: ProcessPoolExecutor | None = None
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.pooled = 0
+        self.inline = 0
+        self.errors = 0
+        self.parse_seconds = 0.0
+        self.wait_seconds = 0.0
+
+    async def parse(
+        self, supermarket: str, payload: str, fmt: str = "html", limit: int = 10
+    ) -> list[tuple]:
+        """Parse a listing payload into records, off the event loop if large."""
+        records, _ = await self.parse_page(supermarket, payload, fmt, limit)
+        return records
+
+    async def parse_page(
+        self,
+        supermarket: str,
+        payload: str,
+        fmt: str = "html",
+        limit: int = 10,
+        first: bool = False,
+    ) -> tuple[list[tuple], int | None]:
+        """Parse a result page into records and, if `first`, the result total."""
+        args = (supermarket, payload, fmt, limit, first)
+        if self.workers <= 0 or len(payload) < self.min_bytes:
+            records, total, elapsed = parse_page_payload(*args)
+            self.inline += 1
+            self.parse_seconds += elapsed
+            return records, total
+
+        start = time.perf_counter()
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            loop = asyncio.get_running_loop()
+            records, total, elapsed = await loop.run_in_executor(
+                self._get_executor(), parse_page_payload, *args
+            )
+        except BrokenProcessPool as e:
+            logger.warning(f"Parse pool broke ({e}), parsing inline")
+            self.errors += 1
+            self._executor = None
+            records, total, elapsed = parse_page_payload(*args)
+        finally:
+            self.queue_depth -= 1
+
+        self.pooled += 1
+        self.parse_seconds += elapsed
+        self.wait_seconds += max(0.0, time.perf_counter() - start - elapsed)
+        return records, total
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Get the executor, starting it on first use."""
+        if self._executor is None:
+            # Spawned workers do not inherit the event loop or browser threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"Started parse pool with {self.workers} workers")
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        """Get pool load and timing statistics."""
+        parsed = self.pooled + self.inline
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "pooled": self.pooled,
+            "inline": self.inline,
+            "errors": self.errors,
+            "avg_parse_ms": round(self.parse_seconds / parsed * 1000, 2)
+            if parsed
+            else 0.0,
+            "avg_wait_ms": round(self.wait_seconds / self.pooled * 1000, 2)
+            if self.pooled
+            else 0.0,
+        }
+
+
+# Global parse pool instance
+_parse_pool: ParsePool | None = None
+
+
+def get_parse_pool() -> ParsePool:
+    """Get or create the global parse pool."""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ParsePool()
+    return _parse_pool
+
+
+def close_parse_pool() -> None:
+    """Shut down the global parse pool."""
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown()
+        _parse_pool = None
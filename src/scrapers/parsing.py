@@ -0,0 +1,103 @@
+"""Price and unit parsing for scraped product text.
+
+All patterns are compiled once at import. Unit detection is a
+case-insensitive scan that also understands multipacks like "6x33cl".
+"""
+
+import re
+from collections.abc import Iterable
+
+# Euros with optional decimals: "1,49", "0.99", "2,-" or split cents "0 99".
+# Euros may be grouped in thousands, as in "1.234,56", "1,234.56" or
+# "1.299", when followed by a different decimal separator or nothing.
+PRICE_RE = re.compile(
+    r"(?P<euros>[1-9]\d{0,2}(?P<sep>[.,])\d{3}(?:(?P=sep)\d{3})*"
+    r"(?=(?!(?P=sep))[.,](?:\d{1,2}(?!\d)|-)|(?![.,]?\d))|\d+)"
+    r"(?:[.,](?P<cents>\d{1,2})(?!\d)|\s+(?P<split_cents>\d{2})(?!\d))?"
+)
+
+# Optional "<count> x" multipack prefix, a size and a unit word
+UNIT_RE = re.compile(
+    r"(?:(?P<count>\d+)\s*[x×]\s*)?"
+    r"(?P<size>\d+(?:[.,]\d+)?)\s*"
+    r"(?P<unit>kilogram|kilo|kg|gram|gr|g|milliliter|ml|centiliter|cl"
+    r"|liters?|litre|ltr|lt|l|stuks?|st)\b",
+    re.IGNORECASE,
+)
+
+# Unit words and the (unit, multiplier) they normalize to
+UNIT_ALIASES = {
+    "kilogram": ("kg", 1),
+    "kilo": ("kg", 1),
+    "kg": ("kg", 1),
+    "gram": ("gram", 1),
+    "gr": ("gram", 1),
+    "g": ("gram", 1),
+    "milliliter": ("ml", 1),
+    "ml": ("ml", 1),
+    "centiliter": ("ml", 10),
+    "cl": ("ml", 10),
+    "liter": ("liter", 1),
+    "liters": ("liter", 1),
+    "litre": ("liter", 1),
+    "ltr": ("liter", 1),
+    "lt": ("liter", 1),
+    "l": ("liter", 1),
+    "stuks": ("stuk", 1),
+    "stuk": ("stuk", 1),
+    "st": ("stuk", 1),
+}
+
+DEFAULT_UNIT = ("stuk", 1.0)
+
+# Units that only count pieces; a weight or volume in the name wins
+PIECE_UNITS = {"stuk"}
+
+
+def parse_price(text: str | None) -> float | None:
+    """Parse the first price in a text, e.g. "€ 1,49" -> 1.49."""
+    if not text:
+        return None
+    match = PRICE_RE.search(text)
+    if not match:
+        return None
+
+    euros = match["euros"]
+    if match["sep"]:
+        euros = euros.replace(match["sep"], "")
+    cents = match["cents"] or match["split_cents"]
+    return float(f"{euros}.{cents}") if cents else float(euros)
+
+
+def parse_unit(text: str) -> tuple[str, float]:
+    """Parse the unit and total size from a product name.
+
+    "Heineken 6 x 33 cl" gives ("ml", 1980.0); names without a
+    recognizable quantity count as one piece. A weight or volume takes
+    precedence over a piece count, so "6 stuks 100g" gives ("gram", 100.0).
+    """
+    match = None
+    for candidate in UNIT_RE.finditer(text):
+        if match is None:
+            match = candidate
+        if UNIT_ALIASES[candidate["unit"].lower()][0] not in PIECE_UNITS:
+            match = candidate
+            break
+    if match is None:
+        return DEFAULT_UNIT
+
+    unit, factor = UNIT_ALIASES[match["unit"].lower()]
+    size = float(match["size"].replace(",", ".")) * factor
+    if match["count"]:
+        size *= int(match["count"])
+    return unit, round(size, 6)
+
+
+def parse_prices(texts: Iterable[str | None]) -> list[float | None]:
+    """Parse a batch of price texts."""
+    return [parse_price(text) for text in texts]
+
+
+def parse_units(texts: Iterable[str]) -> list[tuple[str, float]]:
+    """Parse the units of a batch of product names."""
+    return [parse_unit(text) for text in texts]
@@ -0,0 +1,98 @@
+"""Per-host token-bucket rate limiting for scrapers."""
+
+import asyncio
+import math
+import threading
+import time
+
+from src.config.settings import get_settings
+
+
+class TokenBucket:
+    """Async token bucket shared by all concurrent requests to one host.
+
+    Holds up to ``capacity`` tokens and refills at ``rate`` tokens per
+    second, so a burst of requests after an idle period is not delayed
+    while the sustained request rate stays bounded.
+
+    Each request reserves its token up front, letting the balance go
+    negative, and sleeps off the deficit. The balance is guarded by a
+    thread lock that is never held across an await, so one bucket can be
+    shared by every event loop in the process. A ``rate`` of ``math.inf``
+    never waits.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        """Get the number of tokens currently available."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last update."""
+        now = time.monotonic()
+        if math.isinf(self.rate):
+            self._tokens = float(self.capacity)
+        else:
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """Take a token, waiting until one is available.
+
+        Returns the number of seconds spent waiting.
+        """
+        # Reservations are taken in call order, so tokens are handed out FIFO
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            waited = max(0.0, -self._tokens / self.rate)
+
+        if waited:
+            try:
+                await asyncio.sleep(waited)
+            except asyncio.CancelledError:
+                # Hand the reserved token back
+                with self._lock:
+                    self._tokens += 1
+                raise
+        return waited
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now, without waiting."""
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+# Process-wide buckets per host
+_buckets: dict[str, TokenBucket] = {}
+
+
+def get_rate_limiter(host: str) -> TokenBucket:
+    """Get or create the token bucket for a host.
+
+    A scrape_rate_limit of 0 or less means no delay between requests.
+    """
+    if host not in _buckets:
+        settings = get_settings()
+        interval = settings.scrape_rate_limit
+        _buckets[host] = TokenBucket(
+            rate=1 / interval if interval > 0 else math.inf,
+            capacity=settings.scrape_rate_burst,
+        )
+    return _buckets[host]
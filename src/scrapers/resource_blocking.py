@@ -0,0 +1,107 @@
+"""Request interception that skips resources the scrapers never use."""
+
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+
+from loguru import logger
+from playwright.async_api import BrowserContext, Route
+
+# Typical transfer sizes, used to estimate the bytes saved by aborted requests
+ESTIMATED_RESOURCE_BYTES = {
+    "image": 40_000,
+    "media": 250_000,
+    "font": 30_000,
+    "stylesheet": 20_000,
+    "script": 30_000,
+}
+DEFAULT_ESTIMATED_BYTES = 5_000
+
+
+@dataclass
+class BlockingStats:
+    """Counters for requests aborted by the resource blocker."""
+
+    requests_blocked: int = 0
+    requests_allowed: int = 0
+    bytes_saved_estimate: int = 0
+    blocked_by_reason: dict[str, int] = field(default_factory=dict)
+
+    def record_blocked(self, resource_type: str, reason: str) -> None:
+        """Record an aborted request."""
+        self.requests_blocked += 1
+        self.bytes_saved_estimate += ESTIMATED_RESOURCE_BYTES.get(
+            resource_type, DEFAULT_ESTIMATED_BYTES
+        )
+        self.blocked_by_reason[reason] = self.blocked_by_reason.get(reason, 0) + 1
+
+    def as_dict(self) -> dict:
+        """Get the counters as a plain dict."""
+        return {
+            "requests_blocked": self.requests_blocked,
+            "requests_allowed": self.requests_allowed,
+            "bytes_saved_estimate": self.bytes_saved_estimate,
+            "blocked_by_reason": dict(self.blocked_by_reason),
+        }
+
+
+# Process-wide counters per supermarket
+_stats: dict[str, BlockingStats] = {}
+
+
+def get_blocking_stats(supermarket: str) -> BlockingStats:
+    """Get the blocking counters for a supermarket."""
+    if supermarket not in _stats:
+        _stats[supermarket] = BlockingStats()
+    return _stats[supermarket]
+
+
+def get_all_blocking_stats() -> dict[str, dict]:
+    """Get the blocking counters for all supermarkets."""
+    return {name: stats.as_dict() for name, stats in _stats.items()}
+
+
+class ResourceBlocker:
+    """Aborts requests by resource type and by domain blocklist."""
+
+    def __init__(
+        self,
+        supermarket: str,
+        resource_types: list[str],
+        blocked_domains: list[str],
+    ):
+        """Initialize the blocker."""
+        self.supermarket = supermarket
+        self.resource_types = set(resource_types)
+        self.blocked_domains = tuple(d.lower() for d in blocked_domains)
+        self.stats = get_blocking_stats(supermarket)
+
+    def block_reason(self, resource_type: str, url: str) -> str | None:
+        """Get the reason a request should be blocked, if any."""
+        if resource_type in self.resource_types:
+            return f"type:{resource_type}"
+
+        host = (urlparse(url).hostname or "").lower()
+        for domain in self.blocked_domains:
+            if host == domain or host.endswith(f".{domain}"):
+                return f"domain:{domain}"
+        return None
+
+    async def install(self, context: BrowserContext) -> None:
+        """Intercept all requests made in a browser context."""
+        await context.route("**/*", self._handle)
+
+    async def _handle(self, route: Route) -> None:
+        """Abort or continue an intercepted request."""
+        request = route.request
+        reason = self.block_reason(request.resource_type, request.url)
+
+        if reason:
+            self.stats.record_blocked(request.resource_type, reason)
+            await route.abort()
+            return
+
+        self.stats.requests_allowed += 1
+        try:
+            await route.continue_()
+        except Exception as e:
+            logger.debug(f"Could not continue request {request.url}: {e}")
@@ -0,0 +1,19 @@
+"""Counters for which scraper tier served each search."""
+
+from collections import Counter
+
+HTTP_TIER = "http"
+BROWSER_TIER = "browser"
+
+# Process-wide counters per supermarket
+_tiers: dict[str, Counter] = {}
+
+
+def record_tier(supermarket: str, tier: str) -> None:
+    """Record that a search was served by a tier, or fell back from one."""
+    _tiers.setdefault(supermarket, Counter())[tier] += 1
+
+
+def get_tier_metrics() -> dict[str, dict[str, int]]:
+    """Get tier counters for all supermarkets."""
+    return {name: dict(counts) for name, counts in _tiers.items()}
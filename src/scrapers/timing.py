@@ -0,0 +1,193 @@
+"""Per-stage timing spans and latency histograms for scrapes.
+
+Scrapers time each stage (rate limit wait, HTTP fetch, browser context
+lease, navigation, cookie banner, readiness wait, card extraction,
+parsing) with `span`. Every span feeds a process-wide histogram per
+supermarket and stage; spans inside `scrape_trace` are also collected for
+that one search and logged together when it finishes.
+"""
+
+import time
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from loguru import logger
+
+from src.config.settings import get_settings
+
+# Scrape stages
+STAGE_THROTTLE = "throttle"
+STAGE_HTTP_FETCH = "http_fetch"
+STAGE_PARSE = "parse"
+STAGE_BROWSER_LEASE = "browser_lease"
+STAGE_NAVIGATE = "navigate"
+STAGE_ACCEPT_COOKIES = "accept_cookies"
+STAGE_READY = "ready"
+STAGE_EXTRACT = "extract"
+STAGE_BUILD = "build"
+STAGE_TOTAL = "total"
+
+# Histogram bucket upper bounds in milliseconds
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class Histogram:
+    """Latency histogram with fixed millisecond buckets."""
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms: float) -> None:
+        """Add one observation."""
+        self.buckets[bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float) -> float:
+        """Estimate a percentile (0-100) as the upper bound of its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS_MS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(float(bound), self.max_ms)
+        return self.max_ms
+
+    def snapshot(self) -> dict:
+        """Get the count, percentiles and bucket counts."""
+        bounds = [str(bound) for bound in BUCKETS_MS] + ["inf"]
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 1),
+            "avg_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max_ms, 1),
+            "buckets": dict(zip(bounds, self.buckets)),
+        }
+
+
+@dataclass
+class ScrapeTrace:
+    """Spans recorded during one search of one supermarket."""
+
+    supermarket: str
+    query: str
+    spans: list[tuple[str, float]] = field(default_factory=list)
+
+    def summary(self) -> str:
+        """Describe the spans in order, e.g. "navigate 812ms, ready 240ms"."""
+        return ", ".join(f"{stage} {ms:.0f}ms" for stage, ms in self.spans)
+
+
+# Process-wide histograms per (supermarket, stage)
+_histograms: dict[tuple[str, str], Histogram] = {}
+
+# Trace of the search running in the current task, if any
+_current_trace: ContextVar[ScrapeTrace | None] = ContextVar(
+    "scrape_trace", default=None
+)
+
+
+def record_span(supermarket: str, stage: str, seconds: float) -> None:
+    """Record how long a stage took."""
+    ms = seconds * 1000
+    _histograms.setdefault((supermarket, stage), Histogram()).record(ms)
+    trace = _current_trace.get()
+    if trace is not None and trace.supermarket == supermarket:
+        trace.spans.append((stage, ms))
+
+
+@contextmanager
+def span(supermarket: str, stage: str) -> Iterator[None]:
+    """Time the enclosed block as a stage, whether or not it raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(supermarket, stage, time.perf_counter() - start)
+
+
+@contextmanager
+def scrape_trace(supermarket: str, query: str) -> Iterator[ScrapeTrace]:
+    """Collect the spans of one search and log them when it ends.
+
+    The whole search is recorded as the "total" stage. Searches slower
+    than scrape_slow_ms are logged at INFO, the rest at DEBUG.
+    """
+    trace = ScrapeTrace(supermarket, query)
+    token = _current_trace.set(trace)
+    start = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        elapsed = time.perf_counter() - start
+        record_span(supermarket, STAGE_TOTAL, elapsed)
+        level = "INFO" if elapsed * 1000 >= get_settings().scrape_slow_ms else "DEBUG"
+        logger.log(
+            level,
+            f"{supermarket} '{query}' took {elapsed * 1000:.0f}ms: "
+            f"{trace.summary() or 'no stages'}",
+        )
+
+
+def get_timing_metrics(
+    supermarket: str | None = None, stage: str | None = None
+) -> dict[str, dict[str, dict]]:
+    """Get histogram snapshots per supermarket and stage, optionally filtered."""
+    metrics: dict[str, dict[str, dict]] = {}
+    for (name, name_stage), histogram in sorted(_histograms.items()):
+        if supermarket not in (None, name) or stage not in (None, name_stage):
+            continue
+        metrics.setdefault(name, {})[name_stage] = histogram.snapshot()
+    return metrics
+
+
+def get_timing_summary() -> dict[str, list[dict]]:
+    """Get each supermarket's stages ordered by their share of scrape time."""
+    summary: dict[str, list[dict]] = {}
+    for name, stages in get_timing_metrics().items():
+        timed = {k: v for k, v in stages.items() if k != STAGE_TOTAL}
+        spent = sum(snapshot["total_ms"] for snapshot in timed.values()) or 1.0
+        summary[name] = [
+            {
+                "stage": stage,
+                "share": round(snapshot["total_ms"] / spent, 3),
+                "count": snapshot["count"],
+                "p50_ms": snapshot["p50_ms"],
+                "p95_ms": snapshot["p95_ms"],
+            }
+            for stage, snapshot in sorted(
+                timed.items(), key=lambda item: -item[1]["total_ms"]
+            )
+        ]
+    return summary
+
+
+def log_timing_summary() -> None:
+    """Log where scrape time went per supermarket, largest stage first."""
+    for name, stages in get_timing_summary().items():
+        parts = ", ".join(
+            f"{s['stage']} {s['share']:.0%} (p95 {s['p95_ms']:.0f}ms)" for s in stages
+        )
+        total = _histograms.get((name, STAGE_TOTAL))
+        if total is not None:
+            parts = f"{total.count} searches, p95 {total.percentile(95):.0f}ms; {parts}"
+        logger.info(f"Scrape timings {name}: {parts}")
+
+
+def reset_timings() -> None:
+    """Clear all histograms."""
+    _histograms.clear()
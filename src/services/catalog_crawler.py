@@ -0,0 +1,376 @@
+"""Incremental catalog crawl with content-hash change detection."""
+
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import asdict, dataclass, fields
+
+from loguru import logger
+
+from src.config.constants import CATALOG_SEEDS, SUPERMARKETS
+from src.config.settings import get_settings
+from src.database import CrawlCheckpointDB, DatabaseManager, get_db
+from src.database.crud import (
+    create_checkpoint,
+    get_active_checkpoint,
+    get_fingerprints,
+    touch_fingerprints,
+    update_checkpoint,
+    upsert_fingerprint,
+)
+from src.models.product import ProductSearch
+from src.scrapers.browser_pool import close_browser_pool
+from src.scrapers.http_client import close_http_client
+from src.scrapers.pagination import ListingPage
+from src.services.scraper_service import (
+    STATUS_CIRCUIT_OPEN,
+    STATUS_EMPTY,
+    STATUS_OK,
+    ScraperService,
+)
+
+# Listing fields whose change means a new price record is worth storing
+FINGERPRINT_FIELDS = (
+    "name",
+    "brand",
+    "regular_price",
+    "sale_price",
+    "bonus_card_price",
+    "promotion_text",
+    "unit",
+    "unit_size",
+    "image_url",
+)
+
+
+@dataclass
+class CrawlStats:
+    """Counters for one store's crawl run, kept across resumes."""
+
+    supermarket: str
+    pages_fetched: int = 0
+    pages_skipped: int = 0
+    pages_changed: int = 0
+    pages_failed: int = 0
+    listings_seen: int = 0
+    listings_changed: int = 0
+    listings_unchanged: int = 0
+    records_saved: int = 0
+    resumed_at: int = 0
+    next_page: int = 0  # of the seed at the checkpoint position
+    completed: bool = False
+    elapsed: float = 0.0
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dict."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, supermarket: str, data: dict) -> "CrawlStats":
+        """Restore counters saved in a checkpoint."""
+        known = {f.name for f in fields(cls)}
+        values = {k: v for k, v in data.items() if k in known}
+        values["supermarket"] = supermarket
+        return cls(**values)
+
+
+def listing_key(product: ProductSearch) -> str:
+    """Get the key identifying a listing across crawls."""
+    return product.url or f"name:{product.name}"
+
+
+def listing_fingerprint(product: ProductSearch) -> str:
+    """Hash the listing fields that matter for price history."""
+    values = [getattr(product, name) for name in FINGERPRINT_FIELDS]
+    payload = json.dumps(values, separators=(",", ":"), default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def page_fingerprint(payload: str) -> str:
+    """Hash a result page's raw payload, before any parsing."""
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def page_hash(digest: str, count: int, total: int | None) -> str:
+    """Combine a page's payload hash with its listing count and result total."""
+    return f"{digest}:{count}:{'' if total is None else total}"
+
+
+def read_page_hash(value: str) -> tuple[str, int, int | None] | None:
+    """Split a stored page hash, or None if it is not in the current format."""
+    parts = value.split(":")
+    if len(parts) != 3 or not parts[1].isdigit():
+        return None
+    digest, count, total = parts
+    return digest, int(count), int(total) if total.isdigit() else None
+
+
+class CatalogCrawler:
+    """Walks every result page of each store's seeds and stores what changed.
+
+    Each page's raw payload is hashed as it arrives; a page that hashes
+    the same as last crawl is skipped without being parsed. Listings of
+    changed pages are fingerprinted with a hash of their content and only
+    changed ones get new price records. Progress is checkpointed after
+    every page, so an interrupted crawl resumes where it stopped.
+    """
+
+    def __init__(
+        self,
+        service: ScraperService | None = None,
+        db_manager: DatabaseManager | None = None,
+    ):
+        """Initialize with the scraper service and database to use."""
+        self.service = service or ScraperService()
+        self.db_manager = db_manager or get_db()
+
+    async def crawl(
+        self,
+        supermarkets: list[str] | None = None,
+        seeds: list[str] | None = None,
+        restart: bool = False,
+    ) -> dict[str, CrawlStats]:
+        """Crawl several stores concurrently, one page at a time per store."""
+        names = supermarkets or list(self.service.scrapers)
+        results = await asyncio.gather(
+            *(self.crawl_store(name, seeds, restart) for name in names)
+        )
+        return dict(zip(names, results))
+
+    async def crawl_store(
+        self, supermarket: str, seeds: list[str] | None = None, restart: bool = False
+    ) -> CrawlStats:
+        """Crawl one store's seed searches page by page, resuming if unfinished.
+
+        A seed's pages are walked until one comes back short of the page
+        size, the result total is reached, or crawl_max_pages.
+        """
+        seeds = seeds or SUPERMARKETS[supermarket].get("crawl_seeds", CATALOG_SEEDS)
+        # Database work blocks, so it runs off the loop other stores crawl on
+        checkpoint_id, position, stats = await asyncio.to_thread(
+            self._start, supermarket, seeds, restart
+        )
+        max_pages = get_settings().crawl_max_pages
+        seed_total: int | None = None
+
+        while position < len(seeds):
+            start = time.monotonic()
+            seed = seeds[position]
+            status, page = await self.service.fetch_listing_page(
+                supermarket, seed, stats.next_page
+            )
+
+            # Leave the checkpoint running so the next crawl retries from here
+            if status == STATUS_CIRCUIT_OPEN:
+                logger.warning(
+                    f"{supermarket}: circuit open, pausing crawl at '{seed}' "
+                    f"page {stats.next_page + 1}"
+                )
+                return stats
+
+            more = False
+            if status == STATUS_OK:
+                stats.pages_fetched += 1
+                listed = await self._crawl_page(supermarket, seed, page, stats)
+                if listed is not None:
+                    count, total = listed
+                    seed_total = seed_total if total is None else total
+                    more = self._has_more(page, count, seed_total)
+            elif status != STATUS_EMPTY:
+                stats.pages_failed += 1
+
+            if more and stats.next_page + 1 < max_pages:
+                stats.next_page += 1
+            else:
+                stats.next_page = 0
+                seed_total = None
+                position += 1
+
+            stats.elapsed += time.monotonic() - start
+            stats.completed = position == len(seeds)
+            await asyncio.to_thread(
+                self._save_checkpoint, checkpoint_id, position, stats
+            )
+
+        stats.completed = True
+        logger.info(
+            f"{supermarket}: crawl done, {stats.pages_fetched} pages fetched, "
+            f"{stats.pages_skipped} unchanged, {stats.pages_changed} changed, "
+            f"{stats.listings_changed} listings changed"
+        )
+        return stats
+
+    def _start(
+        self, supermarket: str, seeds: list[str], restart: bool
+    ) -> tuple[int, int, CrawlStats]:
+        """Resume the store's unfinished checkpoint or start a new one."""
+        with self.db_manager.get_session() as session:
+            checkpoint = get_active_checkpoint(session, supermarket)
+            if checkpoint and not restart and checkpoint.seeds == list(seeds):
+                stats = CrawlStats.from_dict(supermarket, checkpoint.stats or {})
+                stats.resumed_at = checkpoint.position
+                logger.info(
+                    f"{supermarket}: resuming crawl at seed "
+                    f"{checkpoint.position + 1}/{len(seeds)}, "
+                    f"page {stats.next_page + 1}"
+                )
+                return checkpoint.id, checkpoint.position, stats
+
+            if checkpoint:
+                update_checkpoint(
+                    session,
+                    checkpoint,
+                    checkpoint.position,
+                    checkpoint.stats or {},
+                    status="abandoned",
+                )
+            checkpoint = create_checkpoint(session, supermarket, seeds)
+            return checkpoint.id, 0, CrawlStats(supermarket=supermarket)
+
+    def _save_checkpoint(
+        self, checkpoint_id: int, position: int, stats: CrawlStats
+    ) -> None:
+        """Record the crawl's progress, completing it after the last seed."""
+        with self.db_manager.get_session() as session:
+            checkpoint = session.get(CrawlCheckpointDB, checkpoint_id)
+            update_checkpoint(
+                session,
+                checkpoint,
+                position,
+                stats.to_dict(),
+                status="completed" if stats.completed else None,
+            )
+
+    async def _crawl_page(
+        self, supermarket: str, seed: str, page: ListingPage, stats: CrawlStats
+    ) -> tuple[int, int | None] | None:
+        """Store what changed on a fetched page.
+
+        Returns the page's listing count and result total, or None if it
+        had no usable listings. The stored page hash carries both, so an
+        unchanged page is skipped without parsing.
+        """
+        page_key = f"page:{seed}:{page.index}"
+        digest = page_fingerprint(page.payload)
+
+        skipped = await asyncio.to_thread(
+            self._skip_unchanged, supermarket, page_key, digest, stats
+        )
+        if skipped is not None:
+            return skipped
+
+        try:
+            products, total = await self.service.parse_listing_page(supermarket, page)
+        except Exception as e:
+            logger.error(f"{supermarket}: could not parse '{seed}' page: {e}")
+            stats.pages_failed += 1
+            return None
+        if not products:
+            logger.debug(
+                f"{supermarket}: no listings on '{seed}' page {page.index + 1}"
+            )
+            return None
+
+        await asyncio.to_thread(
+            self._store_listings,
+            supermarket,
+            products,
+            stats,
+            page_key,
+            page_hash(digest, len(products), total),
+        )
+        return len(products), total
+
+    def _skip_unchanged(
+        self, supermarket: str, page_key: str, digest: str, stats: CrawlStats
+    ) -> tuple[int, int | None] | None:
+        """Mark a page and its listings seen if its payload did not change.
+
+        Returns the page's stored listing count and total, or None if the
+        page is new or changed.
+        """
+        with self.db_manager.get_session() as session:
+            previous = get_fingerprints(session, supermarket, [page_key]).get(page_key)
+            stored = read_page_hash(previous.content_hash) if previous else None
+            if stored is None or stored[0] != digest:
+                return None
+
+            listing_keys = previous.listing_keys or []
+            stats.pages_skipped += 1
+            stats.listings_seen += len(listing_keys)
+            stats.listings_unchanged += len(listing_keys)
+            touch_fingerprints(session, supermarket, [page_key, *listing_keys])
+            return stored[1], stored[2]
+
+    def _has_more(self, page: ListingPage, count: int, total: int | None) -> bool:
+        """Check whether a page with `count` listings has a next page."""
+        if not page.page_size or count < page.page_size:
+            return False
+        return total is None or (page.index + 1) * page.page_size < total
+
+    def _store_listings(
+        self,
+        supermarket: str,
+        products: list[ProductSearch],
+        stats: CrawlStats,
+        page_key: str,
+        page_content_hash: str,
+    ) -> None:
+        """Persist the changed listings of a changed page, then its own hash."""
+        listings: dict[str, ProductSearch] = {}
+        hashes: dict[str, str] = {}
+        for product in products:
+            key = listing_key(product)
+            if key not in listings:
+                listings[key] = product
+                hashes[key] = listing_fingerprint(product)
+        stats.listings_seen += len(listings)
+        stats.pages_changed += 1
+
+        with self.db_manager.get_session() as session:
+            stored = get_fingerprints(session, supermarket, list(listings))
+            changed = [
+                key
+                for key in listings
+                if key not in stored or stored[key].content_hash != hashes[key]
+            ]
+            unchanged = [
+                key for key in stored if stored[key].content_hash == hashes[key]
+            ]
+
+            stats.listings_changed += len(changed)
+            stats.listings_unchanged += len(unchanged)
+            stats.records_saved += self.service.save_products(
+                session, supermarket, [listings[key] for key in changed]
+            )
+            for key in changed:
+                upsert_fingerprint(
+                    session, supermarket, key, hashes[key], stored.get(key)
+                )
+            touch_fingerprints(session, supermarket, unchanged)
+            upsert_fingerprint(
+                session,
+                supermarket,
+                page_key,
+                page_content_hash,
+                get_fingerprints(session, supermarket, [page_key]).get(page_key),
+                listing_keys=list(listings),
+            )
+
+
+# Module-level runner for command line usage
+async def main():
+    """Run an incremental catalog crawl of every store."""
+    crawler = CatalogCrawler()
+    try:
+        results = await crawler.crawl()
+        for name, stats in results.items():
+            logger.info(f"{name}: {stats.to_dict()}")
+    finally:
+        await close_browser_pool()
+        await close_http_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
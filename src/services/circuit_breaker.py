@@ -0,0 +1,135 @@
+"""Per-supermarket circuit breakers that skip stores which keep failing."""
+
+import time
+
+from loguru import logger
+
+from src.config.settings import get_settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Circuit breaker for one supermarket.
+
+    Opens after `failure_threshold` consecutive failures (errors or empty
+    results) and then rejects calls until `reset_timeout` seconds have
+    passed. After that a single half-open probe is let through: success
+    closes the circuit, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int | None = None,
+        reset_timeout: float | None = None,
+    ):
+        """Initialize a closed breaker."""
+        settings = get_settings()
+        self.name = name
+        self.failure_threshold = (
+            failure_threshold or settings.circuit_breaker_failure_threshold
+        )
+        self.reset_timeout = (
+            reset_timeout
+            if reset_timeout is not None
+            else settings.circuit_breaker_reset_timeout
+        )
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self.last_failure: str | None = None
+        self.failures = 0
+        self.successes = 0
+        self.rejected = 0
+        self._probing = False
+
+    def allow_request(self) -> bool:
+        """Check whether a call may go ahead, claiming the probe if half-open."""
+        if self.state == OPEN and self.retry_in() == 0:
+            self.state = HALF_OPEN
+            logger.info(f"{self.name}: circuit half-open, probing")
+
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Record a successful call and close the circuit."""
+        if self.state != CLOSED:
+            logger.info(f"{self.name}: circuit closed")
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.successes += 1
+        self._probing = False
+
+    def record_failure(self, reason: str) -> None:
+        """Record a failed call, opening the circuit if needed."""
+        self.consecutive_failures += 1
+        self.failures += 1
+        self.last_failure = reason
+        self._probing = False
+
+        tripped = self.consecutive_failures >= self.failure_threshold
+        if self.state == HALF_OPEN or tripped:
+            if self.state != OPEN:
+                logger.warning(
+                    f"{self.name}: circuit open after {self.consecutive_failures} "
+                    f"failures ({reason})"
+                )
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Give back a half-open probe that ended without an outcome."""
+        self._probing = False
+
+    def reset(self) -> None:
+        """Close the circuit manually."""
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def retry_in(self) -> float:
+        """Get the seconds until an open circuit lets a probe through."""
+        if self.state != OPEN or self.opened_at is None:
+            return 0.0
+        elapsed = time.monotonic() - self.opened_at
+        return max(0.0, self.reset_timeout - elapsed)
+
+    def snapshot(self) -> dict:
+        """Get the breaker state as a plain dict."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in": round(self.retry_in(), 1),
+            "last_failure": self.last_failure,
+            "failures": self.failures,
+            "successes": self.successes,
+            "rejected": self.rejected,
+        }
+
+
+# Process-wide breakers per supermarket
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(supermarket: str) -> CircuitBreaker:
+    """Get or create the circuit breaker for a supermarket."""
+    if supermarket not in _breakers:
+        _breakers[supermarket] = CircuitBreaker(supermarket)
+    return _breakers[supermarket]
+
+
+def get_all_circuit_breakers() -> dict[str, dict]:
+    """Get the state of all circuit breakers."""
+    return {name: breaker.snapshot() for name, breaker in _breakers.items()}
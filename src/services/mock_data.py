@@ -100,7 +100,7 @@ MOCK_PRODUCTS: dict[str, list[dict]] = {
 }
 
 
-def get_mock_results(query: str) -> dict[str, list[ProductSearch]]:
+async def get_mock_results(query: str) -> dict[str, list[ProductSearch]]:
     """Get search results - real AH API + mock data for others."""
     query_lower = query.lower().strip()
 
@@ -118,7 +118,7 @@ def get_mock_results(query: str) -> dict[str, list[ProductSearch]]:
     if AH_API_AVAILABLE:
         try:
             ah_scraper = AlbertHeijnAPIScraper()
-            ah_results = ah_scraper.search_product(query, limit=10)
+            ah_results = await ah_scraper.search_product(query, limit=10)
             results["albert_heijn"] = ah_results
             logger.info(f"AH API: {len(ah_results)} real products for '{query}'")
         except Exception as e:
@@ -1,14 +1,21 @@
 """Price service for price comparison functionality."""
 
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
 from loguru import logger
 
 from src.database import get_db
+from src.config.settings import get_settings
 from src.database.crud import (
     get_all_supermarkets,
     search_products,
     get_latest_prices,
+    log_search,
 )
-from src.services.scraper_service import ScraperService
+from src.services.scraper_service import STATUS_PARTIAL, ScraperService
+from src.services.search_cache import normalize_query
 from src.services.product_matcher import ProductMatcherService
 from src.services.cost_calculator import CostCalculatorService
 from src.models.supermarket import Supermarket
@@ -24,19 +31,107 @@ class PriceService:
         self.scraper_service = ScraperService()
         self.matcher_service = ProductMatcherService()
         self.calculator_service = CostCalculatorService()
+        self.log_searches = get_settings().search_log_enabled
+
+    def _log_search(self, query: str) -> None:
+        """Record a user search so popular queries are kept fresh.
+
+        Blocks on the database, so async callers run it in a thread.
+        """
+        if not self.log_searches:
+            return
+        try:
+            with get_db().get_session() as session:
+                log_search(session, normalize_query(query))
+        except Exception as e:
+            logger.debug(f"Could not log search '{query}': {e}")
 
     async def search_and_compare(
-        self, query: str
+        self, query: str, force_refresh: bool = False
     ) -> dict[str, dict]:
         """Search for a product and compare prices across supermarkets."""
+        await asyncio.to_thread(self._log_search, query)
+
         # Search all supermarkets
-        results = await self.scraper_service.search_all_supermarkets(query)
+        results = await self.scraper_service.search_all_supermarkets(
+            query, force_refresh=force_refresh
+        )
 
         # Match products across stores
         comparison = self.matcher_service.get_price_comparison(query, results)
 
         return comparison
 
+    async def search_and_compare_with_status(
+        self,
+        query: str,
+        force_refresh: bool = False,
+        deadline: float | None = None,
+    ) -> tuple[dict[str, dict], dict[str, str]]:
+        """Search and compare within a deadline, with the status per store."""
+        await asyncio.to_thread(self._log_search, query)
+        outcome = await self.scraper_service.search_all_with_status(
+            query, force_refresh=force_refresh, deadline=deadline
+        )
+        comparison = self.matcher_service.get_price_comparison(
+            query, outcome.results
+        )
+        return comparison, outcome.status
+
+    async def stream_search(
+        self,
+        query: str,
+        force_refresh: bool = False,
+        deadline: float | None = None,
+    ) -> AsyncIterator[dict]:
+        """Yield each store's matched result as it arrives, then a summary.
+
+        While a store is still fetching further result pages, its match over
+        the results so far is yielded as a "partial" event.
+        """
+        await asyncio.to_thread(self._log_search, query)
+        start = time.monotonic()
+        status: dict[str, str] = {}
+        cheapest: dict | None = None
+
+        async for supermarket, store_status, products in (
+            self.scraper_service.iter_search_results(
+                query, force_refresh, deadline, partial=True
+            )
+        ):
+            result = self.matcher_service.get_store_comparison(query, products)
+            if store_status == STATUS_PARTIAL:
+                yield {
+                    "event": "partial",
+                    "supermarket": supermarket,
+                    "status": store_status,
+                    "result": result,
+                    "elapsed": round(time.monotonic() - start, 3),
+                }
+                continue
+
+            status[supermarket] = store_status
+            if result and (
+                cheapest is None or result["best_price"] < cheapest["best_price"]
+            ):
+                cheapest = {"supermarket": supermarket, **result}
+
+            yield {
+                "event": "store",
+                "supermarket": supermarket,
+                "status": store_status,
+                "result": result,
+                "elapsed": round(time.monotonic() - start, 3),
+            }
+
+        yield {
+            "event": "summary",
+            "query": query,
+            "status": status,
+            "cheapest": cheapest,
+            "elapsed": round(time.monotonic() - start, 3),
+        }
+
     async def compare_shopping_list(
         self,
         items: list[dict],
@@ -129,11 +224,9 @@ class PriceService:
         self, items: list[dict], has_bonus_card: bool = True
     ) -> str | None:
         """Get the name of the cheapest supermarket for a shopping list."""
-        import asyncio
+        from src.scrapers.browser_pool import run_sync
 
-        options = asyncio.run(
-            self.compare_shopping_list(items, has_bonus_card)
-        )
+        options = run_sync(self.compare_shopping_list(items, has_bonus_card))
 
         if options:
             return options[0].supermarket
@@ -113,18 +113,26 @@ class ProductMatcherService:
 
         comparison = {}
         for supermarket, match in matches.items():
-            if match:
-                comparison[supermarket] = {
-                    "name": match.name,
-                    "regular_price": match.regular_price,
-                    "sale_price": match.sale_price,
-                    "bonus_card_price": match.bonus_card_price,
-                    "best_price": match.bonus_card_price
-                    or match.sale_price
-                    or match.regular_price,
-                    "url": match.url,
-                }
-            else:
-                comparison[supermarket] = None
+            comparison[supermarket] = self._comparison_entry(match) if match else None
 
         return comparison
+
+    def get_store_comparison(
+        self, query: str, products: list[ProductSearch]
+    ) -> dict | None:
+        """Get the price comparison entry for one supermarket's results."""
+        match = self.find_best_match(query, products)
+        return self._comparison_entry(match) if match else None
+
+    def _comparison_entry(self, match: ProductSearch) -> dict:
+        """Get the comparison fields of a matched product."""
+        return {
+            "name": match.name,
+            "regular_price": match.regular_price,
+            "sale_price": match.sale_price,
+            "bonus_card_price": match.bonus_card_price,
+            "best_price": match.bonus_card_price
+            or match.sale_price
+            or match.regular_price,
+            "url": match.url,
+        }
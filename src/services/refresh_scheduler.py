@@ -0,0 +1,344 @@
+"""Scheduler that keeps popular searches and favorites fresh."""
+
+import asyncio
+import heapq
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from loguru import logger
+
+from src.config.constants import SUPERMARKETS
+from src.config.settings import get_settings
+from src.database import DatabaseManager, get_db
+from src.database.crud import (
+    enqueue_scrape_job,
+    get_all_favorites,
+    get_latest_price_record,
+    get_popular_queries,
+    get_supermarket_by_name,
+)
+from src.models.product import ProductSearch
+from src.scrapers.browser_pool import close_browser_pool
+from src.scrapers.http_client import close_http_client
+from src.scrapers.rate_limiter import TokenBucket
+from src.services.scraper_service import STATUS_OK, ScraperService
+from src.services.search_cache import normalize_query
+
+KIND_QUERY = "query"
+KIND_PRODUCT = "product"
+
+# Staleness given to items that have never been refreshed
+MAX_STALENESS = 10.0
+
+
+@dataclass(frozen=True)
+class RefreshJob:
+    """A search query or product page to refresh at one supermarket."""
+
+    supermarket: str
+    kind: str
+    target: str
+    popularity: float
+
+    @property
+    def key(self) -> tuple[str, str, str]:
+        """Get the key refresh times are tracked under."""
+        return self.supermarket, self.kind, self.target
+
+
+class RefreshScheduler:
+    """Refreshes hot items before they go stale, leaving cold ones alone.
+
+    Every round collects candidate jobs from the search log and favorites,
+    drops items below the popularity threshold and items refreshed within
+    `scheduler_refresh_ratio` of their store's cache TTL, and runs the rest
+    most valuable first (popularity times staleness). Each store has an
+    hourly refresh budget and at most `scheduler_concurrency` jobs run at
+    once.
+    """
+
+    def __init__(
+        self,
+        service: ScraperService | None = None,
+        db_manager: DatabaseManager | None = None,
+    ):
+        """Initialize with the scraper service and database to use."""
+        settings = get_settings()
+        self.service = service or ScraperService()
+        self.db_manager = db_manager or get_db()
+        self.interval = settings.scheduler_interval
+        self.concurrency = settings.scheduler_concurrency
+        self.store_budget = settings.scheduler_store_budget
+        self.max_jobs = settings.scheduler_max_jobs
+        self.refresh_ratio = settings.scheduler_refresh_ratio
+        self.popularity_days = settings.scheduler_popularity_days
+        self.min_popularity = settings.scheduler_min_popularity
+        self.favorite_weight = settings.scheduler_favorite_weight
+        self.use_queue = settings.scheduler_use_queue
+        self.max_attempts = settings.worker_max_attempts
+        self.refreshed: dict[tuple[str, str, str], float] = {}
+        self.budgets: dict[str, TokenBucket] = {}
+        self.scheduler: AsyncIOScheduler | None = None
+        self.rounds = 0
+        self.jobs_refreshed = 0
+        self.jobs_failed = 0
+        self.budget_skips = 0
+        self.last_round: dict | None = None
+
+    def collect_jobs(self) -> list[RefreshJob]:
+        """Get a refresh job for every hot query and favorite product."""
+        since = datetime.utcnow() - timedelta(days=self.popularity_days)
+        popularity: dict[str, float] = defaultdict(float)
+        products: dict[tuple[str, str], float] = defaultdict(float)
+
+        with self.db_manager.get_session() as session:
+            for query, searches in get_popular_queries(session, since, limit=500):
+                popularity[normalize_query(query)] += searches
+
+            for favorite in get_all_favorites(session):
+                popularity[normalize_query(favorite.user_query)] += self.favorite_weight
+                for name, product_id in (favorite.matched_product_ids or {}).items():
+                    supermarket = get_supermarket_by_name(session, name)
+                    if supermarket is None or name not in self.service.scrapers:
+                        continue
+                    record = get_latest_price_record(
+                        session, product_id, supermarket.id
+                    )
+                    if record is not None:
+                        products[(name, record.url)] += self.favorite_weight
+
+        jobs = [
+            RefreshJob(name, KIND_QUERY, query, score)
+            for query, score in popularity.items()
+            if query and score >= self.min_popularity
+            for name in self.service.scrapers
+        ]
+        jobs.extend(
+            RefreshJob(name, KIND_PRODUCT, url, score)
+            for (name, url), score in products.items()
+            if score >= self.min_popularity
+        )
+        return jobs
+
+    def staleness(self, job: RefreshJob, now: float | None = None) -> float:
+        """Get a job's age as a fraction of its store's cache TTL.
+
+        Results cached by a user search count as a refresh too.
+        """
+        now = time.monotonic() if now is None else now
+        ttl = SUPERMARKETS[job.supermarket]["cache_ttl"]
+        ages = []
+        if job.key in self.refreshed:
+            ages.append(now - self.refreshed[job.key])
+
+        cache = self.service.cache
+        if job.kind == KIND_QUERY and cache is not None:
+            remaining = cache.expires_in(job.supermarket, job.target)
+            if remaining is not None:
+                ages.append(ttl - remaining)
+
+        if not ages:
+            return MAX_STALENESS
+        return min(MAX_STALENESS, max(0.0, min(ages)) / ttl)
+
+    def plan(
+        self, jobs: list[RefreshJob], now: float | None = None
+    ) -> list[RefreshJob]:
+        """Pick the due jobs in priority order within each store's budget."""
+        now = time.monotonic() if now is None else now
+        queue: list[tuple[float, int, RefreshJob]] = []
+        for order, job in enumerate(jobs):
+            staleness = self.staleness(job, now)
+            if staleness >= self.refresh_ratio:
+                heapq.heappush(queue, (-job.popularity * staleness, order, job))
+
+        selected: list[RefreshJob] = []
+        while queue and len(selected) < self.max_jobs:
+            _, _, job = heapq.heappop(queue)
+            if self._budget(job.supermarket).try_acquire():
+                selected.append(job)
+            else:
+                self.budget_skips += 1
+        return selected
+
+    async def run_once(self) -> dict:
+        """Run one planning round and refresh the selected jobs."""
+        start = time.monotonic()
+        try:
+            # Database reads block, so they run off the event loop
+            jobs = await asyncio.to_thread(self.collect_jobs)
+        except Exception as e:
+            logger.error(f"Could not collect refresh jobs: {e}")
+            return {}
+
+        selected = self.plan(jobs)
+        if self.use_queue:
+            return await asyncio.to_thread(self._enqueue, jobs, selected, start)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(job: RefreshJob) -> bool:
+            async with semaphore:
+                return await self._refresh(job)
+
+        outcomes = await asyncio.gather(*(run(job) for job in selected))
+        refreshed = sum(outcomes)
+
+        self.rounds += 1
+        self.jobs_refreshed += refreshed
+        self.jobs_failed += len(selected) - refreshed
+        self.last_round = {
+            "candidates": len(jobs),
+            "selected": len(selected),
+            "refreshed": refreshed,
+            "failed": len(selected) - refreshed,
+            "elapsed": round(time.monotonic() - start, 3),
+        }
+        if selected:
+            logger.info(
+                f"Refreshed {refreshed}/{len(selected)} items "
+                f"({len(jobs)} hot candidates)"
+            )
+        return self.last_round
+
+    def _enqueue(
+        self, jobs: list[RefreshJob], selected: list[RefreshJob], start: float
+    ) -> dict:
+        """Hand the selected jobs to worker processes through the job table."""
+        try:
+            with self.db_manager.get_session() as session:
+                for job in selected:
+                    enqueue_scrape_job(
+                        session,
+                        job.supermarket,
+                        job.target,
+                        kind=job.kind,
+                        priority=round(job.popularity),
+                        max_attempts=self.max_attempts,
+                    )
+        except Exception as e:
+            logger.error(f"Could not enqueue refresh jobs: {e}")
+            return {}
+
+        now = time.monotonic()
+        for job in selected:
+            self.refreshed[job.key] = now
+
+        self.rounds += 1
+        self.last_round = {
+            "candidates": len(jobs),
+            "selected": len(selected),
+            "enqueued": len(selected),
+            "elapsed": round(time.monotonic() - start, 3),
+        }
+        if selected:
+            logger.info(f"Queued {len(selected)} refresh jobs for workers")
+        return self.last_round
+
+    async def _refresh(self, job: RefreshJob) -> bool:
+        """Scrape one job and save its prices."""
+        try:
+            if job.kind == KIND_QUERY:
+                status, products = await self.service.search_store(
+                    job.supermarket, job.target, force_refresh=True
+                )
+                if status != STATUS_OK:
+                    logger.debug(
+                        f"{job.supermarket}: refresh of '{job.target}' {status}"
+                    )
+                    return False
+            else:
+                scraper = self.service.scrapers[job.supermarket]
+                product = await scraper.get_product_details(job.target)
+                if product is None:
+                    return False
+                products = [product]
+
+            await asyncio.to_thread(self._save, job.supermarket, products)
+        except Exception as e:
+            logger.error(f"{job.supermarket}: refresh of '{job.target}' failed: {e}")
+            return False
+
+        self.refreshed[job.key] = time.monotonic()
+        return True
+
+    def _save(self, supermarket: str, products: list[ProductSearch]) -> None:
+        """Save a refresh's products as price records."""
+        with self.db_manager.get_session() as session:
+            self.service.save_products(session, supermarket, products)
+
+    def _budget(self, supermarket: str) -> TokenBucket:
+        """Get the hourly refresh budget of a store."""
+        if supermarket not in self.budgets:
+            self.budgets[supermarket] = TokenBucket(
+                rate=self.store_budget / 3600,
+                capacity=max(1, self.store_budget // 4),
+            )
+        return self.budgets[supermarket]
+
+    def start(self) -> None:
+        """Start planning rounds on the running event loop."""
+        if self.scheduler is not None:
+            return
+        self.scheduler = AsyncIOScheduler()
+        self.scheduler.add_job(
+            self.run_once,
+            "interval",
+            seconds=self.interval,
+            id="refresh",
+            max_instances=1,
+            coalesce=True,
+            next_run_time=datetime.now(),
+        )
+        self.scheduler.start()
+        logger.info(f"Refresh scheduler started, planning every {self.interval}s")
+
+    def shutdown(self) -> None:
+        """Stop planning new rounds."""
+        if self.scheduler is not None:
+            self.scheduler.shutdown(wait=False)
+            self.scheduler = None
+
+    def stats(self) -> dict:
+        """Get scheduler statistics."""
+        return {
+            "running": self.scheduler is not None,
+            "rounds": self.rounds,
+            "jobs_refreshed": self.jobs_refreshed,
+            "jobs_failed": self.jobs_failed,
+            "budget_skips": self.budget_skips,
+            "tracked_items": len(self.refreshed),
+            "last_round": self.last_round,
+        }
+
+
+# Global scheduler instance
+_refresh_scheduler: RefreshScheduler | None = None
+
+
+def get_refresh_scheduler() -> RefreshScheduler:
+    """Get or create the global refresh scheduler."""
+    global _refresh_scheduler
+    if _refresh_scheduler is None:
+        _refresh_scheduler = RefreshScheduler()
+    return _refresh_scheduler
+
+
+# Module-level runner for command line usage
+async def main():
+    """Run the refresh scheduler until interrupted."""
+    scheduler = get_refresh_scheduler()
+    scheduler.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        scheduler.shutdown()
+        await close_browser_pool()
+        await close_http_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
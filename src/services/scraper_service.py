@@ -1,24 +1,76 @@
 """Scraper service for orchestrating supermarket scrapers."""
 
 import asyncio
-from typing import Any
+import inspect
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 from loguru import logger
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 
-from src.scrapers import (
-    AlbertHeijnScraper,
-    JumboScraper,
-    DirkScraper,
-    PlusScraper,
-    FlinkScraper,
-    PicnicScraper,
-)
+from src.scrapers import ConfiguredScraper
+from src.scrapers.ah_api import AlbertHeijnAPIScraper
+from src.scrapers.browser_pool import close_browser_pool
+from src.scrapers.http_client import close_http_client
+from src.scrapers.pagination import ListingPage, PageCallback
+from src.scrapers.timing import log_timing_summary
+from src.config.constants import SUPERMARKETS
+from src.config.settings import get_settings
 from src.models.product import ProductSearch
 from src.database import get_db
 from src.database.crud import (
     get_or_create_product,
     create_price_record,
     get_supermarket_by_name,
+    upsert_supermarket,
 )
+from src.services.circuit_breaker import get_circuit_breaker
+from src.services.search_cache import get_search_cache, normalize_query
+from src.services.single_flight import get_search_flights
+
+if TYPE_CHECKING:
+    from src.services.catalog_crawler import CrawlStats
+
+
+# Per-store outcomes of a search
+STATUS_OK = "ok"
+STATUS_EMPTY = "empty"
+STATUS_ERROR = "error"
+STATUS_CIRCUIT_OPEN = "circuit_open"
+STATUS_TIMED_OUT = "timed_out"
+STATUS_PARTIAL = "partial"  # more result pages are still loading
+
+# Supermarket columns filled from SUPERMARKETS for stores not yet in the database
+SUPERMARKET_COLUMNS = (
+    "name",
+    "display_name",
+    "base_url",
+    "delivery_cost",
+    "free_delivery_threshold",
+    "pickup_available",
+    "pickup_cost",
+    "has_bonus_card",
+    "bonus_card_name",
+)
+
+# Stragglers left running after a deadline; kept so they are not collected
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _reports_pages(scraper: Any) -> bool:
+    """Check whether a scraper can pass each result page to a callback."""
+    return "on_page" in inspect.signature(scraper.search_product).parameters
+
+
+@dataclass
+class SearchOutcome:
+    """Results of a multi-store search with the outcome for each store."""
+
+    results: dict[str, list[ProductSearch]]
+    status: dict[str, str]
+    elapsed: float
 
 
 class ScraperService:
@@ -26,50 +78,271 @@ class ScraperService:
 
     def __init__(self):
         """Initialize scraper service with all scrapers."""
-        self.scrapers = {
-            "albert_heijn": AlbertHeijnScraper(),
-            "jumbo": JumboScraper(),
-            "dirk": DirkScraper(),
-            "plus": PlusScraper(),
-            "flink": FlinkScraper(),
-            "picnic": PicnicScraper(),
-        }
+        settings = get_settings()
+        self.cache = get_search_cache() if settings.search_cache_enabled else None
+        self.flights = get_search_flights()
+        self.use_breakers = settings.circuit_breaker_enabled
+        self.deadline = settings.search_deadline
+        self.finish_in_background = settings.search_finish_in_background
+        self.scrapers = {name: ConfiguredScraper(name) for name in SUPERMARKETS}
+        if settings.ah_use_api:
+            self.scrapers["albert_heijn"] = AlbertHeijnAPIScraper()
 
     async def search_all_supermarkets(
-        self, query: str
+        self,
+        query: str,
+        force_refresh: bool = False,
+        deadline: float | None = None,
     ) -> dict[str, list[ProductSearch]]:
         """Search for products in all supermarkets concurrently."""
+        outcome = await self.search_all_with_status(query, force_refresh, deadline)
+        return outcome.results
+
+    async def search_all_with_status(
+        self,
+        query: str,
+        force_refresh: bool = False,
+        deadline: float | None = None,
+    ) -> SearchOutcome:
+        """Search all supermarkets within a latency budget.
+
+        Returns whatever finished within the deadline, with a status per
+        store; see iter_search_results.
+        """
+        start = time.monotonic()
+        outcomes: dict[str, tuple[str, list[ProductSearch]]] = {}
+        async for name, status, products in self.iter_search_results(
+            query, force_refresh, deadline
+        ):
+            outcomes[name] = (status, products)
+
+        # Keep the configured store order
+        results: dict[str, list[ProductSearch]] = {}
+        statuses: dict[str, str] = {}
+        for name in self.scrapers:
+            statuses[name], results[name] = outcomes[name]
+            logger.info(f"{name}: {len(results[name])} results ({statuses[name]})")
+
+        return SearchOutcome(
+            results=results, status=statuses, elapsed=time.monotonic() - start
+        )
+
+    async def iter_search_results(
+        self,
+        query: str,
+        force_refresh: bool = False,
+        deadline: float | None = None,
+        partial: bool = False,
+    ) -> AsyncIterator[tuple[str, str, list[ProductSearch]]]:
+        """Yield (supermarket, status, results) as each store finishes.
+
+        Stores still running after `deadline` seconds (the search_deadline
+        setting by default; 0 waits for every store) are yielded as timed
+        out and, if search_finish_in_background is set, keep running to
+        warm the cache. Otherwise they are cancelled.
+
+        With `partial`, a store still fetching further result pages also
+        yields its results so far as STATUS_PARTIAL whenever a page lands.
+        """
+        budget = self.deadline if deadline is None else deadline
+        deadline_at = time.monotonic() + budget if budget else None
+
+        pages: asyncio.Queue[str] = asyncio.Queue()
+        so_far: dict[str, list[ProductSearch]] = {}
+
+        def page_callback(name: str) -> PageCallback:
+            def on_page(products: list[ProductSearch]) -> None:
+                so_far.setdefault(name, []).extend(products)
+                pages.put_nowait(name)
+
+            return on_page
+
         tasks = {
-            name: asyncio.create_task(scraper.search_product(query))
-            for name, scraper in self.scrapers.items()
+            asyncio.create_task(
+                self.search_store(
+                    name, query, force_refresh, page_callback(name) if partial else None
+                )
+            ): name
+            for name in self.scrapers
         }
+        pending = set(tasks)
+        reported: dict[str, int] = {}
+        next_page: asyncio.Task | None = None
+        try:
+            while pending:
+                timeout = None
+                if deadline_at is not None:
+                    timeout = max(0.0, deadline_at - time.monotonic())
+                if partial and next_page is None:
+                    next_page = asyncio.create_task(pages.get())
+                done, _ = await asyncio.wait(
+                    pending | {next_page} if next_page else pending,
+                    timeout=timeout,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    break
 
-        results: dict[str, list[ProductSearch]] = {}
+                for task in done & pending:
+                    pending.discard(task)
+                    name = tasks[task]
+                    try:
+                        status, products = task.result()
+                    except Exception as e:
+                        logger.error(f"Error searching {name}: {e}")
+                        status, products = STATUS_ERROR, []
+                    yield name, status, products
 
-        for name, task in tasks.items():
-            try:
-                result = await task
-                results[name] = result
-                logger.info(f"{name}: {len(result)} results")
-            except Exception as e:
-                logger.error(f"Error searching {name}: {e}")
-                results[name] = []
+                if next_page in done:
+                    name = next_page.result()
+                    next_page = None
+                    # A finished store has already reported all its results
+                    still_running = any(tasks[task] == name for task in pending)
+                    if still_running and len(so_far[name]) > reported.get(name, 0):
+                        reported[name] = len(so_far[name])
+                        yield name, STATUS_PARTIAL, list(so_far[name])
 
-        return results
+            if pending:
+                logger.info(
+                    f"Search deadline of {budget}s passed for '{query}', "
+                    f"timed out: {', '.join(sorted(tasks[t] for t in pending))}"
+                )
+            for task in pending:
+                yield tasks[task], STATUS_TIMED_OUT, []
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+            for task in pending:
+                if self.finish_in_background:
+                    _background_tasks.add(task)
+                    task.add_done_callback(_background_tasks.discard)
+                else:
+                    task.cancel()
 
     async def search_supermarket(
-        self, supermarket: str, query: str
+        self, supermarket: str, query: str, force_refresh: bool = False
     ) -> list[ProductSearch]:
         """Search for products in a specific supermarket."""
+        _, results = await self.search_store(supermarket, query, force_refresh)
+        return results
+
+    async def search_store(
+        self,
+        supermarket: str,
+        query: str,
+        force_refresh: bool = False,
+        on_page: PageCallback | None = None,
+    ) -> tuple[str, list[ProductSearch]]:
+        """Search one supermarket and report the outcome status.
+
+        Results are served from the search cache unless `force_refresh`
+        is set; fresh non-empty results are stored in it. Concurrent
+        searches for the same store and query share a single scrape, whose
+        result pages are passed to the `on_page` of the search that started
+        it.
+        """
         if supermarket not in self.scrapers:
             logger.error(f"Unknown supermarket: {supermarket}")
-            return []
+            return STATUS_ERROR, []
+
+        if self.cache is not None and not force_refresh:
+            cached = self.cache.get(supermarket, query)
+            if cached is not None:
+                logger.debug(f"{supermarket}: cache hit for '{query}'")
+                return STATUS_OK, cached
+
+        status, results = await self.flights.do(
+            (supermarket, normalize_query(query)),
+            lambda: self._scrape(supermarket, query, on_page),
+        )
+        return status, list(results)
+
+    async def _scrape(
+        self, supermarket: str, query: str, on_page: PageCallback | None = None
+    ) -> tuple[str, list[ProductSearch]]:
+        """Run a scraper and cache its non-empty results.
+
+        Stores whose circuit breaker is open are skipped immediately;
+        errors and empty results count as failures for the breaker.
+        """
+        breaker = get_circuit_breaker(supermarket) if self.use_breakers else None
+        if breaker and not breaker.allow_request():
+            logger.debug(f"{supermarket}: circuit open, skipping '{query}'")
+            return STATUS_CIRCUIT_OPEN, []
 
+        scraper = self.scrapers[supermarket]
         try:
-            return await self.scrapers[supermarket].search_product(query)
+            if on_page is not None and _reports_pages(scraper):
+                results = await scraper.search_product(query, on_page=on_page)
+            else:
+                results = await scraper.search_product(query)
+        except asyncio.CancelledError:
+            if breaker:
+                breaker.release()
+            raise
         except Exception as e:
             logger.error(f"Error searching {supermarket}: {e}")
-            return []
+            if breaker:
+                breaker.record_failure(f"error: {e}")
+            return STATUS_ERROR, []
+
+        if breaker:
+            if results:
+                breaker.record_success()
+            else:
+                breaker.record_failure("empty")
+
+        # Empty results are usually failed scrapes, so they are not cached
+        if self.cache is not None and results:
+            self.cache.set(
+                supermarket, query, results, SUPERMARKETS[supermarket]["cache_ttl"]
+            )
+        return (STATUS_OK if results else STATUS_EMPTY), results
+
+    async def fetch_listing_page(
+        self, supermarket: str, query: str, index: int = 0
+    ) -> tuple[str, ListingPage | None]:
+        """Fetch one raw result page of a search, bypassing the cache.
+
+        Used by the catalog crawler. The store's circuit breaker applies as
+        for searches, but a missing later page is just the end of the
+        results, not a failure.
+        """
+        if supermarket not in self.scrapers:
+            logger.error(f"Unknown supermarket: {supermarket}")
+            return STATUS_ERROR, None
+
+        breaker = get_circuit_breaker(supermarket) if self.use_breakers else None
+        if breaker and not breaker.allow_request():
+            logger.debug(f"{supermarket}: circuit open, skipping '{query}'")
+            return STATUS_CIRCUIT_OPEN, None
+
+        try:
+            page = await self.scrapers[supermarket].fetch_listing_page(query, index)
+        except asyncio.CancelledError:
+            if breaker:
+                breaker.release()
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching {supermarket} page {index + 1}: {e}")
+            if breaker:
+                breaker.record_failure(f"error: {e}")
+            return STATUS_ERROR, None
+
+        if breaker:
+            if page is not None:
+                breaker.record_success()
+            elif index == 0:
+                breaker.record_failure("empty")
+            else:
+                breaker.release()
+        return (STATUS_OK if page is not None else STATUS_EMPTY), page
+
+    async def parse_listing_page(
+        self, supermarket: str, page: ListingPage
+    ) -> tuple[list[ProductSearch], int | None]:
+        """Parse a page from fetch_listing_page into results and its total."""
+        return await self.scrapers[supermarket].parse_listing_page(page)
 
     def save_search_results(
         self, results: dict[str, list[ProductSearch]]
@@ -80,43 +353,78 @@ class ScraperService:
 
         with db_manager.get_session() as session:
             for supermarket_name, products in results.items():
+                saved_count += self.save_products(session, supermarket_name, products)
+
+        logger.info(f"Saved {saved_count} price records")
+        return saved_count
+
+    def save_products(
+        self, session: Session, supermarket_name: str, products: list[ProductSearch]
+    ) -> int:
+        """Save one store's products as price records in a session."""
+        supermarket = get_supermarket_by_name(session, supermarket_name)
+        if not supermarket and supermarket_name in SUPERMARKETS:
+            config = SUPERMARKETS[supermarket_name]
+            try:
+                with session.begin_nested():
+                    supermarket = upsert_supermarket(
+                        session,
+                        **{column: config[column] for column in SUPERMARKET_COLUMNS},
+                    )
+            except IntegrityError:
+                # Another session saving the same store created it first
                 supermarket = get_supermarket_by_name(session, supermarket_name)
-                if not supermarket:
-                    logger.warning(f"Supermarket not found: {supermarket_name}")
-                    continue
+        if not supermarket:
+            logger.warning(f"Supermarket not found: {supermarket_name}")
+            return 0
 
-                for product_data in products:
-                    try:
-                        # Get or create product
-                        product = get_or_create_product(
-                            session,
-                            name=product_data.name,
-                            brand=product_data.brand,
-                            unit=product_data.unit,
-                            unit_size=product_data.unit_size,
-                            image_url=product_data.image_url,
-                        )
-
-                        # Create price record
-                        create_price_record(
-                            session,
-                            product_id=product.id,
-                            supermarket_id=supermarket.id,
-                            regular_price=product_data.regular_price,
-                            sale_price=product_data.sale_price,
-                            bonus_card_price=product_data.bonus_card_price,
-                            promotion_text=product_data.promotion_text,
-                            url=product_data.url,
-                        )
-                        saved_count += 1
+        saved_count = 0
+        for product_data in products:
+            try:
+                # Get or create product
+                product = get_or_create_product(
+                    session,
+                    name=product_data.name,
+                    brand=product_data.brand,
+                    unit=product_data.unit,
+                    unit_size=product_data.unit_size,
+                    image_url=product_data.image_url,
+                )
 
-                    except Exception as e:
-                        logger.error(f"Error saving product: {e}")
-                        continue
+                # Create price record
+                create_price_record(
+                    session,
+                    product_id=product.id,
+                    supermarket_id=supermarket.id,
+                    regular_price=product_data.regular_price,
+                    sale_price=product_data.sale_price,
+                    bonus_card_price=product_data.bonus_card_price,
+                    promotion_text=product_data.promotion_text,
+                    url=product_data.url,
+                )
+                saved_count += 1
+
+            except Exception as e:
+                logger.error(f"Error saving product: {e}")
+                continue
 
-        logger.info(f"Saved {saved_count} price records")
         return saved_count
 
+    async def crawl_catalog(
+        self,
+        supermarkets: list[str] | None = None,
+        seeds: list[str] | None = None,
+        restart: bool = False,
+    ) -> dict[str, "CrawlStats"]:
+        """Crawl store catalogs, persisting only listings that changed.
+
+        See CatalogCrawler; interrupted crawls resume from their checkpoint
+        unless `restart` is set.
+        """
+        from src.services.catalog_crawler import CatalogCrawler
+
+        return await CatalogCrawler(self).crawl(supermarkets, seeds, restart)
+
 
 # Module-level runner for command line usage
 async def main():
@@ -126,10 +434,15 @@ async def main():
     # Example: search for common products
     queries = ["melk", "brood", "kaas", "eieren", "appels"]
 
-    for query in queries:
-        logger.info(f"Searching for: {query}")
-        results = await service.search_all_supermarkets(query)
-        service.save_search_results(results)
+    try:
+        for query in queries:
+            logger.info(f"Searching for: {query}")
+            results = await service.search_all_supermarkets(query)
+            service.save_search_results(results)
+    finally:
+        log_timing_summary()
+        await close_browser_pool()
+        await close_http_client()
 
 
 if __name__ == "__main__":
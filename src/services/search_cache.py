@@ -0,0 +1,143 @@
+"""In-process TTL + LRU cache for scraper search results."""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from src.config.settings import get_settings
+from src.models.product import ProductSearch
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query for use as a cache key."""
+    return " ".join(query.lower().split())
+
+
+@dataclass
+class CacheEntry:
+    """Cached search results for one supermarket and query."""
+
+    products: list[ProductSearch]
+    expires_at: float
+    size: int
+
+
+class SearchCache:
+    """Bounded cache of search results keyed by (supermarket, query).
+
+    Entries expire after their TTL and the least recently used entries are
+    evicted once the entry count or estimated memory limit is exceeded.
+    """
+
+    def __init__(self, max_entries: int | None = None, max_bytes: int | None = None):
+        """Initialize an empty cache."""
+        settings = get_settings()
+        self.max_entries = max_entries or settings.search_cache_max_entries
+        self.max_bytes = max_bytes or settings.search_cache_max_bytes
+        self._entries: OrderedDict[tuple[str, str], CacheEntry] = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        """Get the number of cached entries."""
+        return len(self._entries)
+
+    def get(self, supermarket: str, query: str) -> list[ProductSearch] | None:
+        """Get cached results, or None on a miss."""
+        key = (supermarket, normalize_query(query))
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return list(entry.products)
+
+    def set(
+        self,
+        supermarket: str,
+        query: str,
+        products: list[ProductSearch],
+        ttl: float,
+    ) -> None:
+        """Cache results for `ttl` seconds."""
+        key = (supermarket, normalize_query(query))
+        if key in self._entries:
+            self._remove(key)
+
+        # Serialized size is a cheap, stable estimate of memory use
+        size = sum(len(p.model_dump_json()) for p in products)
+        if size > self.max_bytes:
+            return
+
+        self._entries[key] = CacheEntry(
+            products=list(products),
+            expires_at=time.monotonic() + ttl,
+            size=size,
+        )
+        self.total_bytes += size
+
+        while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def expires_in(self, supermarket: str, query: str) -> float | None:
+        """Get the seconds until cached results expire, or None if not cached."""
+        entry = self._entries.get((supermarket, normalize_query(query)))
+        if entry is None:
+            return None
+        remaining = entry.expires_at - time.monotonic()
+        return remaining if remaining > 0 else None
+
+    def invalidate(self, supermarket: str, query: str) -> None:
+        """Remove cached results for a supermarket and query."""
+        key = (supermarket, normalize_query(query))
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def stats(self) -> dict:
+        """Get cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        """Remove an entry and release its size."""
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry.size
+
+
+# Global search cache instance
+_search_cache: SearchCache | None = None
+
+
+def get_search_cache() -> SearchCache:
+    """Get or create the global search cache."""
+    global _search_cache
+    if _search_cache is None:
+        _search_cache = SearchCache()
+    return _search_cache
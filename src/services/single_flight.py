@@ -0,0 +1,89 @@
+"""Coalescing of concurrent identical scrapes into one shared task."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Runs at most one task per key; concurrent callers share its result.
+
+    Callers await the shared task through `asyncio.shield`, so a caller
+    that is cancelled stops waiting without cancelling the work for the
+    others. The task itself is cancelled once every caller waiting on it
+    has been cancelled.
+    """
+
+    def __init__(self):
+        """Initialize with no tasks in flight."""
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+        self._waiters: dict[asyncio.Task, int] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Run `func` for `key`, or join the task already running for it."""
+        task = self._tasks.get(key)
+
+        # Tasks are bound to their event loop and cannot be shared across loops
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(func())
+            self._tasks[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self.started += 1
+        else:
+            self.coalesced += 1
+            logger.debug(f"Joining in-flight task for {key}")
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        cancelled = False
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                # Nobody is interested in the result anymore
+                if cancelled and not task.done():
+                    logger.debug(f"Cancelling abandoned task for {key}")
+                    task.cancel()
+
+    def in_flight(self) -> int:
+        """Get the number of running tasks."""
+        return len(self._tasks)
+
+    def stats(self) -> dict:
+        """Get coalescing statistics."""
+        return {
+            "in_flight": len(self._tasks),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        """Remove a finished task so the next call starts fresh."""
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+        # Mark the exception as retrieved in case every caller gave up
+        if not task.cancelled():
+            task.exception()
+
+
+# Global single-flight group for searches
+_search_flights: SingleFlight | None = None
+
+
+def get_search_flights() -> SingleFlight:
+    """Get or create the global single-flight group for searches."""
+    global _search_flights
+    if _search_flights is None:
+        _search_flights = SingleFlight()
+    return _search_flights
@@ -1,9 +1,15 @@
 """Smart search service that finds both branded and house brand products."""
 
+import asyncio
+from collections.abc import AsyncIterator
+
 from loguru import logger
+from src.config.constants import SUPERMARKETS
+from src.config.settings import get_settings
 from src.models.product import ProductSearch
 from src.scrapers.ah_api import AlbertHeijnAPIScraper
 from src.services.mock_data import MOCK_PRODUCTS
+from src.services.search_cache import get_search_cache
 
 # Mapping of generic product names to search variations
 PRODUCT_VARIATIONS = {
@@ -21,6 +27,11 @@ PRODUCT_VARIATIONS = {
     "boter": ["boter", "ah boter", "roomboter", "margarine"],
 }
 
+# Search cache namespace for AH API variation results. They hold a fixed
+# number of API results, unlike the ScraperService entries for albert_heijn,
+# which follow scrape_result_target and may come from the HTML scraper.
+VARIATION_CACHE_NAMESPACE = "smart_search:albert_heijn"
+
 # House brand names per supermarket
 HOUSE_BRANDS = {
     "albert_heijn": ["AH", "AH Excellent", "AH Basic", "AH Biologisch"],
@@ -45,10 +56,66 @@ def get_search_variations(query: str) -> list[str]:
     return [query_lower, f"ah {query_lower}"]
 
 
-def smart_search(query: str) -> dict[str, list[ProductSearch]]:
+async def search_variations(
+    scraper: AlbertHeijnAPIScraper,
+    variations: list[str],
+    concurrency: int,
+    deadline: float,
+    semaphore: asyncio.Semaphore | None = None,
+) -> AsyncIterator[list[ProductSearch]]:
+    """
+    Search all variations concurrently and yield results as they arrive.
+
+    At most `concurrency` searches run at once, or as many as a shared
+    `semaphore` allows. Searches still pending after `deadline` seconds
+    are cancelled and their results dropped.
+    """
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(concurrency)
+    cache = get_search_cache() if get_settings().search_cache_enabled else None
+
+    async def search(variation: str) -> list[ProductSearch]:
+        if cache is not None:
+            cached = cache.get(VARIATION_CACHE_NAMESPACE, variation)
+            if cached is not None:
+                return cached
+
+        async with semaphore:
+            results = await scraper.search_product(variation, limit=10)
+
+        if cache is not None and results:
+            ttl = SUPERMARKETS["albert_heijn"]["cache_ttl"]
+            cache.set(VARIATION_CACHE_NAMESPACE, variation, results, ttl)
+        return results
+
+    tasks = [asyncio.create_task(search(variation)) for variation in variations]
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=deadline):
+            try:
+                yield await next_done
+            except TimeoutError:
+                raise
+            except Exception as e:
+                logger.debug(f"AH variation search failed: {e}")
+    except TimeoutError:
+        pending = sum(not task.done() for task in tasks)
+        logger.warning(
+            f"Smart search deadline of {deadline}s reached, "
+            f"dropped {pending} of {len(tasks)} variations"
+        )
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def smart_search(
+    query: str, semaphore: asyncio.Semaphore | None = None
+) -> dict[str, list[ProductSearch]]:
     """
     Smart search that finds both branded and house brand products.
     Returns results grouped by supermarket with cheapest options highlighted.
+
+    Pass a shared `semaphore` to bound AH requests across several searches.
     """
     all_results: dict[str, list[ProductSearch]] = {
         "albert_heijn": [],
@@ -65,22 +132,21 @@ def smart_search(query: str) -> dict[str, list[ProductSearch]]:
     variations = get_search_variations(query)
     logger.info(f"Smart search for '{query}' with variations: {variations}")
 
-    # Search AH API with all variations
-    try:
-        ah_scraper = AlbertHeijnAPIScraper()
-        for variation in variations:
-            try:
-                results = ah_scraper.search_product(variation, limit=10)
-                for product in results:
-                    # Avoid duplicates
-                    product_key = f"{product.name}_{product.regular_price}"
-                    if product_key not in seen_products["albert_heijn"]:
-                        seen_products["albert_heijn"].add(product_key)
-                        all_results["albert_heijn"].append(product)
-            except Exception as e:
-                logger.debug(f"AH search for '{variation}' failed: {e}")
-    except Exception as e:
-        logger.error(f"AH API not available: {e}")
+    # Search AH API with all variations at once, merging as results arrive
+    settings = get_settings()
+    async for results in search_variations(
+        AlbertHeijnAPIScraper(),
+        variations,
+        concurrency=settings.smart_search_concurrency,
+        deadline=settings.smart_search_deadline,
+        semaphore=semaphore,
+    ):
+        for product in results:
+            # Avoid duplicates
+            product_key = f"{product.name}_{product.regular_price}"
+            if product_key not in seen_products["albert_heijn"]:
+                seen_products["albert_heijn"].add(product_key)
+                all_results["albert_heijn"].append(product)
 
     # Add mock data for other supermarkets
     query_lower = query.lower().strip()
@@ -132,7 +198,7 @@ def get_cheapest_per_store(results: dict[str, list[ProductSearch]]) -> dict[str,
     return cheapest
 
 
-def calculate_basket_comparison(
+async def calculate_basket_comparison(
     shopping_list: list[dict],
     include_delivery: bool = True
 ) -> list[dict]:
@@ -154,13 +220,16 @@ def calculate_basket_comparison(
         for store in SUPERMARKETS
     }
 
+    # Search for all items concurrently, sharing one request limit
+    semaphore = asyncio.Semaphore(get_settings().smart_search_concurrency)
+    queries = [item.get("product_name", item.get("name", "")) for item in shopping_list]
+    all_results = await asyncio.gather(
+        *(smart_search(query, semaphore) for query in queries)
+    )
+
     # For each item in shopping list, find cheapest option per store
-    for item in shopping_list:
-        query = item.get("product_name", item.get("name", ""))
+    for item, query, results in zip(shopping_list, queries, all_results):
         quantity = item.get("quantity", 1)
-
-        # Search for this product
-        results = smart_search(query)
         cheapest = get_cheapest_per_store(results)
 
         for store, product in cheapest.items():
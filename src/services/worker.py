@@ -0,0 +1,341 @@
+"""Worker process that runs scrape jobs from the shared job table."""
+
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import uuid
+from dataclasses import dataclass
+
+from loguru import logger
+
+from src.config.settings import get_settings
+from src.database import DatabaseManager, get_db
+from src.database.crud import (
+    complete_scrape_job,
+    defer_scrape_job,
+    enqueue_scrape_job,
+    fail_scrape_job,
+    heartbeat_scrape_job,
+    lease_scrape_jobs,
+)
+from src.models.product import ProductSearch
+from src.scrapers.browser_pool import close_browser_pool
+from src.scrapers.http_client import close_http_client
+from src.scrapers.timing import log_timing_summary
+from src.services.circuit_breaker import get_circuit_breaker
+from src.services.scraper_service import (
+    STATUS_CIRCUIT_OPEN,
+    STATUS_OK,
+    ScraperService,
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a job's store is skipped by its open circuit breaker."""
+
+
+@dataclass(frozen=True)
+class LeasedJob:
+    """A scrape job leased by this worker, detached from its session."""
+
+    id: int
+    supermarket: str
+    kind: str
+    target: str
+    attempts: int
+
+
+class ScrapeWorker:
+    """Leases scrape jobs and runs them with bounded concurrency.
+
+    Leases expire after `worker_lease_seconds` unless renewed by a
+    heartbeat, so jobs held by a crashed worker are picked up by another.
+    Failed jobs are retried with exponential backoff until they run out of
+    attempts. Jobs for a store whose circuit is open are put back until it
+    may close, without using up an attempt. Results are saved through
+    ScraperService.save_products in the same transaction that completes
+    the job. Database calls run in threads, so a busy database never
+    stalls running scrapes or their heartbeats.
+    """
+
+    def __init__(
+        self,
+        service: ScraperService | None = None,
+        db_manager: DatabaseManager | None = None,
+        owner: str | None = None,
+    ):
+        """Initialize with the scraper service and database to use."""
+        settings = get_settings()
+        self.service = service or ScraperService()
+        self.db_manager = db_manager or get_db()
+        self.owner = owner or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        )
+        self.concurrency = settings.worker_concurrency
+        self.lease_seconds = settings.worker_lease_seconds
+        self.poll_interval = settings.worker_poll_interval
+        self.backoff_base = settings.worker_backoff_base
+        self.backoff_max = settings.worker_backoff_max
+        self.completed = 0
+        self.failed = 0
+        self.deferred = 0
+        self.lost = 0
+        self._stop = asyncio.Event()
+
+    async def run(self) -> None:
+        """Lease and run jobs until stopped."""
+        logger.info(f"Worker {self.owner} started")
+        running: set[asyncio.Task] = set()
+        try:
+            while not self._stop.is_set():
+                free = self.concurrency - len(running)
+                leased = await asyncio.to_thread(self._lease, free) if free > 0 else []
+                for job in leased:
+                    task = asyncio.create_task(self._process(job))
+                    running.add(task)
+                    task.add_done_callback(running.discard)
+
+                if running:
+                    await asyncio.wait(
+                        running,
+                        timeout=self.poll_interval,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                else:
+                    try:
+                        await asyncio.wait_for(self._stop.wait(), self.poll_interval)
+                    except TimeoutError:
+                        pass
+        except asyncio.CancelledError:
+            # Unfinished leases expire and are picked up by other workers
+            for task in running:
+                task.cancel()
+            raise
+
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        logger.info(
+            f"Worker {self.owner} stopped: {self.completed} completed, "
+            f"{self.failed} failed"
+        )
+
+    async def run_once(self) -> int:
+        """Lease one batch of jobs and run it, returning the number run."""
+        jobs = await asyncio.to_thread(self._lease, self.concurrency)
+        await asyncio.gather(*(self._process(job) for job in jobs))
+        return len(jobs)
+
+    def stop(self) -> None:
+        """Stop leasing new jobs and finish the running ones."""
+        self._stop.set()
+
+    def stats(self) -> dict:
+        """Get worker statistics."""
+        return {
+            "owner": self.owner,
+            "completed": self.completed,
+            "failed": self.failed,
+            "deferred": self.deferred,
+            "lost": self.lost,
+        }
+
+    def _lease(self, limit: int) -> list[LeasedJob]:
+        """Lease up to `limit` jobs."""
+        try:
+            with self.db_manager.get_session() as session:
+                return [
+                    LeasedJob(
+                        job.id, job.supermarket, job.kind, job.target, job.attempts
+                    )
+                    for job in lease_scrape_jobs(
+                        session, self.owner, limit, self.lease_seconds
+                    )
+                ]
+        except Exception as e:
+            logger.error(f"Could not lease scrape jobs: {e}")
+            return []
+
+    async def _process(self, job: LeasedJob) -> None:
+        """Run a leased job and record its outcome."""
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        error: str | None = None
+        circuit_open = False
+        products: list[ProductSearch] = []
+        try:
+            products = await self._scrape(job)
+        except CircuitOpenError as e:
+            error = str(e)
+            circuit_open = True
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        finally:
+            heartbeat.cancel()
+
+        outcome = await asyncio.to_thread(
+            self._record, job, products, error, circuit_open
+        )
+        if outcome == "completed":
+            self.completed += 1
+        elif outcome == "failed":
+            self.failed += 1
+        elif outcome == "deferred":
+            self.deferred += 1
+        elif outcome == "lost":
+            self.lost += 1
+            logger.warning(f"Job {job.id} lease lost before it finished")
+
+    def _record(
+        self,
+        job: LeasedJob,
+        products: list[ProductSearch],
+        error: str | None,
+        circuit_open: bool,
+    ) -> str | None:
+        """Record a job's outcome, returning what happened to it.
+
+        Gives "completed", "failed", "deferred", "lost" if the lease was
+        gone, or None if the outcome could not be recorded.
+        """
+        try:
+            with self.db_manager.get_session() as session:
+                if circuit_open:
+                    delay = get_circuit_breaker(job.supermarket).retry_in()
+                    if defer_scrape_job(
+                        session,
+                        job.id,
+                        self.owner,
+                        max(delay, self.poll_interval),
+                        error,
+                    ):
+                        logger.debug(
+                            f"Job {job.id} ({job.supermarket} '{job.target}') "
+                            f"deferred {delay:.0f}s: circuit open"
+                        )
+                        return "deferred"
+                elif error is None:
+                    if complete_scrape_job(session, job.id, self.owner, len(products)):
+                        self.service.save_products(session, job.supermarket, products)
+                        return "completed"
+                else:
+                    status = fail_scrape_job(
+                        session,
+                        job.id,
+                        self.owner,
+                        error,
+                        self.backoff_base,
+                        self.backoff_max,
+                    )
+                    if status is not None:
+                        logger.warning(
+                            f"Job {job.id} ({job.supermarket} '{job.target}') "
+                            f"attempt {job.attempts} failed, now {status}: {error}"
+                        )
+                        return "failed"
+        except Exception as e:
+            logger.error(f"Could not record outcome of job {job.id}: {e}")
+            return None
+        return "lost"
+
+    async def _scrape(self, job: LeasedJob) -> list[ProductSearch]:
+        """Scrape a job's query or product page."""
+        if job.supermarket not in self.service.scrapers:
+            raise ValueError(f"Unknown supermarket: {job.supermarket}")
+
+        if job.kind == "product":
+            scraper = self.service.scrapers[job.supermarket]
+            product = await scraper.get_product_details(job.target)
+            if product is None:
+                raise RuntimeError("no product details")
+            return [product]
+
+        status, products = await self.service.search_store(
+            job.supermarket, job.target, force_refresh=True
+        )
+        if status == STATUS_CIRCUIT_OPEN:
+            raise CircuitOpenError(f"search {status}")
+        if status != STATUS_OK:
+            raise RuntimeError(f"search {status}")
+        return products
+
+    async def _heartbeat(self, job: LeasedJob) -> None:
+        """Renew a job's lease until cancelled or the lease is lost."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                held = await asyncio.to_thread(self._renew, job)
+            except Exception as e:
+                logger.error(f"Heartbeat for job {job.id} failed: {e}")
+                continue
+            if not held:
+                return
+
+    def _renew(self, job: LeasedJob) -> bool:
+        """Extend a job's lease; False if this worker no longer holds it."""
+        with self.db_manager.get_session() as session:
+            return heartbeat_scrape_job(session, job.id, self.owner, self.lease_seconds)
+
+
+def enqueue_queries(
+    queries: list[str],
+    supermarkets: list[str] | None = None,
+    priority: int = 0,
+    db_manager: DatabaseManager | None = None,
+) -> int:
+    """Queue a search job per store for each query."""
+    settings = get_settings()
+    db_manager = db_manager or get_db()
+    names = supermarkets or list(ScraperService().scrapers)
+    with db_manager.get_session() as session:
+        for query in queries:
+            for name in names:
+                enqueue_scrape_job(
+                    session,
+                    name,
+                    query,
+                    priority=priority,
+                    max_attempts=settings.worker_max_attempts,
+                )
+    return len(queries) * len(names)
+
+
+async def run_worker() -> None:
+    """Run one worker until SIGINT or SIGTERM."""
+    worker = ScrapeWorker()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    try:
+        await worker.run()
+    finally:
+        log_timing_summary()
+        await close_browser_pool()
+        await close_http_client()
+
+
+def _worker_process() -> None:
+    """Entry point of a spawned worker process."""
+    asyncio.run(run_worker())
+
+
+# Module-level runner for command line usage
+def main():
+    """Run `worker_processes` worker processes sharing the job table."""
+    processes = get_settings().worker_processes
+    if processes <= 1:
+        _worker_process()
+        return
+
+    workers = [
+        multiprocessing.Process(target=_worker_process, name=f"scrape-worker-{i}")
+        for i in range(processes)
+    ]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,5 @@
 """Streamlit UI for Supermarket Price Compare."""
 
-import asyncio
 import streamlit as st
 import pandas as pd
 import plotly.express as px
@@ -12,6 +11,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from src.scrapers.browser_pool import run_sync
 from src.services.scraper_service import ScraperService
 from src.services.product_matcher import ProductMatcherService
 from src.services.cost_calculator import CostCalculatorService
@@ -109,7 +109,7 @@ def get_supermarkets_list() -> list[Supermarket]:
 
 def search_products(query: str) -> dict:
     """Search products in all supermarkets using smart search."""
-    return smart_search(query)
+    return run_sync(smart_search(query))
 
 
 def add_to_shopping_list(product_name: str, prices: dict):
@@ -139,9 +139,11 @@ def calculate_comparison():
         return
 
     # Use smart basket comparison that searches for each item
-    options = calculate_basket_comparison(
-        st.session_state.shopping_list,
-        include_delivery=True,
+    options = run_sync(
+        calculate_basket_comparison(
+            st.session_state.shopping_list,
+            include_delivery=True,
+        )
     )
 
     st.session_state.comparison_results = options
@@ -13,12 +13,17 @@ from src.config.constants import SUPERMARKETS
 
 
 @pytest.fixture
-def db_manager():
-    """Create a test database manager with in-memory SQLite."""
-    manager = DatabaseManager(database_url="sqlite:///:memory:")
+def db_manager(tmp_path):
+    """Create a test database manager with a throwaway SQLite file.
+
+    A file rather than an in-memory database, so that sessions opened
+    concurrently from worker threads each get their own connection.
+    """
+    manager = DatabaseManager(database_url=f"sqlite:///{tmp_path / 'test.db'}")
     manager.create_tables()
     yield manager
     manager.drop_tables()
+    manager.engine.dispose()
 
 
 @pytest.fixture
@@ -13,7 +13,9 @@ class TestPriceServiceIntegration:
     @pytest.fixture
     def price_service(self):
         """Create PriceService instance."""
-        return PriceService()
+        service = PriceService()
+        service.log_searches = False
+        return service
 
     @pytest.fixture
     def mock_scraper_results(self):
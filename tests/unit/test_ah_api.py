@@ -0,0 +1,101 @@
+"""Unit tests for the async Albert Heijn API client."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.scrapers import ah_api
+from src.scrapers.ah_api import AlbertHeijnAPIScraper
+
+SEARCH_RESPONSE = {
+    "products": [
+        {
+            "webshopId": 1525,
+            "title": "AH Halfvolle melk",
+            "brand": "AH",
+            "currentPrice": 0.99,
+            "priceBeforeBonus": 1.15,
+            "images": [{"url": "https://static.ah.nl/1525.jpg"}],
+        }
+    ]
+}
+
+
+class FakeAHApi:
+    """Handler for httpx.MockTransport that mimics the AH mobile API."""
+
+    def __init__(self, expire_first_token: bool = False):
+        self.token_requests = 0
+        self.search_requests = 0
+        self.expire_first_token = expire_first_token
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/auth/token/anonymous"):
+            self.token_requests += 1
+            return httpx.Response(
+                200,
+                json={"access_token": f"token-{self.token_requests}", "expires_in": 7199},
+            )
+
+        self.search_requests += 1
+        if self.expire_first_token and request.headers["Authorization"] == "Bearer token-1":
+            return httpx.Response(401)
+        return httpx.Response(200, json=SEARCH_RESPONSE)
+
+
+@pytest.fixture(autouse=True)
+def reset_token(monkeypatch):
+    """Start every test without a cached token."""
+    monkeypatch.setattr(ah_api, "_token", None)
+    monkeypatch.setattr(ah_api, "_token_expires_at", 0.0)
+
+
+def make_scraper(api: FakeAHApi) -> AlbertHeijnAPIScraper:
+    """Create a scraper that talks to the fake API."""
+    return AlbertHeijnAPIScraper(client=httpx.AsyncClient(transport=httpx.MockTransport(api)))
+
+
+class TestAlbertHeijnAPIScraper:
+    """Tests for AlbertHeijnAPIScraper."""
+
+    @pytest.mark.asyncio
+    async def test_search_parses_products(self):
+        """Test that bonus and regular prices are mapped correctly."""
+        results = await make_scraper(FakeAHApi()).search_product("melk")
+
+        assert len(results) == 1
+        assert results[0].regular_price == 1.15
+        assert results[0].bonus_card_price == 0.99
+        assert results[0].url == "https://www.ah.nl/producten/product/1525"
+
+    @pytest.mark.asyncio
+    async def test_token_is_cached_across_instances(self):
+        """Test that one anonymous token serves many searches."""
+        api = FakeAHApi()
+
+        await make_scraper(api).search_product("melk")
+        await make_scraper(api).search_product("brood")
+
+        assert api.token_requests == 1
+        assert api.search_requests == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_searches_share_token_fetch(self):
+        """Test that concurrent searches fetch the token only once."""
+        api = FakeAHApi()
+        scraper = make_scraper(api)
+
+        await asyncio.gather(*(scraper.search_product(q) for q in ["a", "b", "c"]))
+
+        assert api.token_requests == 1
+
+    @pytest.mark.asyncio
+    async def test_rejected_token_is_refreshed(self):
+        """Test that a 401 fetches a new token and retries once."""
+        api = FakeAHApi(expire_first_token=True)
+
+        results = await make_scraper(api).search_product("melk")
+
+        assert len(results) == 1
+        assert api.token_requests == 2
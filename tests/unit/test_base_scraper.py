@@ -0,0 +1,147 @@
+"""Unit tests for BaseScraper helpers."""
+
+import httpx
+import pytest
+
+from benchmarks.synthetic import listing_page
+from src.scrapers import BaseScraper, ConfiguredScraper, base_scraper
+from src.scrapers.tier_metrics import get_tier_metrics
+
+
+@pytest.fixture
+def scraper():
+    """Create a scraper instance without touching the network."""
+    return ConfiguredScraper("albert_heijn")
+
+
+class TestBuildProducts:
+    """Tests for parsing raw card fields into search results."""
+
+    def test_build_products(self, scraper):
+        """Test that raw cards are parsed into ProductSearch objects."""
+        cards = [
+            {
+                "title": " Campina Halfvolle Melk 1L ",
+                "price": "€ 1,49",
+                "bonus_price": "0,99",
+                "href": "/producten/product/wi1",
+                "image": "https://static.ah.nl/1.jpg",
+            }
+        ]
+
+        results = scraper._build_products(cards)
+
+        assert len(results) == 1
+        product = results[0]
+        assert product.name == "Campina Halfvolle Melk 1L"
+        assert product.regular_price == 1.49
+        assert product.bonus_card_price == 0.99
+        assert product.url == "https://www.ah.nl/producten/product/wi1"
+        assert product.unit == "liter"
+        assert product.supermarket == "albert_heijn"
+
+    def test_build_products_skips_cards_without_title(self, scraper):
+        """Test that cards without a title are dropped."""
+        cards = [
+            {"title": None, "price": "1,00", "href": None, "image": None},
+            {"title": "  ", "price": "1,00", "href": None, "image": None},
+        ]
+
+        assert scraper._build_products(cards) == []
+
+    def test_build_products_missing_price(self):
+        """Test that a missing price defaults to zero."""
+        scraper = ConfiguredScraper("dirk")
+        cards = [{"title": "Dirk Brood", "price": None, "href": None, "image": None}]
+
+        results = scraper._build_products(cards)
+
+        assert results[0].regular_price == 0.0
+        assert results[0].bonus_card_price is None
+        assert results[0].url == ""
+
+    def test_absolute_url_keeps_full_links(self, scraper):
+        """Test that absolute links are not prefixed again."""
+        assert scraper._absolute_url("https://www.ah.nl/x") == "https://www.ah.nl/x"
+        assert scraper._absolute_url("/x") == "https://www.ah.nl/x"
+
+
+class FakeLocator:
+    """Stand-in for a locator whose count grows and then settles."""
+
+    def __init__(self, counts: list[int]):
+        self.counts = counts
+
+    async def count(self):
+        return self.counts.pop(0) if len(self.counts) > 1 else self.counts[0]
+
+
+class FakeListingPage:
+    """Stand-in for a page with product cards that load incrementally."""
+
+    def __init__(self, counts: list[int]):
+        self.card_locator = FakeLocator(counts)
+
+    async def wait_for_selector(self, selector, timeout=None):
+        return None
+
+    def locator(self, selector):
+        return self.card_locator
+
+
+class TestReadiness:
+    """Tests for selector-driven readiness waits."""
+
+    @pytest.mark.asyncio
+    async def test_wait_for_stable_count(self, scraper):
+        """Test that waiting stops once the card count settles."""
+        page = FakeListingPage([4, 8, 12, 12, 20])
+
+        await scraper._wait_for_stable_count(page, ".card", 1, 5000)
+
+        # The fourth reading repeated the third, so polling stopped there
+        assert page.card_locator.counts == [20]
+
+
+class TestHttpTier:
+    """Tests for the plain HTTP search tier."""
+
+    @pytest.fixture
+    def serve(self, monkeypatch):
+        """Route the shared HTTP client to a handler and skip throttling."""
+
+        def install(handler):
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            monkeypatch.setattr(base_scraper, "get_http_client", lambda: client)
+
+        async def no_throttle(self, url):
+            return None
+
+        monkeypatch.setattr(BaseScraper, "_throttle", no_throttle)
+        return install
+
+    @pytest.mark.asyncio
+    async def test_http_tier_parses_server_rendered_html(self, scraper, serve):
+        """Test that server-rendered results are returned without a browser."""
+        serve(lambda request: httpx.Response(200, text=listing_page("albert_heijn", "melk")))
+
+        results = await scraper._search_http("melk")
+
+        assert results is not None
+        assert len(results) == 10
+        assert get_tier_metrics()["albert_heijn"]["http"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_http_tier_blocked_falls_back(self, scraper, serve):
+        """Test that a blocked response defers to the browser tier."""
+        serve(lambda request: httpx.Response(403, text="Access denied"))
+
+        assert await scraper._search_http("melk") is None
+        assert get_tier_metrics()["albert_heijn"]["http_fallback:blocked"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_http_tier_not_configured(self, serve):
+        """Test that stores without a fast path go straight to the browser."""
+        serve(lambda request: pytest.fail("no request expected"))
+
+        assert await ConfiguredScraper("plus")._search_http("melk") is None
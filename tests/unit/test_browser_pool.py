@@ -0,0 +1,215 @@
+"""Unit tests for the shared browser pool."""
+
+import asyncio
+
+import pytest
+
+from src.config.settings import get_settings
+from src.scrapers import browser_pool
+from src.scrapers.browser_pool import BrowserPool
+
+
+class FakeContext:
+    """Stand-in for a playwright browser context."""
+
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    """Stand-in for a playwright browser."""
+
+    def __init__(self):
+        self.closed = False
+        self.contexts: list[FakeContext] = []
+
+    def is_connected(self):
+        return not self.closed
+
+    async def new_context(self, **kwargs):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeChromium:
+    """Stand-in for playwright.chromium that records launches."""
+
+    def __init__(self):
+        self.launched: list[FakeBrowser] = []
+
+    async def launch(self, **kwargs):
+        browser = FakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+
+class FakePlaywright:
+    """Stand-in for a started playwright driver."""
+
+    def __init__(self):
+        self.chromium = FakeChromium()
+        self.stopped = False
+
+    async def stop(self):
+        self.stopped = True
+
+
+@pytest.fixture
+def fake_playwright(monkeypatch):
+    """Patch async_playwright so the pool launches fake browsers."""
+    driver = FakePlaywright()
+
+    class Starter:
+        async def start(self):
+            return driver
+
+    monkeypatch.setattr(browser_pool, "async_playwright", lambda: Starter())
+    return driver
+
+
+class TestBrowserPool:
+    """Tests for BrowserPool."""
+
+    @pytest.mark.asyncio
+    async def test_start_launches_pool_size_browsers(self, fake_playwright):
+        """Test that starting launches exactly `size` browsers once."""
+        pool = BrowserPool(size=3, max_pages_per_browser=10)
+        await pool.start()
+        await pool.start()
+
+        assert len(fake_playwright.chromium.launched) == 3
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_lease_reuses_browsers(self, fake_playwright):
+        """Test that leases share browsers and close their contexts."""
+        pool = BrowserPool(size=1, max_pages_per_browser=10)
+
+        for _ in range(5):
+            async with pool.lease(locale="nl-NL") as context:
+                assert not context.closed
+
+        browser = fake_playwright.chromium.launched[0]
+        assert len(fake_playwright.chromium.launched) == 1
+        assert len(browser.contexts) == 5
+        assert all(c.closed for c in browser.contexts)
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_browser_recycled_after_max_pages(self, fake_playwright):
+        """Test that a browser is replaced after serving max pages."""
+        pool = BrowserPool(size=1, max_pages_per_browser=2)
+
+        async with pool.lease():
+            pass
+        async with pool.lease():
+            pass
+        await asyncio.gather(*pool._swaps)
+
+        first = fake_playwright.chromium.launched[0]
+        assert first.closed
+        assert len(fake_playwright.chromium.launched) == 2
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_retiring_browser_waits_for_active_lease(self, fake_playwright):
+        """Test that a recycled browser stays open until its lease ends."""
+        pool = BrowserPool(size=1, max_pages_per_browser=1)
+
+        async with pool.lease():
+            first = fake_playwright.chromium.launched[0]
+            await asyncio.gather(*pool._swaps)
+            assert not first.closed
+            assert pool.stats()["active_leases"] == 1
+
+        assert first.closed
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_close_stops_driver(self, fake_playwright):
+        """Test that closing shuts down browsers and the driver."""
+        pool = BrowserPool(size=2, max_pages_per_browser=10)
+        await pool.start()
+        await pool.close()
+
+        assert all(b.closed for b in fake_playwright.chromium.launched)
+        assert fake_playwright.stopped
+        assert not pool.started
+
+    @pytest.mark.asyncio
+    async def test_leases_do_not_wait_for_relaunch(self, fake_playwright):
+        """Test that a lease is served while a replacement is launching."""
+        pool = BrowserPool(size=2, max_pages_per_browser=1)
+        await pool.start()
+        launch = asyncio.Event()
+        original = fake_playwright.chromium.launch
+
+        async def slow_launch(**kwargs):
+            await launch.wait()
+            return await original(**kwargs)
+
+        fake_playwright.chromium.launch = slow_launch
+
+        async with pool.lease():
+            pass
+        # The recycled browser's replacement is still launching
+        async with asyncio.timeout(1):
+            async with pool.lease():
+                pass
+
+        launch.set()
+        await asyncio.gather(*pool._swaps)
+        assert len(fake_playwright.chromium.launched) == 4
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_crashed_browser_is_relaunched(self, fake_playwright):
+        """Test that a disconnected browser is replaced."""
+        pool = BrowserPool(size=1, max_pages_per_browser=10)
+        await pool.start()
+        fake_playwright.chromium.launched[0].closed = True
+
+        async with pool.lease() as context:
+            assert not context.closed
+
+        assert len(fake_playwright.chromium.launched) == 2
+        await pool.close()
+
+
+class TestGetBrowserPool:
+    """Tests for the global pool and its event loop."""
+
+    def test_run_sync_closes_pool(self, fake_playwright):
+        """Test that consecutive event loops each get a fresh pool."""
+
+        async def lease():
+            async with browser_pool.get_browser_pool().lease():
+                pass
+
+        browser_pool.run_sync(lease())
+        browser_pool.run_sync(lease())
+
+        size = get_settings().browser_pool_size
+        assert len(fake_playwright.chromium.launched) == 2 * size
+        assert all(b.closed for b in fake_playwright.chromium.launched)
+        assert browser_pool._browser_pool is None
+
+    def test_refuses_pool_running_on_another_loop(self, fake_playwright):
+        """Test that a pool left running by an ended loop is not replaced."""
+
+        async def start():
+            await browser_pool.get_browser_pool().start()
+
+        asyncio.run(start())
+        try:
+            with pytest.raises(RuntimeError, match="another event loop"):
+                asyncio.run(start())
+        finally:
+            browser_pool._browser_pool = None
@@ -0,0 +1,310 @@
+"""Unit tests for the incremental catalog crawler."""
+
+import asyncio
+import json
+from datetime import datetime
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.config.settings import get_settings
+from src.database.crud import get_active_checkpoint, get_fingerprints
+from src.database.models import CrawlCheckpointDB, PriceRecordDB
+from src.models.product import ProductSearch
+from src.scrapers.pagination import ListingPage
+from src.services import circuit_breaker
+from src.services.catalog_crawler import (
+    CatalogCrawler,
+    CrawlStats,
+    listing_fingerprint,
+)
+from src.services.scraper_service import ScraperService
+
+
+class CatalogScraper:
+    """Scraper stand-in serving a fixed catalog per seed, in pages if sized."""
+
+    def __init__(
+        self, catalog: dict[str, list[tuple[str, float]]], page_size: int | None = None
+    ):
+        self.catalog = catalog
+        self.page_size = page_size
+        self.queries: list[tuple[str, int]] = []
+        self.parsed: list[tuple[str, int]] = []
+        self.fail_on: tuple[str, int] | None = None
+        self.report_total = False
+
+    async def fetch_listing_page(self, query: str, index: int = 0, limit=None):
+        self.queries.append((query, index))
+        if (query, index) == self.fail_on:
+            raise asyncio.CancelledError
+        items = list(self.catalog[query])
+        if self.page_size:
+            items = items[index * self.page_size : (index + 1) * self.page_size]
+        elif index > 0:
+            items = []
+        if not items:
+            return None
+        return ListingPage(
+            index,
+            f"https://www.jumbo.com/zoeken?q={query}&page={index}",
+            json.dumps(items),
+            "json",
+            self.page_size,
+            len(items),
+        )
+
+    async def parse_listing_page(self, page: ListingPage):
+        query = parse_qs(urlparse(page.url).query)["q"][0]
+        self.parsed.append((query, page.index))
+        products = [
+            ProductSearch(
+                name=name,
+                regular_price=price,
+                url=f"https://www.jumbo.com/{name}",
+                supermarket="jumbo",
+            )
+            for name, price in json.loads(page.payload)
+        ]
+        if self.report_total and page.index == 0:
+            return products, len(self.catalog[query])
+        return products, None
+
+
+@pytest.fixture
+def scraper():
+    """Create a scraper with a small two-page catalog."""
+    return CatalogScraper(
+        {
+            "melk": [("melk-1l", 1.19), ("melk-2l", 2.09)],
+            "kaas": [("kaas-jong", 4.99), ("melk-1l", 1.19)],
+            "brood": [("brood-wit", 1.79)],
+        }
+    )
+
+
+@pytest.fixture
+def crawler(monkeypatch, db_manager, scraper):
+    """Create a crawler over the fake scraper and an in-memory database."""
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    service = ScraperService()
+    service.cache = None
+    service.scrapers = {"jumbo": scraper}
+    return CatalogCrawler(service, db_manager)
+
+
+def count_records(db_manager) -> int:
+    """Count the stored price records."""
+    with db_manager.get_session() as session:
+        return session.query(PriceRecordDB).count()
+
+
+class TestFingerprints:
+    """Tests for listing fingerprints."""
+
+    def test_price_change_changes_hash(self):
+        """Test that a price change gives a different fingerprint."""
+        product = ProductSearch(
+            name="Melk", regular_price=1.19, url="u", supermarket="jumbo"
+        )
+        cheaper = product.model_copy(update={"regular_price": 0.99})
+
+        assert listing_fingerprint(product) == listing_fingerprint(product.model_copy())
+        assert listing_fingerprint(product) != listing_fingerprint(cheaper)
+
+
+class TestCatalogCrawler:
+    """Tests for CatalogCrawler."""
+
+    @pytest.mark.asyncio
+    async def test_first_crawl_stores_everything(self, crawler, db_manager):
+        """Test that a first crawl stores every distinct listing."""
+        stats = await crawler.crawl_store("jumbo", ["melk", "kaas"])
+
+        assert stats.completed
+        assert stats.pages_fetched == 2
+        assert stats.pages_changed == 2
+        assert stats.listings_seen == 4
+        assert stats.listings_changed == 3
+        assert stats.listings_unchanged == 1
+        assert count_records(db_manager) == 3
+
+    @pytest.mark.asyncio
+    async def test_unchanged_pages_are_skipped(self, crawler, db_manager):
+        """Test that a recrawl of an unchanged catalog writes no records."""
+        await crawler.crawl_store("jumbo", ["melk", "kaas"])
+        stats = await crawler.crawl_store("jumbo", ["melk", "kaas"])
+
+        assert stats.pages_fetched == 2
+        assert stats.pages_skipped == 2
+        assert stats.listings_changed == 0
+        assert count_records(db_manager) == 3
+
+    @pytest.mark.asyncio
+    async def test_unchanged_pages_are_not_parsed(self, crawler, scraper):
+        """Test that a page with the same payload as last crawl is not parsed."""
+        await crawler.crawl_store("jumbo", ["melk", "kaas"])
+        scraper.parsed.clear()
+
+        stats = await crawler.crawl_store("jumbo", ["melk", "kaas"])
+
+        assert scraper.parsed == []
+        assert stats.listings_seen == 4
+        assert stats.listings_unchanged == 4
+
+    @pytest.mark.asyncio
+    async def test_skipped_pages_touch_their_listings(self, crawler, db_manager):
+        """Test that listings on an unchanged page are marked as seen."""
+        key = "https://www.jumbo.com/melk-1l"
+        await crawler.crawl_store("jumbo", ["melk"])
+        with db_manager.get_session() as session:
+            stored = get_fingerprints(session, "jumbo", [key])[key]
+            stored.last_seen = datetime(2020, 1, 1)
+
+        await crawler.crawl_store("jumbo", ["melk"])
+
+        with db_manager.get_session() as session:
+            stored = get_fingerprints(session, "jumbo", [key])[key]
+            assert stored.last_seen > datetime(2020, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_total_ends_unchanged_seed(self, crawler, scraper):
+        """Test that a full last page is not followed by an empty fetch."""
+        scraper.page_size = 2
+        scraper.report_total = True
+        scraper.catalog["melk"] = [(f"melk-{n}", 1.0 + n) for n in range(4)]
+        await crawler.crawl_store("jumbo", ["melk"])
+        scraper.queries.clear()
+
+        stats = await crawler.crawl_store("jumbo", ["melk"])
+
+        assert scraper.queries == [("melk", 0), ("melk", 1)]
+        assert stats.pages_skipped == 2
+
+    @pytest.mark.asyncio
+    async def test_walks_every_result_page(self, crawler, scraper, db_manager):
+        """Test that a seed's pages are walked until a short page."""
+        scraper.page_size = 2
+        scraper.catalog["melk"] = [(f"melk-{n}", 1.0 + n) for n in range(5)]
+
+        stats = await crawler.crawl_store("jumbo", ["melk"])
+
+        assert scraper.queries == [("melk", 0), ("melk", 1), ("melk", 2)]
+        assert stats.pages_fetched == 3
+        assert stats.listings_changed == 5
+        assert count_records(db_manager) == 5
+
+    @pytest.mark.asyncio
+    async def test_full_pages_walk_up_to_max_pages(self, monkeypatch, crawler, scraper):
+        """Test that crawl_max_pages caps the pages walked per seed."""
+        monkeypatch.setattr(get_settings(), "crawl_max_pages", 2)
+        scraper.page_size = 2
+        scraper.catalog["melk"] = [(f"melk-{n}", 1.0 + n) for n in range(6)]
+
+        stats = await crawler.crawl_store("jumbo", ["melk", "brood"])
+
+        assert scraper.queries == [("melk", 0), ("melk", 1), ("brood", 0)]
+        assert stats.pages_fetched == 3
+
+    @pytest.mark.asyncio
+    async def test_only_changed_listings_are_stored(self, crawler, scraper, db_manager):
+        """Test that a price change stores just that listing."""
+        await crawler.crawl_store("jumbo", ["melk"])
+        scraper.catalog["melk"] = [("melk-1l", 0.99), ("melk-2l", 2.09)]
+
+        stats = await crawler.crawl_store("jumbo", ["melk"])
+
+        assert stats.pages_changed == 1
+        assert stats.listings_changed == 1
+        assert stats.listings_unchanged == 1
+        assert count_records(db_manager) == 3
+
+        with db_manager.get_session() as session:
+            stored = get_fingerprints(
+                session, "jumbo", ["https://www.jumbo.com/melk-1l"]
+            )
+            assert stored["https://www.jumbo.com/melk-1l"].last_changed is not None
+
+    @pytest.mark.asyncio
+    async def test_interrupted_crawl_resumes(self, crawler, scraper, db_manager):
+        """Test that a crawl resumes after the last checkpointed page."""
+        seeds = ["melk", "kaas", "brood"]
+        scraper.fail_on = ("kaas", 0)
+        with pytest.raises(asyncio.CancelledError):
+            await crawler.crawl_store("jumbo", seeds)
+
+        with db_manager.get_session() as session:
+            checkpoint = get_active_checkpoint(session, "jumbo")
+            assert checkpoint.position == 1
+
+        scraper.fail_on = None
+        scraper.queries.clear()
+        stats = await crawler.crawl_store("jumbo", seeds)
+
+        assert scraper.queries == [("kaas", 0), ("brood", 0)]
+        assert stats.resumed_at == 1
+        assert stats.pages_fetched == 3
+        assert stats.completed
+
+        with db_manager.get_session() as session:
+            assert get_active_checkpoint(session, "jumbo") is None
+            finished = session.query(CrawlCheckpointDB).one()
+            assert finished.status == "completed"
+            assert finished.stats["pages_fetched"] == 3
+
+    @pytest.mark.asyncio
+    async def test_resumes_within_a_seed(self, crawler, scraper, db_manager):
+        """Test that a crawl stopped mid-seed resumes at the next page."""
+        scraper.page_size = 2
+        scraper.catalog["melk"] = [(f"melk-{n}", 1.0 + n) for n in range(5)]
+        scraper.fail_on = ("melk", 1)
+        with pytest.raises(asyncio.CancelledError):
+            await crawler.crawl_store("jumbo", ["melk", "brood"])
+
+        scraper.fail_on = None
+        scraper.queries.clear()
+        stats = await crawler.crawl_store("jumbo", ["melk", "brood"])
+
+        assert scraper.queries == [("melk", 1), ("melk", 2), ("brood", 0)]
+        assert stats.pages_fetched == 4
+        assert count_records(db_manager) == 6
+
+    @pytest.mark.asyncio
+    async def test_restart_abandons_checkpoint(self, crawler, scraper, db_manager):
+        """Test that restart starts over from the first page."""
+        scraper.fail_on = ("kaas", 0)
+        with pytest.raises(asyncio.CancelledError):
+            await crawler.crawl_store("jumbo", ["melk", "kaas"])
+        scraper.fail_on = None
+        scraper.queries.clear()
+
+        stats = await crawler.crawl_store("jumbo", ["melk", "kaas"], restart=True)
+
+        assert scraper.queries == [("melk", 0), ("kaas", 0)]
+        assert stats.resumed_at == 0
+        with db_manager.get_session() as session:
+            statuses = {c.status for c in session.query(CrawlCheckpointDB)}
+            assert statuses == {"abandoned", "completed"}
+
+    @pytest.mark.asyncio
+    async def test_failed_pages_are_counted(self, crawler, scraper):
+        """Test that a scraper error counts as a failed page."""
+        scraper.catalog["melk"] = None
+
+        stats = await crawler.crawl_store("jumbo", ["melk", "brood"])
+
+        assert stats.pages_failed == 1
+        assert stats.pages_fetched == 1
+        assert stats.completed
+
+
+class TestCrawlStats:
+    """Tests for CrawlStats."""
+
+    def test_round_trip(self):
+        """Test that stats survive a checkpoint round-trip."""
+        stats = CrawlStats(supermarket="jumbo", pages_fetched=3, listings_changed=7)
+
+        restored = CrawlStats.from_dict("jumbo", stats.to_dict())
+
+        assert restored == stats
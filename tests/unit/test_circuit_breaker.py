@@ -0,0 +1,157 @@
+"""Unit tests for per-supermarket circuit breakers."""
+
+import time
+
+import pytest
+
+from src.models.product import ProductSearch
+from src.services import circuit_breaker
+from src.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from src.services.scraper_service import ScraperService
+
+
+class Clock:
+    """Controllable stand-in for time.monotonic."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Patch the monotonic clock used by the breakers."""
+    fake = Clock()
+    monkeypatch.setattr(time, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def breaker(clock):
+    """Create a breaker that opens after two failures for ten seconds."""
+    return CircuitBreaker("jumbo", failure_threshold=2, reset_timeout=10)
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker."""
+
+    def test_opens_after_consecutive_failures(self, breaker):
+        """Test that the threshold of consecutive failures opens the circuit."""
+        breaker.record_failure("empty")
+        assert breaker.state == CLOSED
+
+        breaker.record_failure("empty")
+
+        assert breaker.state == OPEN
+        assert not breaker.allow_request()
+        assert breaker.snapshot()["rejected"] == 1
+
+    def test_success_resets_failure_count(self, breaker):
+        """Test that failures must be consecutive."""
+        breaker.record_failure("empty")
+        breaker.record_success()
+        breaker.record_failure("empty")
+
+        assert breaker.state == CLOSED
+
+    def test_single_half_open_probe(self, breaker, clock):
+        """Test that only one probe goes through after the reset timeout."""
+        breaker.record_failure("error")
+        breaker.record_failure("error")
+        clock.now += 10
+
+        assert breaker.allow_request()
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow_request()
+
+    def test_probe_success_closes(self, breaker, clock):
+        """Test that a successful probe closes the circuit."""
+        breaker.record_failure("error")
+        breaker.record_failure("error")
+        clock.now += 10
+        breaker.allow_request()
+
+        breaker.record_success()
+
+        assert breaker.state == CLOSED
+        assert breaker.allow_request()
+
+    def test_probe_failure_reopens(self, breaker, clock):
+        """Test that a failed probe opens the circuit for another period."""
+        breaker.record_failure("error")
+        breaker.record_failure("error")
+        clock.now += 10
+        breaker.allow_request()
+
+        breaker.record_failure("empty")
+
+        assert breaker.state == OPEN
+        assert breaker.retry_in() == 10
+
+    def test_released_probe_can_be_retried(self, breaker, clock):
+        """Test that a cancelled probe does not leave the breaker stuck."""
+        breaker.record_failure("error")
+        breaker.record_failure("error")
+        clock.now += 10
+        breaker.allow_request()
+
+        breaker.release()
+
+        assert breaker.allow_request()
+
+
+class FakeScraper:
+    """Scraper stand-in returning canned results."""
+
+    def __init__(self, results):
+        self.results = results
+        self.calls = 0
+
+    async def search_product(self, query):
+        self.calls += 1
+        return self.results
+
+
+class TestScraperServiceBreaker:
+    """Tests for circuit breaking in ScraperService."""
+
+    @pytest.fixture
+    def service(self, monkeypatch, clock):
+        """Create a service without cache and with fresh breakers."""
+        monkeypatch.setattr(circuit_breaker, "_breakers", {})
+        service = ScraperService()
+        service.cache = None
+        return service
+
+    @pytest.mark.asyncio
+    async def test_skips_store_while_open(self, service):
+        """Test that an open circuit skips the scraper entirely."""
+        scraper = FakeScraper([])
+        service.scrapers["plus"] = scraper
+
+        for i in range(5):
+            await service.search_supermarket("plus", f"query {i}")
+
+        threshold = circuit_breaker.get_circuit_breaker("plus").failure_threshold
+        assert scraper.calls == threshold
+        assert circuit_breaker.get_all_circuit_breakers()["plus"]["state"] == OPEN
+
+    @pytest.mark.asyncio
+    async def test_recovers_after_probe(self, service, clock):
+        """Test that a successful probe brings the store back."""
+        product = ProductSearch(
+            name="Melk", regular_price=1.0, url="", supermarket="plus"
+        )
+        scraper = FakeScraper([])
+        service.scrapers["plus"] = scraper
+        breaker = circuit_breaker.get_circuit_breaker("plus")
+        for i in range(breaker.failure_threshold):
+            await service.search_supermarket("plus", f"query {i}")
+
+        scraper.results = [product]
+        clock.now += breaker.reset_timeout
+
+        assert await service.search_supermarket("plus", "melk") == [product]
+        assert breaker.state == CLOSED
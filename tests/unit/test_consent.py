@@ -0,0 +1,57 @@
+"""Unit tests for the cookie-consent state store."""
+
+import json
+import os
+import time
+
+import pytest
+
+from src.scrapers.consent import ConsentStateStore
+
+
+class FakeContext:
+    """Stand-in for a playwright browser context."""
+
+    async def storage_state(self):
+        return {"cookies": [{"name": "consent", "value": "yes"}], "origins": []}
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create a consent store in a temporary directory."""
+    return ConsentStateStore(directory=tmp_path, ttl_hours=1)
+
+
+class TestConsentStateStore:
+    """Tests for ConsentStateStore."""
+
+    def test_get_missing_state(self, store):
+        """Test that nothing is returned before consent was stored."""
+        assert store.get("jumbo") is None
+
+    @pytest.mark.asyncio
+    async def test_save_and_get(self, store):
+        """Test that a saved state is returned while fresh."""
+        await store.save("jumbo", FakeContext())
+
+        path = store.get("jumbo")
+        assert path is not None
+        assert json.loads(path.read_text())["cookies"][0]["name"] == "consent"
+
+    @pytest.mark.asyncio
+    async def test_expired_state(self, store):
+        """Test that a state older than the TTL is ignored."""
+        await store.save("jumbo", FakeContext())
+        path = store.path_for("jumbo")
+        old = time.time() - 2 * 3600
+        os.utime(path, (old, old))
+
+        assert store.get("jumbo") is None
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self, store):
+        """Test that invalidating removes the stored state."""
+        await store.save("dirk", FakeContext())
+        store.invalidate("dirk")
+
+        assert store.get("dirk") is None
@@ -0,0 +1,102 @@
+"""Unit tests for compiled extraction plans and the configured scraper."""
+
+import copy
+
+import pytest
+
+from benchmarks.synthetic import listing_page
+from src.config.constants import SUPERMARKETS
+from src.scrapers import ConfiguredScraper, extraction
+from src.scrapers.extraction import compile_plan, get_extraction_plan
+from src.scrapers.html_parser import parse_listing_html
+
+
+@pytest.fixture
+def new_store(monkeypatch):
+    """Register a store that exists only as a config entry."""
+    config = copy.deepcopy(SUPERMARKETS["dirk"])
+    config.update(
+        name="buurtwinkel",
+        display_name="Buurtwinkel",
+        base_url="https://buurtwinkel.example",
+    )
+    monkeypatch.setitem(SUPERMARKETS, "buurtwinkel", config)
+    monkeypatch.setattr(extraction, "_plans", {})
+    return config
+
+
+class TestCompilePlan:
+    """Tests for compile_plan."""
+
+    def test_default_fields(self):
+        """Test that card selectors become the default field rules."""
+        plan = compile_plan("albert_heijn")
+
+        rules = {rule.name: rule for rule in plan.fields}
+        assert plan.card_selector == '[data-testhook="product-card"]'
+        assert set(rules) == {"title", "price", "bonus_price", "href", "image"}
+        assert rules["price"].parse == "price"
+        assert rules["href"].attribute == "href"
+
+    def test_bonus_price_only_when_configured(self):
+        """Test that stores without a bonus selector get no bonus rule."""
+        names = [rule.name for rule in compile_plan("dirk").fields]
+
+        assert "bonus_price" not in names
+
+    def test_field_overrides(self, new_store):
+        """Test that store field rules replace and extend the defaults."""
+        new_store["fields"] = {
+            "image": {"selector": "img", "attribute": "data-src"},
+            "promotion": {"selector": ".badge"},
+        }
+
+        rules = {rule.name: rule for rule in compile_plan("buurtwinkel").fields}
+
+        assert rules["image"].attribute == "data-src"
+        assert rules["promotion"].selector == ".badge"
+
+    @pytest.mark.parametrize(
+        "fields",
+        [
+            {"colour": {"selector": ".colour"}},
+            {"price": {"selector": ".price", "parse": "money"}},
+            {"title": {"selector": "[data-title"}},
+        ],
+    )
+    def test_invalid_rules(self, new_store, fields):
+        """Test that unknown fields, parsers and bad selectors are rejected."""
+        new_store["fields"] = fields
+
+        with pytest.raises(ValueError):
+            compile_plan("buurtwinkel")
+
+    def test_plan_is_compiled_once(self):
+        """Test that scrapers share the cached plan for a store."""
+        assert ConfiguredScraper("jumbo").plan is get_extraction_plan("jumbo")
+
+
+class TestConfiguredScraper:
+    """Tests for ConfiguredScraper."""
+
+    def test_store_from_config_only(self, new_store):
+        """Test that a config entry is enough to scrape a new store."""
+        scraper = ConfiguredScraper("buurtwinkel")
+        cards = parse_listing_html(listing_page("dirk", "melk", count=3), scraper.plan)
+
+        results = scraper._build_products(cards)
+
+        assert len(results) == 3
+        assert all(p.supermarket == "buurtwinkel" for p in results)
+        assert results[0].url.startswith("https://buurtwinkel.example/producten/")
+
+    def test_promotion_field(self, new_store):
+        """Test that extra configured fields fill the product."""
+        new_store["fields"] = {"promotion": {"selector": ".badge"}}
+        scraper = ConfiguredScraper("buurtwinkel")
+        cards = [{"title": "Melk 1L", "price": "1,09", "promotion": "2e  halve prijs"}]
+
+        product = scraper._build_products(cards)[0]
+
+        assert product.promotion_text == "2e halve prijs"
+        assert product.url == ""
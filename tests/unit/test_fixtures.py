@@ -0,0 +1,277 @@
+"""Unit tests for the record/replay fixture layer."""
+
+import httpx
+import pytest
+
+from benchmarks.synthetic import listing_page
+from src.config.settings import get_settings
+from src.scrapers import BaseScraper, ConfiguredScraper, ah_api, base_scraper
+from src.scrapers.ah_api import AlbertHeijnAPIScraper
+from src.scrapers.fixtures import (
+    FixtureRecorder,
+    FixtureReplayer,
+    FixtureStore,
+    RecordedResponse,
+)
+
+
+def recorded(url: str, body: bytes = b"ok", status: int = 200) -> RecordedResponse:
+    """Create a recorded GET response."""
+    return RecordedResponse(
+        url=url,
+        method="GET",
+        status=status,
+        headers={"content-type": "text/html"},
+        body=body,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create a fixture store in a temporary directory."""
+    return FixtureStore(directory=tmp_path)
+
+
+@pytest.fixture
+def fixture_mode(monkeypatch, tmp_path):
+    """Switch the fixture mode and point the default store at tmp_path."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "data_dir", tmp_path)
+
+    async def no_throttle(self, url):
+        return None
+
+    monkeypatch.setattr(BaseScraper, "_throttle", no_throttle)
+
+    def switch(mode: str):
+        monkeypatch.setattr(settings, "scrape_fixture_mode", mode)
+
+    return switch
+
+
+class TestFixtureStore:
+    """Tests for FixtureStore."""
+
+    def test_save_and_load(self, store):
+        """Test that text and binary bodies survive a round trip."""
+        responses = [
+            recorded("https://www.ah.nl/zoeken?query=melk", "<p>€ 1,49</p>".encode()),
+            recorded("https://www.ah.nl/logo.bin", b"\xff\x00\xfe"),
+        ]
+
+        path = store.save("albert_heijn", "Halfvolle Melk", responses)
+
+        assert path.name.startswith("halfvolle-melk-")
+        assert path.suffixes == [".json", ".gz"]
+        assert store.load("albert_heijn", "halfvolle  melk") == responses
+        assert store.queries("albert_heijn") == ["Halfvolle Melk"]
+
+    def test_save_merges_by_url(self, store):
+        """Test that saving again replaces responses with the same URL."""
+        store.save("jumbo", "melk", [recorded("https://a/1", b"old"), recorded("https://a/2")])
+        store.save("jumbo", "melk", [recorded("https://a/1", b"new")])
+
+        bodies = {r.url: r.body for r in store.load("jumbo", "melk")}
+        assert bodies == {"https://a/1": b"new", "https://a/2": b"ok"}
+
+    def test_load_missing(self, store):
+        """Test that an unrecorded query has no responses."""
+        assert store.load("jumbo", "kaas") == []
+        assert len(store.replayer("jumbo")) == 0
+
+
+class TestFixtureReplayer:
+    """Tests for FixtureReplayer."""
+
+    def test_scripts_fall_back_to_path(self):
+        """Test that a script with a changed query string still matches."""
+        replayer = FixtureReplayer([recorded("https://a/app.js?v=1")])
+
+        assert replayer.lookup("GET", "https://a/app.js?v=1") is not None
+        assert replayer.lookup("GET", "https://a/app.js?v=2", "script") is not None
+        assert replayer.lookup("GET", "https://a/other.js", "script") is None
+        assert (replayer.hits, replayer.misses) == (2, 1)
+
+    def test_data_requests_match_full_url(self):
+        """Test that another query or page of the same path does not match."""
+        replayer = FixtureReplayer([recorded("https://a/search?q=melk&page=1")])
+
+        assert replayer.lookup("GET", "https://a/search?page=1&q=melk") is not None
+        assert replayer.lookup("GET", "https://a/search?q=bier&page=1") is None
+        assert replayer.lookup("GET", "https://a/search?q=melk&page=2", "xhr") is None
+
+    @pytest.mark.asyncio
+    async def test_client_serves_fixtures(self):
+        """Test that the HTTP client answers from fixtures or 404."""
+        replayer = FixtureReplayer([recorded("https://a/search?q=melk", b"melk")])
+
+        async with replayer.client() as client:
+            hit = await client.get("https://a/search?q=melk")
+            miss = await client.get("https://b/")
+
+        assert hit.status_code == 200
+        assert hit.content == b"melk"
+        assert miss.status_code == 404
+
+
+class FakeRequest:
+    """Stand-in for a playwright request."""
+
+    def __init__(self, resource_type: str):
+        self.resource_type = resource_type
+        self.method = "GET"
+
+
+class FakeResponse:
+    """Stand-in for a playwright response."""
+
+    def __init__(self, url: str, resource_type: str, body: bytes | None):
+        self.url = url
+        self.status = 200
+        self.request = FakeRequest(resource_type)
+        self._body = body
+
+    async def body(self):
+        if self._body is None:
+            raise RuntimeError("Response body is unavailable for redirect responses")
+        return self._body
+
+    async def all_headers(self):
+        return {"content-type": "text/html", "content-encoding": "gzip"}
+
+
+class TestFixtureRecorder:
+    """Tests for FixtureRecorder."""
+
+    @pytest.mark.asyncio
+    async def test_records_data_responses(self, store):
+        """Test that documents and XHR are kept, other types and redirects not."""
+        recorder = FixtureRecorder(store, "jumbo", "melk")
+        recorder._on_response(FakeResponse("https://a/", "document", b"<html>"))
+        recorder._on_response(FakeResponse("https://a/api", "xhr", b"{}"))
+        recorder._on_response(FakeResponse("https://a/s.css", "stylesheet", b"body{}"))
+        recorder._on_response(FakeResponse("https://a/old", "document", None))
+
+        await recorder.save()
+
+        responses = store.load("jumbo", "melk")
+        assert sorted(r.url for r in responses) == ["https://a/", "https://a/api"]
+        assert "content-encoding" not in responses[0].headers
+
+
+class TestScraperReplay:
+    """Tests for recording and replaying scraper searches."""
+
+    @pytest.mark.asyncio
+    async def test_http_tier_record_then_replay(self, fixture_mode, monkeypatch):
+        """Test that a recorded HTTP search gives the same results offline."""
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda r: httpx.Response(200, text=listing_page("albert_heijn", "melk"))
+            )
+        )
+        monkeypatch.setattr(base_scraper, "get_http_client", lambda: client)
+        fixture_mode("record")
+        live = await ConfiguredScraper("albert_heijn")._search_http("melk")
+
+        monkeypatch.setattr(
+            base_scraper, "get_http_client", lambda: pytest.fail("network used")
+        )
+        fixture_mode("replay")
+        replayed = await ConfiguredScraper("albert_heijn")._search_http("melk")
+
+        assert live and replayed == live
+
+    @pytest.mark.asyncio
+    async def test_replay_misses_other_query(self, fixture_mode, monkeypatch):
+        """Test that a query that was never recorded is not served another's."""
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda r: httpx.Response(200, text=listing_page("albert_heijn", "melk"))
+            )
+        )
+        monkeypatch.setattr(base_scraper, "get_http_client", lambda: client)
+        fixture_mode("record")
+        await ConfiguredScraper("albert_heijn")._search_http("melk")
+
+        fixture_mode("replay")
+        assert await ConfiguredScraper("albert_heijn")._search_http("bier") is None
+
+    @pytest.mark.asyncio
+    async def test_http_tier_replays_every_page(self, fixture_mode, monkeypatch):
+        """Test that later result pages are recorded and replayed too."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            page = request.url.params.get("page", "1")
+            html = listing_page("albert_heijn", "melk", count=36, seed=int(page))
+            return httpx.Response(
+                200, text=html.replace("/albert_heijn-", f"/albert_heijn-{page}-")
+            )
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(base_scraper, "get_http_client", lambda: client)
+        fixture_mode("record")
+        live = await ConfiguredScraper("albert_heijn")._search_http("melk", target=60)
+
+        fixture_mode("replay")
+        replayed = await ConfiguredScraper("albert_heijn")._search_http(
+            "melk", target=60
+        )
+
+        assert len(live) == 60
+        assert {p.url for p in replayed} == {p.url for p in live}
+
+    @pytest.mark.asyncio
+    async def test_ah_api_record_then_replay(self, fixture_mode, monkeypatch):
+        """Test that the AH API client replays recorded searches without a token."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request.url.path)
+            if request.url.path.endswith("/auth/token/anonymous"):
+                return httpx.Response(200, json={"access_token": "t"})
+            product = {"webshopId": 1525, "title": "AH melk", "currentPrice": 0.99}
+            return httpx.Response(200, json={"products": [product]})
+
+        monkeypatch.setattr(ah_api, "_token", None)
+        fixture_mode("record")
+        live_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        live = await AlbertHeijnAPIScraper(client=live_client).search_product("melk")
+
+        fixture_mode("replay")
+        replayed = await AlbertHeijnAPIScraper().search_product("melk")
+
+        assert live and replayed == live
+        assert len(requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_ah_api_replays_every_page(self, fixture_mode, monkeypatch):
+        """Test that every AH API result page is recorded and replayed."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/auth/token/anonymous"):
+                return httpx.Response(200, json={"access_token": "t"})
+            page = int(request.url.params["page"])
+            size = int(request.url.params["size"])
+            products = [
+                {"webshopId": i, "title": f"AH product {i}", "currentPrice": 1.0}
+                for i in range(page * size, (page + 1) * size)
+            ]
+            return httpx.Response(
+                200, json={"products": products, "page": {"totalElements": 100}}
+            )
+
+        monkeypatch.setattr(ah_api, "_token", None)
+        fixture_mode("record")
+        live_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        live = await AlbertHeijnAPIScraper(client=live_client).search_product(
+            "melk", limit=60
+        )
+
+        fixture_mode("replay")
+        replayed = await AlbertHeijnAPIScraper().search_product("melk", limit=60)
+        other = await AlbertHeijnAPIScraper().search_product("bier", limit=60)
+
+        assert len(live) == 60
+        assert sorted(p.url for p in replayed) == sorted(p.url for p in live)
+        assert other == []
@@ -0,0 +1,79 @@
+"""Unit tests for listing HTML and JSON parsing."""
+
+from benchmarks.synthetic import listing_page
+from src.config.constants import SUPERMARKETS
+from src.scrapers.extraction import get_extraction_plan
+from src.scrapers.html_parser import parse_listing_html, parse_listing_json
+
+
+class TestParseListingHtml:
+    """Tests for parse_listing_html."""
+
+    def test_parses_cards(self):
+        """Test that card fields are read with the store's selectors."""
+        html = """
+        <div class="product-card">
+            <a href="/p/1"><img src="/img/1.jpg"></a>
+            <span class="product-card__title">Dirk Halfvolle Melk 1L</span>
+            <span class="product-card__price">0 <sup>99</sup></span>
+        </div>
+        """
+        cards = parse_listing_html(html, get_extraction_plan("dirk"))
+
+        assert cards == [
+            {
+                "title": "Dirk Halfvolle Melk 1L",
+                "price": "0 99",
+                "href": "/p/1",
+                "image": "/img/1.jpg",
+            }
+        ]
+
+    def test_respects_limit(self):
+        """Test that at most `limit` cards are returned."""
+        html = listing_page("albert_heijn", "melk", count=15)
+
+        cards = parse_listing_html(html, get_extraction_plan("albert_heijn"), limit=10)
+
+        assert len(cards) == 10
+        assert all(card["title"] for card in cards)
+
+    def test_no_cards(self):
+        """Test that a client-rendered shell yields no cards."""
+        html = "<html><body><div id='app'></div></body></html>"
+
+        assert parse_listing_html(html, get_extraction_plan("plus")) == []
+
+
+class TestParseListingJson:
+    """Tests for parse_listing_json."""
+
+    def test_parses_items_with_dotted_paths(self):
+        """Test that fields, price scaling and link templates are applied."""
+        data = {
+            "products": {
+                "data": [
+                    {
+                        "id": "12345PAK",
+                        "title": "Jumbo Halfvolle Melk 1L",
+                        "prices": {"price": {"amount": 109}},
+                        "imageInfo": {"primaryView": [{"url": "https://img/1.png"}]},
+                    }
+                ]
+            }
+        }
+
+        cards = parse_listing_json(data, SUPERMARKETS["jumbo"]["fast_path"])
+
+        assert cards == [
+            {
+                "title": "Jumbo Halfvolle Melk 1L",
+                "price": "1.09",
+                "image": "https://img/1.png",
+                "href": "https://www.jumbo.com/producten/12345PAK",
+            }
+        ]
+
+    def test_missing_items(self):
+        """Test that a response without products yields no cards."""
+        assert parse_listing_json({}, SUPERMARKETS["jumbo"]["fast_path"]) == []
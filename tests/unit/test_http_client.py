@@ -0,0 +1,46 @@
+"""Unit tests for the shared HTTP clients."""
+
+import asyncio
+
+from src.scrapers import http_client
+from src.scrapers.browser_pool import run_sync
+from src.scrapers.http_client import get_http_client
+
+
+async def open_client():
+    """Get the shared client of the running loop."""
+    return get_http_client()
+
+
+class TestHttpClient:
+    """Tests for per-loop HTTP clients."""
+
+    def test_run_sync_closes_clients(self):
+        """Test that each run gets a fresh client that is closed at the end."""
+        first = run_sync(open_client())
+        second = run_sync(open_client())
+
+        assert first is not second
+        assert first.is_closed and second.is_closed
+        assert http_client._clients == {}
+
+    def test_client_shared_within_loop(self):
+        """Test that one loop reuses its client."""
+
+        async def twice():
+            try:
+                return get_http_client(), get_http_client()
+            finally:
+                await http_client.close_http_client()
+
+        first, second = asyncio.run(twice())
+
+        assert first is second
+
+    def test_ended_loop_clients_are_dropped(self):
+        """Test that clients of a loop that ended unclosed are not kept."""
+        asyncio.run(open_client())
+
+        run_sync(open_client())
+
+        assert http_client._clients == {}
@@ -0,0 +1,350 @@
+"""Unit tests for multi-page search results."""
+
+import asyncio
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from benchmarks.synthetic import listing_page
+from src.models.product import ProductSearch
+from src.scrapers import (
+    BaseScraper,
+    ConfiguredScraper,
+    ah_api,
+    base_scraper,
+    tier_metrics,
+)
+from src.scrapers.ah_api import AlbertHeijnAPIScraper
+from src.scrapers.pagination import (
+    ResultCollector,
+    page_url,
+    pages_needed,
+    parse_total,
+)
+from src.services import circuit_breaker
+from src.services.scraper_service import STATUS_OK, STATUS_PARTIAL, ScraperService
+
+
+def product(name: str, url: str = "") -> ProductSearch:
+    """Create a search result with just a name and URL."""
+    return ProductSearch(name=name, regular_price=1.0, url=url, supermarket="dirk")
+
+
+class TestPageHelpers:
+    """Tests for result counts, page URLs and page counts."""
+
+    def test_parse_total(self):
+        """Test that the last number in a count text is the total."""
+        assert parse_total("24 van 1.234 resultaten") == 1234
+        assert parse_total("1,234 products") == 1234
+        assert parse_total(87) == 87
+        assert parse_total("geen resultaten") is None
+        assert parse_total(None) is None
+
+    def test_page_url(self):
+        """Test page numbers and offsets in page URLs."""
+        template = "https://x.nl/s?q={query}&page={page}&offset={offset}"
+
+        assert page_url(template, "halfvolle melk", 2, 24, 1) == (
+            "https://x.nl/s?q=halfvolle%20melk&page=3&offset=48"
+        )
+
+    def test_pages_needed(self):
+        """Test that the target, total and page cap limit the page count."""
+        assert pages_needed(60, 24, 24, None, 5) == 3
+        assert pages_needed(60, 24, 24, 30, 5) == 2
+        assert pages_needed(500, 24, 24, None, 5) == 5
+        assert pages_needed(10, 24, 24, 1000, 5) == 1
+
+    def test_short_first_page_is_the_only_page(self):
+        """Test that a first page below the page size ends the listing."""
+        assert pages_needed(60, 24, 7, 1000, 5) == 1
+
+
+class TestResultCollector:
+    """Tests for collecting results across pages."""
+
+    def test_drops_duplicates_across_pages(self):
+        """Test that products repeated on a later page are counted once."""
+        collector = ResultCollector(10)
+
+        collector.add([product("Melk", "/p/1"), product("Brood")])
+        new = collector.add([product("Melk 1L", "/p/1"), product("brood")])
+
+        assert [p.name for p in collector.results] == ["Melk", "Brood"]
+        assert new == []
+        assert collector.duplicates == 2
+
+    def test_stops_at_target_and_reports_pages(self):
+        """Test that results past the target are dropped and pages reported."""
+        pages = []
+        collector = ResultCollector(3, on_page=pages.append)
+
+        collector.add([product("A"), product("B")])
+        collector.add([product("C"), product("D")])
+
+        assert [p.name for p in collector.results] == ["A", "B", "C"]
+        assert collector.full
+        assert [[p.name for p in page] for page in pages] == [["A", "B"], ["C"]]
+
+
+class TestHttpPagination:
+    """Tests for fetching further result pages over HTTP."""
+
+    @pytest.fixture
+    def serve(self, monkeypatch):
+        """Route the shared HTTP client to a handler and skip throttling."""
+
+        def install(handler):
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            monkeypatch.setattr(base_scraper, "get_http_client", lambda: client)
+
+        async def no_throttle(self, url):
+            return None
+
+        monkeypatch.setattr(BaseScraper, "_throttle", no_throttle)
+        return install
+
+    @pytest.mark.asyncio
+    async def test_fetches_later_pages_up_to_target(self, serve):
+        """Test that full pages lead to further pages until the target."""
+        requested = []
+
+        def handler(request):
+            page = int(parse_qs(request.url.query.decode()).get("page", ["1"])[0])
+            requested.append(page)
+            html = listing_page("albert_heijn", "melk", count=36, seed=page)
+            # Synthetic product links repeat per page; make each page distinct
+            html = html.replace("/albert_heijn-", f"/albert_heijn-{page}-")
+            return httpx.Response(200, text=html)
+
+        serve(handler)
+        pages = []
+
+        results = await ConfiguredScraper("albert_heijn")._search_http(
+            "melk", target=60, on_page=pages.append
+        )
+
+        assert results is not None
+        assert len(results) == 60
+        assert sorted(requested) == [1, 2]
+        assert [len(page) for page in pages] == [36, 24]
+
+    @pytest.mark.asyncio
+    async def test_short_first_page_fetches_one_page(self, serve):
+        """Test that no further pages are requested after a short page."""
+        requested = []
+
+        def handler(request):
+            requested.append(str(request.url))
+            return httpx.Response(
+                200, text=listing_page("albert_heijn", "melk", count=12)
+            )
+
+        serve(handler)
+
+        results = await ConfiguredScraper("albert_heijn")._search_http(
+            "melk", target=60
+        )
+
+        assert len(results) == 12
+        assert len(requested) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_later_page_keeps_first(self, serve):
+        """Test that a failing later page does not lose the first page."""
+
+        def handler(request):
+            if "page=" in str(request.url):
+                return httpx.Response(500)
+            return httpx.Response(
+                200, text=listing_page("albert_heijn", "melk", count=36)
+            )
+
+        serve(handler)
+
+        results = await ConfiguredScraper("albert_heijn")._search_http(
+            "melk", target=60
+        )
+
+        assert len(results) == 36
+
+
+class TestListingPages:
+    """Tests for fetching raw result pages for the catalog crawler."""
+
+    @pytest.mark.asyncio
+    async def test_fetches_page_unparsed_then_parses(self, monkeypatch):
+        """Test that a later page is fetched as-is and parsed on request."""
+        html = listing_page("albert_heijn", "melk", count=36)
+        requested = []
+
+        def handler(request):
+            requested.append(str(request.url))
+            return httpx.Response(200, text=html)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(base_scraper, "get_http_client", lambda: client)
+        scraper = ConfiguredScraper("albert_heijn")
+
+        page = await scraper.fetch_listing_page("melk", 1)
+        products, _ = await scraper.parse_listing_page(page)
+
+        assert requested == ["https://www.ah.nl/zoeken?query=melk&page=2"]
+        assert page.payload == html
+        assert page.page_size == 36
+        assert len(products) == 36
+
+    @pytest.mark.asyncio
+    async def test_blocked_page_is_counted(self, monkeypatch):
+        """Test that a blocked listing fetch is reported like a blocked search."""
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(403))
+        )
+        monkeypatch.setattr(base_scraper, "get_http_client", lambda: client)
+        monkeypatch.setattr(tier_metrics, "_tiers", {})
+
+        async def no_browser(self, query, index, limit):
+            return None
+
+        monkeypatch.setattr(BaseScraper, "_fetch_listing_browser", no_browser)
+
+        page = await ConfiguredScraper("dirk").fetch_listing_page("melk")
+
+        assert page is None
+        assert tier_metrics.get_tier_metrics()["dirk"] == {"http_fallback:blocked": 1}
+
+
+class FakePagedAHApi:
+    """Handler for httpx.MockTransport that serves paged AH search results."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.pages: list[int] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/auth/token/anonymous"):
+            return httpx.Response(
+                200, json={"access_token": "token", "expires_in": 7199}
+            )
+
+        page = int(request.url.params["page"])
+        size = int(request.url.params["size"])
+        self.pages.append(page)
+        start = page * size
+        ids = range(start, min(start + size, self.total))
+        return httpx.Response(
+            200,
+            json={
+                "products": [
+                    {"webshopId": i, "title": f"AH product {i}", "currentPrice": 1.0}
+                    for i in ids
+                ],
+                "page": {"totalElements": self.total, "number": page, "size": size},
+            },
+        )
+
+
+class TestAHApiPagination:
+    """Tests for paged AH API searches."""
+
+    @pytest.fixture(autouse=True)
+    def reset_token(self, monkeypatch):
+        """Start every test without a cached token."""
+        monkeypatch.setattr(ah_api, "_token", None)
+        monkeypatch.setattr(ah_api, "_token_expires_at", 0.0)
+
+    def make_scraper(self, api: FakePagedAHApi) -> AlbertHeijnAPIScraper:
+        """Create a scraper that talks to the fake API."""
+        return AlbertHeijnAPIScraper(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(api))
+        )
+
+    @pytest.mark.asyncio
+    async def test_requests_pages_up_to_limit(self):
+        """Test that later pages are requested concurrently up to the limit."""
+        api = FakePagedAHApi(total=1000)
+
+        results = await self.make_scraper(api).search_product("melk", limit=80)
+
+        assert len(results) == 80
+        assert sorted(api.pages) == [0, 1, 2]
+        assert len({p.url for p in results}) == 80
+
+    @pytest.mark.asyncio
+    async def test_total_caps_pages(self):
+        """Test that no pages past the reported total are requested."""
+        api = FakePagedAHApi(total=40)
+
+        results = await self.make_scraper(api).search_product("melk", limit=100)
+
+        assert len(results) == 40
+        assert sorted(api.pages) == [0, 1]
+
+    @pytest.mark.asyncio
+    async def test_listing_page_reports_total(self):
+        """Test that a fetched API page parses into products and the total."""
+        api = FakePagedAHApi(total=40)
+        scraper = self.make_scraper(api)
+
+        page = await scraper.fetch_listing_page("melk", 1)
+        products, total = await scraper.parse_listing_page(page)
+
+        assert api.pages == [1]
+        assert len(products) == 4
+        assert total == 40
+
+
+class PagedScraper:
+    """Scraper stand-in that reports two result pages before finishing."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    async def search_product(self, query: str, on_page=None):
+        results = []
+        for page in range(2):
+            await asyncio.sleep(0.01)
+            batch = [product(f"{self.name} {page}")]
+            results.extend(batch)
+            if on_page is not None:
+                on_page(batch)
+        await asyncio.sleep(0.05)
+        return results
+
+
+class TestPartialResults:
+    """Tests for partial results in iter_search_results."""
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        """Create a scraper service with one paged store."""
+        monkeypatch.setattr(circuit_breaker, "_breakers", {})
+        service = ScraperService()
+        service.cache = None
+        service.finish_in_background = False
+        service.scrapers = {"dirk": PagedScraper("dirk")}
+        return service
+
+    @pytest.mark.asyncio
+    async def test_partial_results_precede_final(self, service):
+        """Test that each landed page is yielded before the final result."""
+        events = [
+            (status, len(products))
+            async for _, status, products in service.iter_search_results(
+                "melk", deadline=0, partial=True
+            )
+        ]
+
+        assert events == [(STATUS_PARTIAL, 1), (STATUS_PARTIAL, 2), (STATUS_OK, 2)]
+
+    @pytest.mark.asyncio
+    async def test_no_partial_results_by_default(self, service):
+        """Test that only final results are yielded without `partial`."""
+        events = [
+            status
+            async for _, status, _ in service.iter_search_results("melk", deadline=0)
+        ]
+
+        assert events == [STATUS_OK]
@@ -0,0 +1,104 @@
+"""Unit tests for the listing parse pool."""
+
+import json
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from benchmarks.synthetic import listing_page
+from src.scrapers import ConfiguredScraper
+from src.scrapers.html_parser import parse_listing_html
+from src.scrapers.parse_pool import RECORD_FIELDS, ParsePool, parse_payload
+
+
+class BrokenExecutor:
+    """Executor stand-in whose worker processes have died."""
+
+    def submit(self, fn, *args):
+        raise BrokenProcessPool("worker died")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+class TestParsePayload:
+    """Tests for parse_payload."""
+
+    def test_matches_browser_tier_products(self):
+        """Test that pooled records build the same products as the browser tier."""
+        scraper = ConfiguredScraper("albert_heijn")
+        html = listing_page("albert_heijn", "melk")
+
+        records, elapsed = parse_payload("albert_heijn", html, "html")
+
+        cards = parse_listing_html(html, scraper.plan)
+        assert scraper._products_from_records(records) == scraper._build_products(cards)
+        assert len(records[0]) == len(RECORD_FIELDS)
+        assert elapsed > 0
+
+    def test_parses_json_payload(self):
+        """Test that search API responses are parsed with the fast path rules."""
+        payload = json.dumps(
+            {
+                "products": {
+                    "data": [
+                        {
+                            "id": "123",
+                            "title": "Jumbo Halfvolle Melk 1L",
+                            "prices": {"price": {"amount": 109}},
+                        }
+                    ]
+                }
+            }
+        )
+
+        records, _ = parse_payload("jumbo", payload, "json")
+        record = dict(zip(RECORD_FIELDS, records[0]))
+
+        assert record["regular_price"] == 1.09
+        assert record["url"] == "https://www.jumbo.com/producten/123"
+        assert (record["unit"], record["unit_size"]) == ("liter", 1.0)
+
+
+class TestParsePool:
+    """Tests for ParsePool."""
+
+    @pytest.mark.asyncio
+    async def test_small_payloads_parse_inline(self):
+        """Test that payloads below min_bytes skip the process pool."""
+        pool = ParsePool(workers=2, min_bytes=1_000_000)
+
+        records = await pool.parse("albert_heijn", listing_page("albert_heijn", "melk"))
+
+        assert len(records) == 10
+        assert pool.stats()["inline"] == 1
+        assert pool._executor is None
+
+    @pytest.mark.asyncio
+    async def test_large_payloads_use_worker_processes(self):
+        """Test that payloads are parsed in a worker process."""
+        pool = ParsePool(workers=1, min_bytes=0)
+        html = listing_page("albert_heijn", "melk")
+        try:
+            records = await pool.parse("albert_heijn", html)
+        finally:
+            pool.shutdown()
+
+        assert records == parse_payload("albert_heijn", html, "html")[0]
+        stats = pool.stats()
+        assert stats["pooled"] == 1
+        assert stats["max_queue_depth"] == 1
+        assert stats["queue_depth"] == 0
+        assert stats["avg_parse_ms"] > 0
+
+    @pytest.mark.asyncio
+    async def test_broken_pool_falls_back_inline(self):
+        """Test that a dead pool is replaced and the page still parses."""
+        pool = ParsePool(workers=1, min_bytes=0)
+        pool._executor = BrokenExecutor()
+
+        records = await pool.parse("albert_heijn", listing_page("albert_heijn", "melk"))
+
+        assert len(records) == 10
+        assert pool.errors == 1
+        assert pool._executor is None
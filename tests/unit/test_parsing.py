@@ -0,0 +1,158 @@
+"""Unit and property-based tests for price and unit parsing."""
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from src.scrapers.parsing import (
+    UNIT_ALIASES,
+    parse_price,
+    parse_prices,
+    parse_unit,
+    parse_units,
+)
+
+# Price texts as they appear on Dutch supermarket sites
+PRICE_CORPUS = [
+    ("€ 1,49", 1.49),
+    ("1,49", 1.49),
+    ("€1,49", 1.49),
+    ("€\xa02,19", 2.19),
+    ("0.99", 0.99),
+    ("€ 2,-", 2.0),
+    ("12,5", 12.5),
+    ("0 99", 0.99),
+    ("3\n49", 3.49),
+    ("Nu € 1,99", 1.99),
+    ("1,29 per kg", 1.29),
+    ("€ 10,00", 10.0),
+    ("€ 1.234,56", 1234.56),
+    ("1,234.56", 1234.56),
+    ("€ 1.299,-", 1299.0),
+    ("€ 1.299", 1299.0),
+    ("1.234.567,89", 1234567.89),
+]
+
+# Product names and the unit and total size they describe
+UNIT_CORPUS = [
+    ("AH Halfvolle melk 1 L", ("liter", 1.0)),
+    ("Campina Vla vanille 1 liter", ("liter", 1.0)),
+    ("Coca-Cola Zero 1,5 ltr", ("liter", 1.5)),
+    ("Melk 1 lt", ("liter", 1.0)),
+    ("Robijn Wasmiddel Color 1,53 l", ("liter", 1.53)),
+    ("Alpro Sojadrink 250 ml", ("ml", 250.0)),
+    ("Heineken Pilsener 6 x 33 cl", ("ml", 1980.0)),
+    ("Hertog Jan 24x30cl", ("ml", 7200.0)),
+    ("Lipton Ice Tea 6 x 1,5 l", ("liter", 9.0)),
+    ("Calvé Pindakaas 350 g", ("gram", 350.0)),
+    ("Lay's Naturel 225gr", ("gram", 225.0)),
+    ("Unox Rookworst 275 gram", ("gram", 275.0)),
+    ("Douwe Egberts Aroma Rood 500G", ("gram", 500.0)),
+    ("Goudse kaas jong 1,5 kg", ("kg", 1.5)),
+    ("Jonagold appels 1 kilo", ("kg", 1.0)),
+    ("Scharreleieren 10 stuks", ("stuk", 10.0)),
+    ("Elstar appels 4 st", ("stuk", 4.0)),
+    ("Pampers Baby Dry 2 x 44 stuks", ("stuk", 88.0)),
+    ("6 stuks 100g", ("gram", 100.0)),
+    ("AH Magere yoghurt 0% vet 500 g", ("gram", 500.0)),
+    ("Page Toiletpapier 3 lagen 8 rollen", ("stuk", 1.0)),
+    ("Komkommer", ("stuk", 1.0)),
+]
+
+UNIT_WORDS = sorted(UNIT_ALIASES)
+
+
+class TestParsePrice:
+    """Tests for parse_price."""
+
+    @pytest.mark.parametrize(("text", "expected"), PRICE_CORPUS)
+    def test_corpus(self, text, expected):
+        """Test real-world Dutch price texts."""
+        assert parse_price(text) == pytest.approx(expected)
+
+    @pytest.mark.parametrize("text", [None, "", "Gratis", "€ -"])
+    def test_no_price(self, text):
+        """Test that texts without digits give None."""
+        assert parse_price(text) is None
+
+    @given(cents=st.integers(min_value=0, max_value=99_999))
+    def test_round_trip(self, cents):
+        """Test that any displayed euro amount parses back to itself."""
+        text = f"€ {cents // 100},{cents % 100:02d}"
+
+        assert parse_price(text) == pytest.approx(cents / 100)
+
+    @given(cents=st.integers(min_value=100_000, max_value=99_999_999))
+    def test_round_trip_thousands(self, cents):
+        """Test that amounts with thousands separators parse back to themselves."""
+        text = f"€ {cents // 100:,}".replace(",", ".") + f",{cents % 100:02d}"
+
+        assert parse_price(text) == pytest.approx(cents / 100)
+
+    @given(st.text())
+    def test_never_raises(self, text):
+        """Test that arbitrary text gives None or a non-negative float."""
+        price = parse_price(text)
+
+        assert price is None or price >= 0
+
+
+class TestParseUnit:
+    """Tests for parse_unit."""
+
+    @pytest.mark.parametrize(("text", "expected"), UNIT_CORPUS)
+    def test_corpus(self, text, expected):
+        """Test real-world Dutch product names."""
+        unit, size = parse_unit(text)
+
+        assert (unit, size) == (expected[0], pytest.approx(expected[1]))
+
+    @given(
+        size=st.integers(min_value=1, max_value=5000),
+        word=st.sampled_from(UNIT_WORDS),
+        space=st.sampled_from(["", " "]),
+        upper=st.booleans(),
+    )
+    def test_size_and_unit(self, size, word, space, upper):
+        """Test that a size followed by any unit word is recognized."""
+        word = word.upper() if upper else word
+        unit, factor = UNIT_ALIASES[word.lower()]
+
+        assert parse_unit(f"Merk Product {size}{space}{word}") == (unit, size * factor)
+
+    @given(
+        count=st.integers(min_value=1, max_value=48),
+        size=st.integers(min_value=1, max_value=2000),
+        word=st.sampled_from(UNIT_WORDS),
+        separator=st.sampled_from(["x", " x ", "×", " X "]),
+    )
+    def test_multipack(self, count, size, word, separator):
+        """Test that multipacks give the total size."""
+        unit, factor = UNIT_ALIASES[word]
+
+        result = parse_unit(f"Bier {count}{separator}{size} {word}")
+
+        assert result == (unit, pytest.approx(count * size * factor))
+
+    @given(st.text())
+    def test_never_raises(self, text):
+        """Test that arbitrary text gives a known unit and positive size."""
+        unit, size = parse_unit(text)
+
+        assert unit in {"kg", "gram", "ml", "liter", "stuk"}
+        assert size >= 0
+
+
+class TestBatch:
+    """Tests for the batch parsers."""
+
+    @given(st.lists(st.one_of(st.none(), st.text())))
+    def test_prices_match_single(self, texts):
+        """Test that batch price parsing equals parsing one by one."""
+        assert parse_prices(texts) == [parse_price(t) for t in texts]
+
+    def test_units_match_single(self):
+        """Test that batch unit parsing equals parsing one by one."""
+        names = [text for text, _ in UNIT_CORPUS]
+
+        assert parse_units(names) == [parse_unit(n) for n in names]
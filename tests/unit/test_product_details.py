@@ -0,0 +1,155 @@
+"""Unit tests for batched product-detail fetching."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+
+from src.models.product import ProductSearch
+from src.scrapers import ConfiguredScraper
+from src.scrapers.ah_api import AlbertHeijnAPIScraper
+
+
+class FakePage:
+    """Stand-in for a playwright page."""
+
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+
+class FakeDetailScraper(ConfiguredScraper):
+    """Configured scraper with the browser replaced by fakes."""
+
+    def __init__(self, delay: float = 0.01, crash_on: str | None = None):
+        super().__init__("jumbo")
+        self.delay = delay
+        self.crash_on = crash_on
+        self.leases = 0
+        self.active = 0
+        self.max_active = 0
+
+    @asynccontextmanager
+    async def _create_page(self, query=None):
+        self.leases += 1
+        yield FakePage()
+
+    async def _read_product_details(self, page, url):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if "bad" in url:
+                raise TimeoutError("selector timeout")
+            if url == self.crash_on:
+                page.closed = True
+                raise RuntimeError("page crashed")
+            return ProductSearch(
+                name=url, regular_price=1.0, url=url, supermarket="jumbo"
+            )
+        finally:
+            self.active -= 1
+
+
+async def collect(scraper, urls, concurrency=3):
+    """Collect all yielded (url, product) pairs."""
+    return [item async for item in scraper.get_product_details_many(urls, concurrency)]
+
+
+class TestGetProductDetailsMany:
+    """Tests for BaseScraper.get_product_details_many."""
+
+    @pytest.mark.asyncio
+    async def test_reuses_contexts_with_bounded_concurrency(self):
+        """Test that a few contexts serve every URL concurrently."""
+        scraper = FakeDetailScraper()
+        urls = [f"https://www.jumbo.com/p/{i}" for i in range(12)]
+
+        results = await collect(scraper, urls, concurrency=3)
+
+        assert sorted(url for url, _ in results) == sorted(urls)
+        assert all(product is not None for _, product in results)
+        assert scraper.leases == 3
+        assert scraper.max_active == 3
+
+    @pytest.mark.asyncio
+    async def test_failures_are_isolated(self):
+        """Test that a failing URL yields None and the rest still succeed."""
+        scraper = FakeDetailScraper()
+        urls = [
+            "https://www.jumbo.com/p/1",
+            "https://www.jumbo.com/bad",
+            "https://www.jumbo.com/p/2",
+        ]
+
+        results = dict(await collect(scraper, urls))
+
+        assert results["https://www.jumbo.com/bad"] is None
+        assert results["https://www.jumbo.com/p/1"] is not None
+        assert results["https://www.jumbo.com/p/2"] is not None
+
+    @pytest.mark.asyncio
+    async def test_crashed_page_is_replaced(self):
+        """Test that a worker opens a new context after its page crashed."""
+        scraper = FakeDetailScraper(crash_on="https://www.jumbo.com/p/0")
+        urls = [f"https://www.jumbo.com/p/{i}" for i in range(4)]
+
+        results = dict(await collect(scraper, urls, concurrency=1))
+
+        assert results["https://www.jumbo.com/p/0"] is None
+        assert all(results[url] is not None for url in urls[1:])
+        assert scraper.leases == 2
+
+    @pytest.mark.asyncio
+    async def test_streams_results_as_ready(self):
+        """Test that the first result arrives before the batch is done."""
+        scraper = FakeDetailScraper(delay=0.05)
+        urls = [f"https://www.jumbo.com/p/{i}" for i in range(6)]
+
+        stream = scraper.get_product_details_many(urls, concurrency=2)
+        await anext(stream)
+
+        assert scraper.leases == 2
+        assert scraper.active <= 2
+        await stream.aclose()
+
+    @pytest.mark.asyncio
+    async def test_empty_batch(self):
+        """Test that no URLs yields nothing and opens no context."""
+        scraper = FakeDetailScraper()
+
+        assert await collect(scraper, []) == []
+        assert scraper.leases == 0
+
+
+class TestAHApiDetailsMany:
+    """Tests for AlbertHeijnAPIScraper.get_product_details_many."""
+
+    @pytest.mark.asyncio
+    async def test_fetches_all_products(self, monkeypatch):
+        """Test that every product id is fetched and failures give None."""
+        from src.scrapers import ah_api
+
+        monkeypatch.setattr(ah_api, "_token", None)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/anonymous"):
+                return httpx.Response(200, json={"access_token": "t"})
+            product_id = request.url.path.rsplit("/", 1)[-1]
+            if product_id == "999":
+                return httpx.Response(500)
+            card = {"title": f"Product {product_id}", "currentPrice": 1.0}
+            return httpx.Response(200, json={"productCard": card})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        scraper = AlbertHeijnAPIScraper(client=client)
+
+        results = dict(
+            [item async for item in scraper.get_product_details_many(["1", "2", "999"])]
+        )
+
+        assert results["1"].name == "Product 1"
+        assert results["999"] is None
@@ -0,0 +1,93 @@
+"""Unit tests for the per-host token-bucket rate limiter."""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.config.settings import get_settings
+from src.scrapers import rate_limiter
+from src.scrapers.rate_limiter import TokenBucket, get_rate_limiter
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_not_delayed(self):
+        """Test that requests within the burst capacity do not wait."""
+        bucket = TokenBucket(rate=1.0, capacity=3)
+
+        waits = [await bucket.acquire() for _ in range(3)]
+
+        assert waits == [0.0, 0.0, 0.0]
+
+    @pytest.mark.asyncio
+    async def test_waits_when_empty(self):
+        """Test that a request beyond the burst waits for a refill."""
+        bucket = TokenBucket(rate=20.0, capacity=1)
+        await bucket.acquire()
+
+        start = time.monotonic()
+        waited = await bucket.acquire()
+
+        assert waited > 0
+        assert time.monotonic() - start >= 0.04
+
+    @pytest.mark.asyncio
+    async def test_bounds_concurrent_callers(self):
+        """Test that concurrent callers share one rate budget."""
+        bucket = TokenBucket(rate=50.0, capacity=2)
+
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(6)))
+
+        # 2 from the burst, 4 more at 50/s take at least ~80ms
+        assert time.monotonic() - start >= 0.07
+
+    @pytest.mark.asyncio
+    async def test_idle_period_refills(self):
+        """Test that tokens accrue again while idle, up to capacity."""
+        bucket = TokenBucket(rate=100.0, capacity=2)
+        await bucket.acquire()
+        await bucket.acquire()
+
+        await asyncio.sleep(0.05)
+
+        assert bucket.tokens == pytest.approx(2.0)
+
+    def test_get_rate_limiter_is_shared_per_host(self):
+        """Test that the same bucket is returned for the same host."""
+        assert get_rate_limiter("www.ah.nl") is get_rate_limiter("www.ah.nl")
+        assert get_rate_limiter("www.ah.nl") is not get_rate_limiter("www.dirk.nl")
+
+    @pytest.mark.asyncio
+    async def test_zero_rate_limit_never_waits(self, monkeypatch):
+        """Test that a scrape_rate_limit of 0 disables the delay."""
+        monkeypatch.setattr(rate_limiter, "_buckets", {})
+        monkeypatch.setattr(get_settings(), "scrape_rate_limit", 0.0)
+        bucket = get_rate_limiter("www.ah.nl")
+
+        waits = [await bucket.acquire() for _ in range(10)]
+
+        assert waits == [0.0] * 10
+
+    def test_shared_across_event_loops(self):
+        """Test that loops in different threads share one bucket."""
+        bucket = TokenBucket(rate=100.0, capacity=1)
+
+        async def burst():
+            return await asyncio.gather(*(bucket.acquire() for _ in range(3)))
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            waits = [
+                w
+                for result in pool.map(asyncio.run, [burst(), burst()])
+                for w in result
+            ]
+
+        # One token from the burst, then one every 10ms across both loops
+        assert sorted(waits) == pytest.approx(
+            [0.0, 0.01, 0.02, 0.03, 0.04, 0.05], abs=0.005
+        )
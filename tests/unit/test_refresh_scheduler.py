@@ -0,0 +1,237 @@
+"""Unit tests for the staleness-driven refresh scheduler."""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.database.crud import (
+    create_favorite_product,
+    get_popular_queries,
+    log_search,
+)
+from src.database.models import PriceRecordDB
+from src.models.product import ProductSearch
+from src.scrapers.rate_limiter import TokenBucket
+from src.services import circuit_breaker
+from src.services.refresh_scheduler import (
+    KIND_PRODUCT,
+    KIND_QUERY,
+    MAX_STALENESS,
+    RefreshJob,
+    RefreshScheduler,
+)
+from src.services.scraper_service import ScraperService
+from src.services.search_cache import SearchCache
+
+
+class CountingScraper:
+    """Scraper stand-in that counts searches and in-flight calls."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.queries: list[str] = []
+        self.details: list[str] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def search_product(self, query: str):
+        self.queries.append(query)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return [self._product(query, f"https://{self.name}.nl/{query}")]
+
+    async def get_product_details(self, url: str):
+        self.details.append(url)
+        return self._product("favoriet", url)
+
+    def _product(self, name: str, url: str) -> ProductSearch:
+        return ProductSearch(
+            name=name, regular_price=1.0, url=url, supermarket=self.name
+        )
+
+
+@pytest.fixture
+def scheduler(monkeypatch, db_manager):
+    """Create a scheduler over fake scrapers and an in-memory database."""
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    service = ScraperService()
+    service.cache = SearchCache(max_entries=100, max_bytes=1_000_000)
+    service.scrapers = {
+        "jumbo": CountingScraper("jumbo"),
+        "dirk": CountingScraper("dirk"),
+    }
+    scheduler = RefreshScheduler(service, db_manager)
+    scheduler.min_popularity = 2
+    scheduler.store_budget = 3600
+    return scheduler
+
+
+def search(db_manager, query: str, times: int) -> None:
+    """Log a number of user searches for a query."""
+    with db_manager.get_session() as session:
+        for _ in range(times):
+            log_search(session, query)
+
+
+class TestCollectJobs:
+    """Tests for RefreshScheduler.collect_jobs."""
+
+    def test_popular_queries_are_hot(self, scheduler, db_manager):
+        """Test that only queries above the popularity threshold are scheduled."""
+        search(db_manager, "melk", 5)
+        search(db_manager, "kaviaar", 1)
+
+        jobs = scheduler.collect_jobs()
+
+        assert {(j.supermarket, j.target) for j in jobs} == {
+            ("jumbo", "melk"),
+            ("dirk", "melk"),
+        }
+        assert all(j.popularity == 5 for j in jobs)
+
+    def test_favorites_add_queries_and_products(self, scheduler, db_manager):
+        """Test that favorites supply their query and matched product pages."""
+        scraper = scheduler.service.scrapers["jumbo"]
+        product = scraper._product("pindakaas", "https://jumbo.nl/pindakaas")
+        with db_manager.get_session() as session:
+            scheduler.service.save_products(session, "jumbo", [product])
+            product_id = session.query(PriceRecordDB).one().product_id
+            create_favorite_product(
+                session,
+                user_query="Pindakaas",
+                matched_product_ids={"jumbo": product_id},
+            )
+
+        jobs = scheduler.collect_jobs()
+
+        assert RefreshJob("jumbo", KIND_QUERY, "pindakaas", 5.0) in jobs
+        assert (
+            RefreshJob("jumbo", KIND_PRODUCT, "https://jumbo.nl/pindakaas", 5.0) in jobs
+        )
+
+
+class TestPlan:
+    """Tests for RefreshScheduler.plan."""
+
+    def test_orders_by_popularity_and_staleness(self, scheduler):
+        """Test that hot, stale jobs come first and fresh ones are left out."""
+        hot = RefreshJob("jumbo", KIND_QUERY, "melk", 10)
+        warm = RefreshJob("jumbo", KIND_QUERY, "brood", 3)
+        fresh = RefreshJob("jumbo", KIND_QUERY, "kaas", 50)
+        scheduler.refreshed[fresh.key] = 1000.0
+
+        assert scheduler.plan([warm, fresh, hot], now=1010.0) == [hot, warm]
+
+    def test_cached_results_count_as_fresh(self, scheduler):
+        """Test that results cached by a user search are not refreshed again."""
+        job = RefreshJob("jumbo", KIND_QUERY, "melk", 10)
+        scheduler.service.cache.set("jumbo", "Melk", [], ttl=3600)
+
+        assert scheduler.staleness(job) < 0.01
+        assert scheduler.plan([job]) == []
+
+    def test_never_refreshed_is_most_stale(self, scheduler):
+        """Test that unknown items get the maximum staleness."""
+        job = RefreshJob("dirk", KIND_QUERY, "melk", 1)
+
+        assert scheduler.staleness(job) == MAX_STALENESS
+
+    def test_respects_store_budget(self, scheduler):
+        """Test that a store's budget caps its jobs but not other stores'."""
+        scheduler.budgets["jumbo"] = TokenBucket(rate=0.0001, capacity=1)
+        jobs = [RefreshJob("jumbo", KIND_QUERY, q, 5) for q in ("melk", "kaas")]
+        jobs.append(RefreshJob("dirk", KIND_QUERY, "melk", 1))
+
+        selected = scheduler.plan(jobs)
+
+        assert [(j.supermarket, j.target) for j in selected] == [
+            ("jumbo", "melk"),
+            ("dirk", "melk"),
+        ]
+        assert scheduler.budget_skips == 1
+
+    def test_caps_jobs_per_round(self, scheduler):
+        """Test that at most max_jobs are selected per round."""
+        scheduler.max_jobs = 2
+        jobs = [RefreshJob("jumbo", KIND_QUERY, str(i), 5) for i in range(5)]
+
+        assert len(scheduler.plan(jobs)) == 2
+
+
+class TestRunOnce:
+    """Tests for RefreshScheduler.run_once."""
+
+    @pytest.mark.asyncio
+    async def test_refreshes_hot_items_once(self, scheduler, db_manager):
+        """Test that a round refreshes hot items and the next one skips them."""
+        search(db_manager, "melk", 3)
+        search(db_manager, "kaviaar", 1)
+
+        first = await scheduler.run_once()
+        second = await scheduler.run_once()
+
+        assert first["refreshed"] == 2
+        assert second["selected"] == 0
+        assert scheduler.service.scrapers["jumbo"].queries == ["melk"]
+        with db_manager.get_session() as session:
+            assert session.query(PriceRecordDB).count() == 2
+
+    @pytest.mark.asyncio
+    async def test_collects_jobs_off_the_event_loop(self, monkeypatch, scheduler):
+        """Test that the blocking job collection runs in a worker thread."""
+        threads = []
+
+        def collect_jobs():
+            threads.append(threading.get_ident())
+            return []
+
+        monkeypatch.setattr(scheduler, "collect_jobs", collect_jobs)
+
+        await scheduler.run_once()
+
+        assert threads and threads[0] != threading.get_ident()
+
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency(self, scheduler, db_manager):
+        """Test that no more than `concurrency` jobs run at once."""
+        scheduler.concurrency = 2
+        for query in ("melk", "brood", "kaas", "eieren"):
+            search(db_manager, query, 2)
+        del scheduler.service.scrapers["dirk"]
+
+        result = await scheduler.run_once()
+
+        assert result["refreshed"] == 4
+        assert scheduler.service.scrapers["jumbo"].max_active == 2
+
+    @pytest.mark.asyncio
+    async def test_queue_mode_enqueues_for_workers(self, scheduler, db_manager):
+        """Test that queue mode hands jobs to workers instead of scraping."""
+        from src.database.crud import get_scrape_job_counts
+
+        scheduler.use_queue = True
+        search(db_manager, "melk", 3)
+
+        result = await scheduler.run_once()
+
+        assert result["enqueued"] == 2
+        assert scheduler.service.scrapers["jumbo"].queries == []
+        with db_manager.get_session() as session:
+            assert get_scrape_job_counts(session) == {"pending": 2}
+
+
+class TestSearchLog:
+    """Tests for the search log queries."""
+
+    def test_popular_queries_are_counted(self, db_session):
+        """Test that queries are counted and ordered by popularity."""
+        from datetime import datetime, timedelta
+
+        for query in ("melk", "melk", "brood"):
+            log_search(db_session, query)
+
+        since = datetime.utcnow() - timedelta(days=1)
+        assert get_popular_queries(db_session, since) == [("melk", 2), ("brood", 1)]
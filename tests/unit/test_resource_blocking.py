@@ -0,0 +1,75 @@
+"""Unit tests for the scraper resource blocker."""
+
+import pytest
+
+from src.scrapers.resource_blocking import BlockingStats, ResourceBlocker
+
+
+class FakeRequest:
+    """Stand-in for a playwright request."""
+
+    def __init__(self, url: str, resource_type: str):
+        self.url = url
+        self.resource_type = resource_type
+
+
+class FakeRoute:
+    """Stand-in for a playwright route that records the decision."""
+
+    def __init__(self, url: str, resource_type: str):
+        self.request = FakeRequest(url, resource_type)
+        self.outcome: str | None = None
+
+    async def abort(self):
+        self.outcome = "aborted"
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+
+@pytest.fixture
+def blocker():
+    """Create a blocker with fresh counters."""
+    blocker = ResourceBlocker(
+        "test_store", ["image", "font"], ["doubleclick.net", "Hotjar.com"]
+    )
+    blocker.stats = BlockingStats()
+    return blocker
+
+
+class TestResourceBlocker:
+    """Tests for ResourceBlocker."""
+
+    def test_block_by_resource_type(self, blocker):
+        """Test that configured resource types are blocked."""
+        reason = blocker.block_reason("image", "https://www.ah.nl/img.png")
+        assert reason == "type:image"
+
+    def test_block_by_domain_and_subdomain(self, blocker):
+        """Test that blocklisted domains and their subdomains are blocked."""
+        assert blocker.block_reason("script", "https://doubleclick.net/a.js")
+        assert blocker.block_reason("xhr", "https://static.hotjar.com/c.js")
+
+    def test_allow_similar_domain(self, blocker):
+        """Test that a domain merely ending in the same text is allowed."""
+        assert blocker.block_reason("script", "https://notdoubleclick.net/a.js") is None
+
+    def test_allow_document(self, blocker):
+        """Test that the page document itself is never blocked."""
+        assert blocker.block_reason("document", "https://www.jumbo.com/zoeken") is None
+
+    @pytest.mark.asyncio
+    async def test_handle_updates_counters(self, blocker):
+        """Test that intercepted requests are counted."""
+        blocked = FakeRoute("https://www.ah.nl/font.woff2", "font")
+        allowed = FakeRoute("https://www.ah.nl/zoeken", "document")
+
+        await blocker._handle(blocked)
+        await blocker._handle(allowed)
+
+        assert blocked.outcome == "aborted"
+        assert allowed.outcome == "continued"
+        assert blocker.stats.requests_blocked == 1
+        assert blocker.stats.requests_allowed == 1
+        assert blocker.stats.bytes_saved_estimate > 0
+        assert blocker.stats.blocked_by_reason == {"type:font": 1}
@@ -0,0 +1,96 @@
+"""Unit tests for deadline-bounded multi-store search."""
+
+import asyncio
+
+import pytest
+
+from src.models.product import ProductSearch
+from src.services import circuit_breaker
+from src.services.scraper_service import ScraperService
+from src.services.search_cache import SearchCache
+
+
+class SlowScraper:
+    """Scraper stand-in with a fixed latency."""
+
+    def __init__(self, name: str, delay: float, fail: bool = False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.finished = False
+        self.cancelled = False
+
+    async def search_product(self, query: str):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.fail:
+            raise RuntimeError("layout changed")
+        self.finished = True
+        return [
+            ProductSearch(
+                name=f"{self.name} {query}",
+                regular_price=1.0,
+                url="",
+                supermarket=self.name,
+            )
+        ]
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """Create a service with fake scrapers and a private cache."""
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    service = ScraperService()
+    service.cache = SearchCache(max_entries=100, max_bytes=1_000_000)
+    service.scrapers = {
+        "jumbo": SlowScraper("jumbo", 0.01),
+        "dirk": SlowScraper("dirk", 0.01, fail=True),
+        "plus": SlowScraper("plus", 0.5),
+    }
+    return service
+
+
+class TestSearchDeadline:
+    """Tests for ScraperService.search_all_with_status."""
+
+    @pytest.mark.asyncio
+    async def test_returns_partial_results_at_deadline(self, service):
+        """Test that a slow store does not hold up the others."""
+        outcome = await service.search_all_with_status("melk", deadline=0.1)
+
+        assert outcome.elapsed < 0.4
+        assert outcome.status == {"jumbo": "ok", "dirk": "error", "plus": "timed_out"}
+        assert len(outcome.results["jumbo"]) == 1
+        assert outcome.results["plus"] == []
+        assert list(outcome.results) == ["jumbo", "dirk", "plus"]
+
+    @pytest.mark.asyncio
+    async def test_stragglers_warm_cache(self, service):
+        """Test that timed-out stores finish in the background."""
+        service.finish_in_background = True
+        await service.search_all_with_status("melk", deadline=0.1)
+
+        await asyncio.sleep(0.6)
+
+        assert service.scrapers["plus"].finished
+        assert service.cache.get("plus", "melk") is not None
+
+    @pytest.mark.asyncio
+    async def test_stragglers_cancelled(self, service):
+        """Test that timed-out stores are stopped when not kept running."""
+        service.finish_in_background = False
+        await service.search_all_with_status("melk", deadline=0.1)
+
+        await asyncio.sleep(0.05)
+
+        assert service.scrapers["plus"].cancelled
+
+    @pytest.mark.asyncio
+    async def test_no_deadline_waits_for_all(self, service):
+        """Test that a zero deadline waits for every store."""
+        results = await service.search_all_supermarkets("melk", deadline=0)
+
+        assert len(results["plus"]) == 1
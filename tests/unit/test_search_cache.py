@@ -0,0 +1,92 @@
+"""Unit tests for the search result cache."""
+
+import time
+
+import pytest
+
+from src.models.product import ProductSearch
+from src.services.search_cache import SearchCache, normalize_query
+
+
+def make_products(name: str, count: int = 1) -> list[ProductSearch]:
+    """Create search results for a product name."""
+    return [
+        ProductSearch(
+            name=f"{name} {i}",
+            regular_price=1.0,
+            url=f"https://example.com/{name}/{i}",
+            supermarket="jumbo",
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def cache():
+    """Create a small cache."""
+    return SearchCache(max_entries=3, max_bytes=1_000_000)
+
+
+class TestNormalizeQuery:
+    """Tests for cache key normalization."""
+
+    def test_case_and_whitespace(self):
+        """Test that case and extra whitespace do not change the key."""
+        assert normalize_query("  Halfvolle   MELK ") == "halfvolle melk"
+
+
+class TestSearchCache:
+    """Tests for SearchCache."""
+
+    def test_miss_then_hit(self, cache):
+        """Test that stored results are returned for an equivalent query."""
+        assert cache.get("jumbo", "melk") is None
+
+        cache.set("jumbo", "melk", make_products("melk"), ttl=60)
+
+        assert cache.get("jumbo", " MELK") == make_products("melk")
+        assert cache.get("dirk", "melk") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 2
+
+    def test_expired_entry(self, cache, monkeypatch):
+        """Test that entries are dropped once their TTL has passed."""
+        cache.set("jumbo", "melk", make_products("melk"), ttl=60)
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+
+        assert cache.get("jumbo", "melk") is None
+        assert len(cache) == 0
+        assert cache.stats()["expirations"] == 1
+
+    def test_evicts_least_recently_used(self, cache):
+        """Test that the least recently used entry goes when full."""
+        for query in ["a", "b", "c"]:
+            cache.set("jumbo", query, make_products(query), ttl=60)
+        cache.get("jumbo", "a")
+
+        cache.set("jumbo", "d", make_products("d"), ttl=60)
+
+        assert cache.get("jumbo", "b") is None
+        assert cache.get("jumbo", "a") is not None
+        assert len(cache) == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_evicts_by_size(self):
+        """Test that the memory limit bounds the cache."""
+        entry_size = sum(len(p.model_dump_json()) for p in make_products("x", 5))
+        cache = SearchCache(max_entries=100, max_bytes=entry_size * 2)
+
+        for query in ["x", "y", "z"]:
+            cache.set("jumbo", query, make_products("x", 5), ttl=60)
+
+        assert len(cache) == 2
+        assert cache.total_bytes <= cache.max_bytes
+
+    def test_invalidate(self, cache):
+        """Test that invalidating removes a single entry."""
+        cache.set("jumbo", "melk", make_products("melk"), ttl=60)
+        cache.invalidate("jumbo", "melk")
+
+        assert cache.get("jumbo", "melk") is None
+        assert cache.total_bytes == 0
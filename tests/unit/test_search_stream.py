@@ -0,0 +1,89 @@
+"""Unit tests for the streaming search endpoint."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.api import routes
+from src.api.routes import router
+from src.models.product import ProductSearch
+from src.services import circuit_breaker
+from src.services.price_service import PriceService
+
+
+class DelayedScraper:
+    """Scraper stand-in that answers after a delay."""
+
+    def __init__(self, name: str, delay: float, price: float):
+        self.name = name
+        self.delay = delay
+        self.price = price
+
+    async def search_product(self, query: str):
+        await asyncio.sleep(self.delay)
+        return [
+            ProductSearch(
+                name=f"Halfvolle melk {self.name}",
+                regular_price=self.price,
+                url="",
+                supermarket=self.name,
+            )
+        ]
+
+
+@pytest.fixture
+def price_service(monkeypatch):
+    """Create a price service whose scrapers answer at different speeds."""
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    service = PriceService()
+    service.matcher_service.similarity_threshold = 0.3
+    service.log_searches = False
+    service.scraper_service.cache = None
+    service.scraper_service.finish_in_background = False
+    service.scraper_service.scrapers = {
+        "plus": DelayedScraper("plus", 0.2, 1.19),
+        "dirk": DelayedScraper("dirk", 0.01, 1.09),
+        "picnic": DelayedScraper("picnic", 2.0, 0.99),
+    }
+    return service
+
+
+class TestStreamSearch:
+    """Tests for PriceService.stream_search and POST /api/search/stream."""
+
+    @pytest.mark.asyncio
+    async def test_events_in_completion_order(self, price_service):
+        """Test that fast stores are emitted first and a summary comes last."""
+        stream = price_service.stream_search("halfvolle melk", deadline=0.5)
+        events = [event async for event in stream]
+
+        stores = [e.get("supermarket") for e in events]
+        assert stores == ["dirk", "plus", "picnic", None]
+        assert events[0]["result"]["best_price"] == 1.09
+        assert events[2]["status"] == "timed_out"
+        summary = events[-1]
+        assert summary["event"] == "summary"
+        assert summary["status"] == {"dirk": "ok", "plus": "ok", "picnic": "timed_out"}
+        assert summary["cheapest"]["supermarket"] == "dirk"
+
+    @pytest.mark.asyncio
+    async def test_endpoint_streams_ndjson(self, price_service, monkeypatch):
+        """Test that the endpoint writes one JSON object per line."""
+        monkeypatch.setattr(routes, "PriceService", lambda: price_service)
+        app = FastAPI()
+        app.include_router(router)
+
+        transport = httpx.ASGITransport(app=app)
+        request = {"query": "halfvolle melk", "deadline": 0.5}
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            response = await client.post("/api/search/stream", json=request)
+
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[0]["supermarket"] == "dirk"
+        assert lines[-1]["event"] == "summary"
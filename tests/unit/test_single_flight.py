@@ -0,0 +1,107 @@
+"""Unit tests for single-flight request coalescing."""
+
+import asyncio
+
+import pytest
+
+from src.services.single_flight import SingleFlight
+
+
+class Counter:
+    """Slow coroutine factory that counts how often it runs."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return ["result"]
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_task(self):
+        """Test that identical concurrent calls run the work once."""
+        flights = SingleFlight()
+        work = Counter()
+
+        results = await asyncio.gather(*(flights.do("melk", work) for _ in range(5)))
+
+        assert work.calls == 1
+        assert results == [["result"]] * 5
+        assert flights.stats() == {"in_flight": 0, "started": 1, "coalesced": 4}
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        """Test that different keys do not share work."""
+        flights = SingleFlight()
+        work = Counter()
+
+        await asyncio.gather(flights.do("melk", work), flights.do("kaas", work))
+
+        assert work.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_finished_task_is_not_reused(self):
+        """Test that a call after completion starts new work."""
+        flights = SingleFlight()
+        work = Counter(delay=0)
+
+        await flights.do("melk", work)
+        await flights.do("melk", work)
+
+        assert work.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_work(self):
+        """Test that one caller giving up leaves the others unaffected."""
+        flights = SingleFlight()
+        work = Counter(delay=0.1)
+
+        first = asyncio.create_task(flights.do("melk", work))
+        second = asyncio.create_task(flights.do("melk", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == ["result"]
+        assert first.cancelled()
+        assert work.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_exception_reaches_all_callers(self):
+        """Test that a failure is raised to every waiting caller."""
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("blocked")
+
+        results = await asyncio.gather(
+            flights.do("melk", fail), flights.do("melk", fail), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert flights.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_abandoned_work_is_cancelled(self):
+        """Test that the work stops once every caller has given up."""
+        flights = SingleFlight()
+        started = asyncio.Event()
+
+        async def slow():
+            started.set()
+            await asyncio.sleep(10)
+
+        callers = [asyncio.create_task(flights.do("melk", slow)) for _ in range(2)]
+        await started.wait()
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert flights.in_flight() == 0
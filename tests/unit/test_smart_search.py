@@ -0,0 +1,143 @@
+"""Unit tests for smart search variation fan-out."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.models.product import ProductSearch
+from src.services import smart_search as smart_search_module
+from src.services.search_cache import get_search_cache
+from src.services.smart_search import (
+    calculate_basket_comparison,
+    search_variations,
+    smart_search,
+)
+
+
+class FakeAHScraper:
+    """Stand-in for the AH API client with per-query latency."""
+
+    def __init__(self, delays: dict[str, float]):
+        self.delays = delays
+        self.running = 0
+        self.max_running = 0
+
+    async def search_product(self, query: str, limit: int = 10):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delays.get(query, 0.01))
+            return [
+                ProductSearch(
+                    name=f"AH {query}",
+                    regular_price=1.0,
+                    url=f"https://www.ah.nl/{query}",
+                    supermarket="albert_heijn",
+                )
+            ]
+        finally:
+            self.running -= 1
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Start each test with an empty search cache."""
+    get_search_cache().clear()
+    yield
+    get_search_cache().clear()
+
+
+async def collect(scraper, variations, concurrency=4, deadline=1.0):
+    """Collect all yielded batches."""
+    return [
+        batch
+        async for batch in search_variations(scraper, variations, concurrency, deadline)
+    ]
+
+
+class TestSearchVariations:
+    """Tests for concurrent variation fan-out."""
+
+    @pytest.mark.asyncio
+    async def test_runs_concurrently(self):
+        """Test that latency is that of the slowest search, not the sum."""
+        scraper = FakeAHScraper({q: 0.1 for q in "abcde"})
+
+        start = time.monotonic()
+        batches = await collect(scraper, list("abcde"), concurrency=5)
+
+        assert len(batches) == 5
+        assert time.monotonic() - start < 0.3
+
+    @pytest.mark.asyncio
+    async def test_respects_concurrency_limit(self):
+        """Test that no more than `concurrency` searches run at once."""
+        scraper = FakeAHScraper({})
+
+        await collect(scraper, list("abcdef"), concurrency=2)
+
+        assert scraper.max_running == 2
+
+    @pytest.mark.asyncio
+    async def test_drops_results_after_deadline(self):
+        """Test that slow variations are dropped at the deadline."""
+        scraper = FakeAHScraper({"fast": 0.01, "slow": 5.0})
+
+        start = time.monotonic()
+        batches = await collect(scraper, ["fast", "slow"], deadline=0.2)
+
+        assert [b[0].name for b in batches] == ["AH fast"]
+        assert time.monotonic() - start < 1.0
+        await asyncio.sleep(0)
+        assert scraper.running == 0
+
+    @pytest.mark.asyncio
+    async def test_smart_search_dedupes_merged_results(self, monkeypatch):
+        """Test that identical products from several variations appear once."""
+
+        class SameProductScraper(FakeAHScraper):
+            async def search_product(self, query, limit=10):
+                return await super().search_product("melk", limit)
+
+        monkeypatch.setattr(
+            smart_search_module, "AlbertHeijnAPIScraper", lambda: SameProductScraper({})
+        )
+
+        results = await smart_search("melk")
+
+        assert [p.name for p in results["albert_heijn"]] == ["AH melk"]
+
+    @pytest.mark.asyncio
+    async def test_basket_shares_concurrency_limit(self, monkeypatch):
+        """Test that a basket's searches share one concurrency limit."""
+        scraper = FakeAHScraper({})
+        monkeypatch.setattr(
+            smart_search_module, "AlbertHeijnAPIScraper", lambda: scraper
+        )
+        monkeypatch.setattr(
+            smart_search_module.get_settings(), "smart_search_concurrency", 2
+        )
+
+        await calculate_basket_comparison(
+            [{"product_name": name} for name in ["melk", "kaas", "brood", "eieren"]]
+        )
+
+        assert scraper.max_running == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_is_separate_from_store_searches(self):
+        """Test that ScraperService cache entries are not served as variations."""
+        cache = get_search_cache()
+        store_result = ProductSearch(
+            name="AH melk (store search)",
+            regular_price=2.0,
+            url="",
+            supermarket="albert_heijn",
+        )
+        cache.set("albert_heijn", "melk", [store_result], 60)
+
+        batches = await collect(FakeAHScraper({}), ["melk"])
+
+        assert [b[0].name for b in batches] == ["AH melk"]
+        assert cache.get("albert_heijn", "melk") == [store_result]
@@ -0,0 +1,81 @@
+"""Unit tests for the throughput benchmark's stand-in store server."""
+
+import pytest
+
+from benchmarks.bench_throughput import percentiles
+from benchmarks.standin_server import StandinConfig, StandinServer, point_supermarkets
+from src.config.constants import SUPERMARKETS
+from src.scrapers import ConfiguredScraper, rate_limiter
+from src.scrapers.http_client import close_http_client
+
+
+@pytest.fixture(autouse=True)
+def no_rate_limit(monkeypatch):
+    """Give every test fresh rate limiter buckets."""
+    monkeypatch.setattr(rate_limiter, "_buckets", {})
+
+
+class TestStandinServer:
+    """Tests for the stand-in server and SUPERMARKETS patching."""
+
+    @pytest.mark.asyncio
+    async def test_serves_html_and_json_fast_paths(self):
+        """Test that scrapers pointed at the stand-in parse its pages."""
+        original = SUPERMARKETS["jumbo"]["search_url"]
+        with StandinServer() as server, point_supermarkets(server.url):
+            try:
+                dirk = await ConfiguredScraper("dirk")._search_http("melk")
+                jumbo = await ConfiguredScraper("jumbo")._search_http("melk")
+            finally:
+                await close_http_client()
+
+        assert len(dirk) == 10
+        assert dirk[0].url.startswith(f"{server.url}/dirk/")
+        assert len(jumbo) == 10
+        assert jumbo[0].regular_price > 0
+        assert SUPERMARKETS["jumbo"]["search_url"] == original
+
+    def test_later_pages_point_at_standin(self):
+        """Test that no store's page URLs are left pointing at the live site."""
+        url = "http://127.0.0.1:1"
+        with point_supermarkets(url):
+            templates = [
+                config["pagination"][key]
+                for config in SUPERMARKETS.values()
+                for key in ("url", "fast_path_url")
+                if key in config.get("pagination", {})
+            ]
+
+        assert templates
+        assert all(template.startswith(f"{url}/") for template in templates)
+        assert SUPERMARKETS["jumbo"]["pagination"]["url"].startswith(
+            "https://www.jumbo.com/"
+        )
+
+    @pytest.mark.asyncio
+    async def test_injected_failures_fall_back_to_browser(self):
+        """Test that failed requests are reported as blocked HTTP responses."""
+        config = StandinConfig(failure_rate=1.0, failure_status=503)
+        with StandinServer(config) as server, point_supermarkets(server.url):
+            try:
+                results = await ConfiguredScraper("dirk")._search_http("melk")
+            finally:
+                await close_http_client()
+
+        assert results is None
+
+
+class TestPercentiles:
+    """Tests for latency percentiles."""
+
+    def test_percentiles(self):
+        """Test p50, p95 and p99 over evenly spread values."""
+        result = percentiles([float(value) for value in range(1, 101)])
+
+        assert result["p50"] == pytest.approx(50.5)
+        assert result["p95"] == pytest.approx(95.05)
+        assert result["p99"] == pytest.approx(99.01)
+
+    def test_single_value(self):
+        """Test that one sample is every percentile."""
+        assert percentiles([12.0]) == {"p50": 12.0, "p95": 12.0, "p99": 12.0}
@@ -0,0 +1,109 @@
+"""Unit tests for per-stage scrape timing."""
+
+import httpx
+import pytest
+
+from benchmarks.synthetic import listing_page
+from src.scrapers import BaseScraper, ConfiguredScraper, base_scraper, timing
+from src.scrapers.timing import (
+    STAGE_HTTP_FETCH,
+    STAGE_PARSE,
+    STAGE_TOTAL,
+    Histogram,
+    get_timing_metrics,
+    get_timing_summary,
+    record_span,
+    scrape_trace,
+    span,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_histograms(monkeypatch):
+    """Give every test empty timing histograms."""
+    monkeypatch.setattr(timing, "_histograms", {})
+
+
+class TestHistogram:
+    """Tests for Histogram."""
+
+    def test_percentiles_use_bucket_bounds(self):
+        """Test that percentiles are estimated from bucket upper bounds."""
+        histogram = Histogram()
+        for ms in [3.0] * 90 + [40.0] * 9 + [700.0]:
+            histogram.record(ms)
+
+        snapshot = histogram.snapshot()
+
+        assert snapshot["count"] == 100
+        assert snapshot["p50_ms"] == 5
+        assert snapshot["p95_ms"] == 50
+        assert snapshot["p99_ms"] == 50
+        assert snapshot["max_ms"] == 700.0
+        assert snapshot["buckets"]["5"] == 90
+        assert snapshot["buckets"]["1000"] == 1
+
+    def test_percentile_capped_at_max(self):
+        """Test that a percentile never exceeds the largest observation."""
+        histogram = Histogram()
+        histogram.record(60.0)
+
+        assert histogram.percentile(50) == 60.0
+
+
+class TestSpans:
+    """Tests for spans and traces."""
+
+    def test_trace_collects_spans_of_its_store(self):
+        """Test that a trace keeps its own store's spans and records the total."""
+        with scrape_trace("jumbo", "melk") as trace:
+            with span("jumbo", "navigate"):
+                pass
+            record_span("dirk", "navigate", 0.5)
+
+        assert [stage for stage, _ in trace.spans] == ["navigate"]
+        metrics = get_timing_metrics()
+        assert metrics["jumbo"][STAGE_TOTAL]["count"] == 1
+        assert metrics["dirk"]["navigate"]["count"] == 1
+
+    def test_span_records_when_block_raises(self):
+        """Test that a failing stage is still timed."""
+        with pytest.raises(RuntimeError):
+            with span("jumbo", "ready"):
+                raise RuntimeError("timeout")
+
+        assert get_timing_metrics("jumbo", "ready")["jumbo"]["ready"]["count"] == 1
+
+    def test_summary_orders_stages_by_share(self):
+        """Test that the summary puts the dominant stage first."""
+        record_span("jumbo", "navigate", 0.3)
+        record_span("jumbo", "ready", 0.6)
+        record_span("jumbo", "extract", 0.1)
+        record_span("jumbo", STAGE_TOTAL, 1.0)
+
+        stages = get_timing_summary()["jumbo"]
+
+        assert [s["stage"] for s in stages] == ["ready", "navigate", "extract"]
+        assert stages[0]["share"] == pytest.approx(0.6)
+
+    @pytest.mark.asyncio
+    async def test_http_search_records_stages(self, monkeypatch):
+        """Test that an HTTP tier search records fetch, parse and total spans."""
+        html = listing_page("albert_heijn", "melk")
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, text=html)
+            )
+        )
+        monkeypatch.setattr(base_scraper, "get_http_client", lambda: client)
+
+        async def no_throttle(self, url):
+            return None
+
+        monkeypatch.setattr(BaseScraper, "_throttle", no_throttle)
+
+        results = await ConfiguredScraper("albert_heijn").search_product("melk")
+
+        assert len(results) == 10
+        stages = get_timing_metrics("albert_heijn")["albert_heijn"]
+        assert {STAGE_HTTP_FETCH, STAGE_PARSE, STAGE_TOTAL} <= set(stages)
@@ -0,0 +1,265 @@
+"""Unit tests for the scrape job table and worker."""
+
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.database.crud import (
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_LEASED,
+    JOB_PENDING,
+    complete_scrape_job,
+    enqueue_scrape_job,
+    fail_scrape_job,
+    get_scrape_job_counts,
+    heartbeat_scrape_job,
+    lease_scrape_jobs,
+)
+from src.database.models import PriceRecordDB, ScrapeJobDB
+from src.models.product import ProductSearch
+from src.services import circuit_breaker
+from src.services.scraper_service import ScraperService
+from src.services.worker import ScrapeWorker, enqueue_queries
+
+
+class JobScraper:
+    """Scraper stand-in that fails for chosen queries."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.failing: set[str] = set()
+        self.queries: list[str] = []
+
+    async def search_product(self, query: str):
+        self.queries.append(query)
+        await asyncio.sleep(self.delay)
+        if query in self.failing:
+            raise RuntimeError("blocked")
+        return [
+            ProductSearch(
+                name=query,
+                regular_price=1.0,
+                url=f"https://www.jumbo.com/{query}",
+                supermarket="jumbo",
+            )
+        ]
+
+
+def make_worker(db_manager, scraper, owner: str) -> ScrapeWorker:
+    """Create a worker over a fake scraper."""
+    service = ScraperService()
+    service.cache = None
+    service.scrapers = {"jumbo": scraper}
+    worker = ScrapeWorker(service, db_manager, owner=owner)
+    worker.backoff_base = 0
+    return worker
+
+
+@pytest.fixture(autouse=True)
+def no_breakers(monkeypatch):
+    """Give every test fresh circuit breakers."""
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+
+
+class TestJobQueue:
+    """Tests for the scrape job CRUD operations."""
+
+    def test_enqueue_deduplicates_unfinished_jobs(self, db_session):
+        """Test that an unfinished job for the same target is reused."""
+        first = enqueue_scrape_job(db_session, "jumbo", "melk", priority=1)
+        second = enqueue_scrape_job(db_session, "jumbo", "melk", priority=5)
+
+        assert first.id == second.id
+        assert second.priority == 5
+
+    def test_lease_is_exclusive(self, db_session):
+        """Test that a leased job is not handed to another worker."""
+        enqueue_scrape_job(db_session, "jumbo", "melk")
+
+        leased = lease_scrape_jobs(db_session, "a", 10, lease_seconds=60)
+        again = lease_scrape_jobs(db_session, "b", 10, lease_seconds=60)
+
+        assert [job.target for job in leased] == ["melk"]
+        assert leased[0].status == JOB_LEASED
+        assert leased[0].attempts == 1
+        assert again == []
+
+    def test_lease_orders_by_priority(self, db_session):
+        """Test that higher-priority jobs are leased first."""
+        enqueue_scrape_job(db_session, "jumbo", "brood", priority=1)
+        enqueue_scrape_job(db_session, "jumbo", "melk", priority=9)
+
+        leased = lease_scrape_jobs(db_session, "a", 1, lease_seconds=60)
+
+        assert [job.target for job in leased] == ["melk"]
+
+    def test_expired_lease_is_leased_again(self, db_session):
+        """Test that a job whose worker stopped heartbeating is re-leased."""
+        job = enqueue_scrape_job(db_session, "jumbo", "melk")
+        lease_scrape_jobs(db_session, "crashed", 1, lease_seconds=60)
+        job.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db_session.flush()
+
+        leased = lease_scrape_jobs(db_session, "b", 1, lease_seconds=60)
+
+        assert [j.lease_owner for j in leased] == ["b"]
+        assert not complete_scrape_job(db_session, job.id, "crashed", 1)
+        assert not heartbeat_scrape_job(db_session, job.id, "crashed", 60)
+        assert complete_scrape_job(db_session, job.id, "b", 1)
+
+    def test_expired_last_attempt_fails(self, db_session):
+        """Test that an expired lease on the last attempt fails the job."""
+        job = enqueue_scrape_job(db_session, "jumbo", "melk", max_attempts=1)
+        lease_scrape_jobs(db_session, "crashed", 1, lease_seconds=60)
+        job.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db_session.flush()
+
+        leased = lease_scrape_jobs(db_session, "b", 1, lease_seconds=60)
+        db_session.refresh(job)
+
+        assert leased == []
+        assert job.status == JOB_FAILED
+        assert job.last_error == "lease expired"
+
+    def test_heartbeat_extends_lease(self, db_session):
+        """Test that a heartbeat pushes the lease expiry forward."""
+        job = enqueue_scrape_job(db_session, "jumbo", "melk")
+        lease_scrape_jobs(db_session, "a", 1, lease_seconds=1)
+        db_session.refresh(job)
+        expires = job.lease_expires_at
+
+        assert heartbeat_scrape_job(db_session, job.id, "a", 600)
+        db_session.refresh(job)
+        assert job.lease_expires_at > expires
+
+    def test_failure_backs_off_then_fails(self, db_session):
+        """Test retries with exponential backoff until attempts run out."""
+        job = enqueue_scrape_job(db_session, "jumbo", "melk", max_attempts=2)
+
+        lease_scrape_jobs(db_session, "a", 1, lease_seconds=60)
+        status = fail_scrape_job(db_session, job.id, "a", "blocked", 30, 600)
+        db_session.refresh(job)
+
+        assert status == JOB_PENDING
+        assert job.available_at > datetime.utcnow() + timedelta(seconds=25)
+        assert lease_scrape_jobs(db_session, "a", 1, lease_seconds=60) == []
+
+        job.available_at = datetime.utcnow()
+        db_session.flush()
+        lease_scrape_jobs(db_session, "a", 1, lease_seconds=60)
+        status = fail_scrape_job(db_session, job.id, "a", "blocked", 30, 600)
+
+        assert status == JOB_FAILED
+        assert get_scrape_job_counts(db_session) == {JOB_FAILED: 1}
+
+
+class TestScrapeWorker:
+    """Tests for ScrapeWorker."""
+
+    @pytest.mark.asyncio
+    async def test_runs_jobs_and_saves_results(self, db_manager):
+        """Test that completed jobs write price records."""
+        worker = make_worker(db_manager, JobScraper(), "w1")
+        enqueue_queries(["melk", "kaas"], ["jumbo"], db_manager=db_manager)
+
+        assert await worker.run_once() == 2
+
+        with db_manager.get_session() as session:
+            assert get_scrape_job_counts(session) == {JOB_DONE: 2}
+            assert session.query(PriceRecordDB).count() == 2
+        assert worker.completed == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_job_is_retried(self, db_manager):
+        """Test that a failed job is retried and then succeeds."""
+        scraper = JobScraper()
+        scraper.failing.add("melk")
+        worker = make_worker(db_manager, scraper, "w1")
+        enqueue_queries(["melk"], ["jumbo"], db_manager=db_manager)
+
+        await worker.run_once()
+        scraper.failing.clear()
+        await worker.run_once()
+
+        with db_manager.get_session() as session:
+            job = session.query(ScrapeJobDB).one()
+            assert job.status == JOB_DONE
+            assert job.attempts == 2
+            assert job.last_error == "search error"
+        assert worker.failed == 1
+        assert worker.completed == 1
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_defers_without_attempt(self, db_manager):
+        """Test that a job for a store with an open circuit is put back."""
+        scraper = JobScraper()
+        worker = make_worker(db_manager, scraper, "w1")
+        breaker = circuit_breaker.get_circuit_breaker("jumbo")
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure("blocked")
+        enqueue_queries(["melk"], ["jumbo"], db_manager=db_manager)
+
+        await worker.run_once()
+
+        with db_manager.get_session() as session:
+            job = session.query(ScrapeJobDB).one()
+            assert job.status == JOB_PENDING
+            assert job.attempts == 0
+            assert job.available_at > datetime.utcnow()
+        assert scraper.queries == []
+        assert worker.deferred == 1
+        assert worker.failed == 0
+
+    @pytest.mark.asyncio
+    async def test_database_calls_run_off_the_loop(self, monkeypatch, db_manager):
+        """Test that leasing and recording outcomes run in worker threads."""
+        worker = make_worker(db_manager, JobScraper(), "w1")
+        enqueue_queries(["melk"], ["jumbo"], db_manager=db_manager)
+        threads = []
+        for name in ("_lease", "_record"):
+            method = getattr(worker, name)
+
+            def spy(*args, method=method):
+                threads.append(threading.get_ident())
+                return method(*args)
+
+            monkeypatch.setattr(worker, name, spy)
+
+        await worker.run_once()
+
+        assert len(threads) == 2
+        assert threading.get_ident() not in threads
+        assert worker.completed == 1
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_keeps_lease(self, db_manager):
+        """Test that a slow job is not stolen while its worker heartbeats."""
+        slow = make_worker(db_manager, JobScraper(delay=0.3), "slow")
+        slow.lease_seconds = 0.15
+        other = make_worker(db_manager, JobScraper(), "other")
+        enqueue_queries(["melk"], ["jumbo"], db_manager=db_manager)
+
+        running = asyncio.create_task(slow.run_once())
+        await asyncio.sleep(0.2)
+        stolen = await other.run_once()
+        await running
+
+        assert stolen == 0
+        assert slow.completed == 1
+
+    @pytest.mark.asyncio
+    async def test_run_stops_gracefully(self, db_manager):
+        """Test that run drains the queue and returns after stop."""
+        worker = make_worker(db_manager, JobScraper(delay=0.01), "w1")
+        worker.poll_interval = 0.01
+        enqueue_queries(["melk", "kaas", "brood"], ["jumbo"], db_manager=db_manager)
+
+        task = asyncio.create_task(worker.run())
+        await asyncio.sleep(0.2)
+        worker.stop()
+        await asyncio.wait_for(task, 1)
+
+        assert worker.completed == 3